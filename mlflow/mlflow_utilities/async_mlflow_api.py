@@ -0,0 +1,175 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from mlflow.entities import Run
+from mlflow.tracking import MlflowClient
+from pandas import DataFrame
+
+from mlflow_utilities import mlflow_api
+from mlflow_utilities.model_cache import ModelCache
+from mlflow_utilities.model_status import ModelStatus
+
+
+class AsyncMlflowApi:
+    """
+    asyncio counterpart of mlflow_api, with the same functions and semantics. The blocking MLFlow calls run in a thread pool, so the event loop keeps serving while they wait on the tracking server or on artifacts, and at most max_concurrency of them run at once. Independent calls (the status change of every run, the loading of every model) run concurrently.
+
+    Cancelling a call, e.g. with asyncio.wait_for or asyncio.timeout, cancels every part of it that hasn't started yet; the parts already talking to the tracking server finish in the background, since threads can't be interrupted.
+    """
+    def __init__(self, max_concurrency: int = 8):
+        # The pool's size is the concurrency limit: calls beyond it wait in its queue, where cancelling them removes them.
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    async def _run(self, function: Callable, *args, **kwargs) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(function, *args, **kwargs))
+
+    async def save_model(self,
+                         model,
+                         model_version: Union[str, Tuple[str, str, str]],
+                         mlflow_subpackage=None,
+                         experiment_id: Optional[str] = None,
+                         experiment_name: Optional[str] = None,
+                         submodel_name: Optional[str] = None,
+                         immutable_metadata: Dict[str, str] = {},
+                         mutable_metadata: Dict[str, float] = {}):
+        """
+        See mlflow_api.save_model. Saves don't run concurrently with each other.
+        """
+        await self._run(mlflow_api.save_model, model, model_version, mlflow_subpackage, experiment_id, experiment_name, submodel_name,
+                        immutable_metadata, mutable_metadata)
+
+    async def change_status(self, run_id: str, new_active_state: Optional[ModelStatus], new_test_fraction: Optional[float]):
+        """
+        See mlflow_api.change_status.
+        """
+        await self._run(mlflow_api.change_status, run_id, new_active_state, new_test_fraction)
+
+    async def enable_run(self, run_id: str):
+        await self.change_status(run_id, ModelStatus.Active, 1.0)
+
+    async def disable_run(self, run_id: str):
+        await self.change_status(run_id, ModelStatus.Disabled, 0.0)
+
+    async def canary_run(self, run_id: str):
+        await self.change_status(run_id, ModelStatus.Canary, 0.0)
+
+    async def change_statuses(self, status_by_run: Dict[str, Tuple[Optional[ModelStatus], Optional[float]]]) -> Sequence[Run]:
+        """
+        See mlflow_api.change_statuses. The runs are updated concurrently, within the concurrency limit.
+        """
+        client = MlflowClient()
+        try:
+            results = await asyncio.gather(*[self._run(mlflow_api._change_and_get_run, client, run_id, new_active_state, new_test_fraction)
+                                             for run_id, (new_active_state, new_test_fraction) in status_by_run.items()],
+                                           return_exceptions=True)
+        finally:
+            mlflow_api._notify_status_change()
+
+        runs: List[Run] = []
+        failures: Dict[str, Exception] = {}
+        for run_id, result in zip(status_by_run, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                failures[run_id] = result
+            else:
+                runs.append(result)
+        if failures:
+            raise mlflow_api.StatusUpdateError(failures, runs)
+        return runs
+
+    async def update_active_runs(self,
+                                 test_fraction_by_run: Dict[str, float],
+                                 model_version: Union[str, Tuple[str, str, str]],
+                                 experiment_id: Optional[str] = None,
+                                 experiment_name: Optional[str] = None,
+                                 submodel_name: Optional[str] = None,
+                                 extra_immutable_metadata: Dict[str, str] = {},
+                                 extra_mutable_metadata: Dict[str, float] = {}) -> Sequence[Run]:
+        """
+        See mlflow_api.update_active_runs.
+        """
+        test_fraction_by_run = mlflow_api._rebalance_test_fractions(test_fraction_by_run)
+        runs = await self._run(mlflow_api._list_runs, model_version, experiment_id, experiment_name,
+                               "metrics.active_state != " + str(ModelStatus.Disabled.value), submodel_name, extra_immutable_metadata, extra_mutable_metadata)
+        return await self.change_statuses(mlflow_api._active_run_statuses(test_fraction_by_run, runs))
+
+    async def change_test_fractions(self,
+                                    test_fraction_by_run: Dict[str, float],
+                                    model_version: Union[str, Tuple[str, str, str]],
+                                    experiment_id: Optional[str] = None,
+                                    experiment_name: Optional[str] = None,
+                                    active_state: Optional[ModelStatus] = None,
+                                    submodel_name: Optional[str] = None,
+                                    extra_immutable_metadata: Dict[str, str] = {},
+                                    extra_mutable_metadata: Dict[str, float] = {}) -> Sequence[Run]:
+        """
+        See mlflow_api.change_test_fractions.
+        """
+        test_fraction_by_run = mlflow_api._rebalance_test_fractions(test_fraction_by_run)
+        runs = await self.list_runs(model_version, experiment_id, experiment_name, active_state, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
+        return await self.change_statuses(mlflow_api._test_fraction_statuses(test_fraction_by_run, runs))
+
+    async def list_runs(self,
+                        model_version: Union[str, Tuple[str, str, str]],
+                        experiment_id: Optional[str] = None,
+                        experiment_name: Optional[str] = None,
+                        active_state: Optional[ModelStatus] = None,
+                        submodel_name: Optional[str] = None,
+                        extra_immutable_metadata: Dict[str, str] = {},
+                        extra_mutable_metadata: Dict[str, float] = {}) -> DataFrame:
+        """
+        See mlflow_api.list_runs.
+        """
+        return await self._run(mlflow_api.list_runs, model_version, experiment_id, experiment_name, active_state, submodel_name,
+                               extra_immutable_metadata, extra_mutable_metadata)
+
+    async def iter_runs(self,
+                        model_version: Union[str, Tuple[str, str, str]],
+                        experiment_id: Optional[str] = None,
+                        experiment_name: Optional[str] = None,
+                        active_state: Optional[ModelStatus] = None,
+                        submodel_name: Optional[str] = None,
+                        extra_immutable_metadata: Dict[str, str] = {},
+                        extra_mutable_metadata: Dict[str, float] = {},
+                        columns: Sequence[str] = mlflow_api.DEFAULT_RUN_COLUMNS,
+                        page_size: int = 1000,
+                        limit: Optional[int] = None) -> AsyncIterator[DataFrame]:
+        """
+        See mlflow_api.iter_runs. Every page is fetched in the thread pool.
+        """
+        pages = mlflow_api.iter_runs(model_version, experiment_id, experiment_name, active_state, submodel_name, extra_immutable_metadata,
+                                     extra_mutable_metadata, columns, page_size, limit)
+        while True:
+            page = await self._run(next, pages, None)
+            if page is None:
+                return
+            yield page
+
+    async def list_models(self,
+                          model_version: Union[str, Tuple[str, str, str]],
+                          experiment_id: Optional[str] = None,
+                          experiment_name: Optional[str] = None,
+                          active_state: Optional[ModelStatus] = None,
+                          submodel_name: Optional[str] = None,
+                          extra_immutable_metadata: Dict[str, str] = {},
+                          extra_mutable_metadata: Dict[str, float] = {},
+                          mlflow_subpackage=None,
+                          lazy: bool = False,
+                          cache: Optional[ModelCache] = None) -> Sequence:
+        """
+        See mlflow_api.list_models. The models are loaded concurrently, within the concurrency limit.
+        """
+        runs = await self.list_runs(model_version, experiment_id, experiment_name, active_state, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
+        models = mlflow_api._lazy_models(runs, mlflow_subpackage, cache)
+        if lazy:
+            return models
+        return await asyncio.gather(*[self._run(model.get_model) for model in models])
+
+    def close(self):
+        """
+        Shuts the thread pool down once the calls in flight are done.
+        """
+        self._executor.shutdown(wait=False)
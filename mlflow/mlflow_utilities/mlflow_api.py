@@ -1,13 +1,48 @@
-from typing import Tuple, Optional, Dict, Union, Sequence, Any, Set
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Tuple, Optional, Dict, Union, Sequence, Any, Set, List, Callable, Iterator
 
 import mlflow.pyfunc
-from mlflow.entities import Run, Experiment
+from mlflow.entities import Run, Experiment, Metric
+from mlflow.tracking import MlflowClient
 from pandas import DataFrame, Series
 from pkg_resources import packaging
 
+from mlflow_utilities.model_cache import LazyModel, ModelCache
 from mlflow_utilities.model_status import ModelStatus
 
 
+# Columns of iter_runs when none are requested: enough to route traffic and check versions.
+DEFAULT_RUN_COLUMNS = ("run_id", "metrics.active_state", "metrics.test_fraction", "params.major_version", "params.minor_version", "params.micro_version")
+
+# Cache used by list_models when none is provided.
+_default_model_cache = ModelCache()
+
+# save_model sets the process-wide experiment and logs through the fluent run, so saves from several threads run one at a time.
+_save_lock = threading.Lock()
+
+# Called after this process changes the status of runs, e.g. so RunStateCache can drop entries. Bound methods are held weakly so listeners can be garbage collected.
+_status_listeners: List[weakref.WeakMethod] = []
+
+
+def _add_status_listener(listener: Callable[[], None]):
+    _status_listeners.append(weakref.WeakMethod(listener))
+
+
+def _remove_status_listener(listener: Callable[[], None]):
+    _status_listeners[:] = [reference for reference in _status_listeners if reference() not in (None, listener)]
+
+
+def _notify_status_change():
+    for reference in list(_status_listeners):
+        listener = reference()
+        if listener is not None:
+            listener()
+
+
 def _parse_semver(version: str) -> Tuple[str, str, str]:
     x = packaging.version.parse(version)
     return x.major, x.minor, x.micro
@@ -20,6 +55,26 @@ def _build_filter_string(is_immutable: bool, var_name: str, value: Any) -> str:
         return "metrics." + var_name + ' = ' + str(value)  # Expects a double
 
 
+@lru_cache(maxsize=None)
+def _resolve_experiment(tracking_uri: str, experiment_id: Optional[str], experiment_name: Optional[str]) -> Experiment:
+    """
+    Looks an experiment up once per process and tracking server. A missing experiment raises, so it isn't cached and is looked up again on the next call.
+    """
+    if experiment_id is not None:
+        experiment = mlflow.get_experiment(experiment_id)
+    else:
+        experiment = mlflow.get_experiment_by_name(experiment_name)
+
+    if not experiment:
+        raise ValueError("Experiment does not exist.")
+    return experiment
+
+
+def _run_column(runs: DataFrame, column: str) -> Series:
+    # search_runs leaves out the metric and param columns when nothing matches.
+    return runs[column] if column in runs else Series(dtype=object)
+
+
 def save_model(model,
                model_version: Union[str, Tuple[str, str, str]],
                mlflow_subpackage=None,
@@ -29,7 +84,7 @@ def save_model(model,
                immutable_metadata: Dict[str, str] = {},
                mutable_metadata: Dict[str, float] = {}):
     """
-    Saves a model in MLFlow.
+    Saves a model in MLFlow. Saves from several threads run one at a time, since they set the process-wide experiment.
 
     Args:
         model: Model object to save
@@ -43,10 +98,6 @@ def save_model(model,
     """
     if experiment_id is None and experiment_name is None:
         raise ValueError("Experiment Id or Experiment Name must be set")
-    if experiment_id is not None:
-        mlflow.set_experiment(experiment_id=experiment_id)
-    else:
-        mlflow.set_experiment(experiment_name=experiment_name)
 
     if submodel_name is None:
         submodel_name = experiment_name
@@ -57,38 +108,116 @@ def save_model(model,
     if type(model_version) == str:
         model_version = _parse_semver(model_version)
 
-    with mlflow.start_run():
-        mlflow.log_param("submodel_name", submodel_name)
-        mlflow.log_param("major_version", model_version[0])
-        mlflow.log_param("minor_version", model_version[1])
-        mlflow.log_param("micro_version", model_version[2])
+    with _save_lock:
+        if experiment_id is not None:
+            mlflow.set_experiment(experiment_id=experiment_id)
+        else:
+            mlflow.set_experiment(experiment_name=experiment_name)
+
+        with mlflow.start_run():
+            mlflow.log_param("submodel_name", submodel_name)
+            mlflow.log_param("major_version", model_version[0])
+            mlflow.log_param("minor_version", model_version[1])
+            mlflow.log_param("micro_version", model_version[2])
+
+            mlflow.log_metric("active_state", ModelStatus.New.value)
+            mlflow.log_metric("test_fraction", 0.0)
+
+            if immutable_metadata:
+                mlflow.log_params(immutable_metadata)
+            if mutable_metadata:
+                mlflow.log_metrics(mutable_metadata)
 
-        mlflow.log_metric("active_state", ModelStatus.New.value)
-        mlflow.log_metric("test_fraction", 0.0)
+            mlflow_subpackage.log_model(model, "", registered_model_name=submodel_name)
 
-        if immutable_metadata:
-            mlflow.log_params(immutable_metadata)
-        if mutable_metadata:
-            mlflow.log_metrics(mutable_metadata)
 
-        mlflow_subpackage.log_model(model, "", registered_model_name=submodel_name)
+class StatusUpdateError(Exception):
+    """
+    Raised when some runs of a bulk status change failed. The other runs were still updated.
+
+    failures: The error of every run that failed, by run id.
+    runs: The runs that were updated.
+    """
+    def __init__(self, failures: Dict[str, Exception], runs: Sequence[Run]):
+        super().__init__("Failed to update runs: " + ", ".join(f"{run_id} ({error})" for run_id, error in failures.items()))
+        self.failures: Dict[str, Exception] = failures
+        self.runs: Sequence[Run] = runs
+
+
+def _status_metrics(new_active_state: Optional[ModelStatus], new_test_fraction: Optional[float], timestamp: int) -> List[Metric]:
+    metrics = []
+    if new_active_state is not None:
+        metrics.append(Metric("active_state", float(new_active_state.value), timestamp, 0))
+    if new_test_fraction is not None:
+        metrics.append(Metric("test_fraction", float(new_test_fraction), timestamp, 0))
+    return metrics
+
+
+def _change_run_status(client: MlflowClient, run_id: str, new_active_state: Optional[ModelStatus], new_test_fraction: Optional[float]):
+    """
+    Logs the new status in a single request, then sets the end time of the run like closing it with start_run did, so list_runs keeps returning the most recently changed runs first.
+    """
+    timestamp = int(time.time() * 1000)
+    client.log_batch(run_id, metrics=_status_metrics(new_active_state, new_test_fraction, timestamp))
+    client.set_terminated(run_id, end_time=timestamp)
+
+
+def _change_and_get_run(client: MlflowClient, run_id: str, new_active_state: Optional[ModelStatus], new_test_fraction: Optional[float]) -> Run:
+    """
+    Changes the status of a run and reads it back, in the same worker thread so the read overlaps with the other runs' requests.
+    """
+    _change_run_status(client, run_id, new_active_state, new_test_fraction)
+    return client.get_run(run_id)
 
 
 def change_status(run_id: str, new_active_state: Optional[ModelStatus], new_test_fraction: Optional[float]):
     """
-    Changes the production status of a run/model already saved in MLFlow.
+    Changes the production status of a run/model already saved in MLFlow. Both metrics are logged in a single request, without opening the run.
 
     Args:
         run_id (str): The id of the run.
         new_active_state (Optional[ModelStatus]): The new production status.
         new_test_fraction (Optional[float]): The A/B test fraction.
     """
-    run = mlflow.get_run(run_id)
-    with mlflow.start_run(run.info.run_id):
-        if new_active_state:
-            mlflow.log_metric("active_state", new_active_state.value)
-        if new_test_fraction:
-            mlflow.log_metric("test_fraction", new_test_fraction)
+    try:
+        _change_run_status(MlflowClient(), run_id, new_active_state, new_test_fraction)
+    finally:
+        _notify_status_change()
+
+
+def change_statuses(status_by_run: Dict[str, Tuple[Optional[ModelStatus], Optional[float]]],
+                    max_workers: int = 8) -> Sequence[Run]:
+    """
+    Changes the production status of many runs at once. Every run is a single batched request followed by a read of the updated run, and the runs are handled concurrently in a bounded thread pool.
+
+    Args:
+        status_by_run (Dict[str, Tuple[Optional[ModelStatus], Optional[float]]]): Dictionary of run id to the new production status and A/B test fraction. None leaves that metric unchanged.
+        max_workers (int): Maximum number of concurrent requests to the tracking server.
+
+    Returns:
+        Sequence[Run]: The updated runs.
+
+    Raises:
+        StatusUpdateError: When some runs failed to update, with the error of each and the runs that were updated.
+    """
+    client = MlflowClient()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {run_id: executor.submit(_change_and_get_run, client, run_id, new_active_state, new_test_fraction)
+                       for run_id, (new_active_state, new_test_fraction) in status_by_run.items()}
+    finally:
+        _notify_status_change()
+
+    runs: List[Run] = []
+    failures: Dict[str, Exception] = {}
+    for run_id, future in futures.items():
+        try:
+            runs.append(future.result())
+        except Exception as error:
+            failures[run_id] = error
+    if failures:
+        raise StatusUpdateError(failures, runs)
+    return runs
 
 
 def enable_run(run_id: str):
@@ -134,7 +263,8 @@ def update_active_runs(test_fraction_by_run: Dict[str, float],
                        experiment_name: Optional[str] = None,
                        submodel_name: Optional[str] = None,
                        extra_immutable_metadata: Dict[str, str] = {},
-                       extra_mutable_metadata: Dict[str, float] = {}) -> Sequence[Run]:
+                       extra_mutable_metadata: Dict[str, float] = {},
+                       max_workers: int = 8) -> Sequence[Run]:
     """
     Updates which runs are active and in which test fraction.
 
@@ -146,31 +276,49 @@ def update_active_runs(test_fraction_by_run: Dict[str, float],
         submodel_name (Optional[str]): Submodel name if you have one. If not provided, uses the name of the experiment.
         extra_immutable_metadata (Dict[str, str]): Any additional metadata inherent to the model or model process that you need to filter your search by.
         extra_mutable_metadata (Dict[str, float]): Any additional metadata specific to the model that you need to filter your search by.
+        max_workers (int): Maximum number of concurrent requests to the tracking server.
+
+    Returns:
+        Sequence[Run]: The runs whose status changed.
+
+    Raises:
+        StatusUpdateError: When some runs failed to update, with the error of each and the runs that were updated.
     """
     test_fraction_by_run = _rebalance_test_fractions(test_fraction_by_run)
-    new_runs = list_runs(model_version, experiment_id, experiment_name, ModelStatus.New, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
-    active_runs = list_runs(model_version, experiment_id, experiment_name, ModelStatus.Active, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
-    canary_runs = list_runs(model_version, experiment_id, experiment_name, ModelStatus.Canary, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
+    runs = _list_runs(model_version, experiment_id, experiment_name, "metrics.active_state != " + str(ModelStatus.Disabled.value),
+                      submodel_name, extra_immutable_metadata, extra_mutable_metadata)
+    return change_statuses(_active_run_statuses(test_fraction_by_run, runs), max_workers)
+
+
+def _active_run_statuses(test_fraction_by_run: Dict[str, float], runs: DataFrame) -> Dict[str, Tuple[Optional[ModelStatus], Optional[float]]]:
+    """
+    The status changes of update_active_runs, given the rebalanced test fractions and every non-disabled run.
+    """
+    run_ids = _run_column(runs, "run_id")
+    active_states = _run_column(runs, "metrics.active_state")
 
-    new_run_set: Set[str] = {run.run_id for _, run in new_runs.iterrows()}
-    active_run_set: Set[str] = {run.run_id for _, run in active_runs.iterrows()}
-    canary_runs_set: Set[str] = {run.run_id for _, run in canary_runs.iterrows()}
+    new_run_set: Set[str] = set(run_ids[active_states == ModelStatus.New.value])
+    active_run_set: Set[str] = set(run_ids[active_states == ModelStatus.Active.value])
+    canary_runs_set: Set[str] = set(run_ids[active_states == ModelStatus.Canary.value])
 
     if test_fraction_by_run.keys() - new_run_set - active_run_set - canary_runs_set:
         raise ValueError("Attempting to modify a run that doesn't exist. Exiting to prevent odd behavior.")
 
+    status_by_run: Dict[str, Tuple[Optional[ModelStatus], Optional[float]]] = {}
     for run_not_present in active_run_set - test_fraction_by_run.keys():
-        disable_run(run_not_present)
+        status_by_run[run_not_present] = (ModelStatus.Disabled, 0.0)
     for run_not_present in canary_runs_set - test_fraction_by_run.keys():
-        disable_run(run_not_present)
+        status_by_run[run_not_present] = (ModelStatus.Disabled, 0.0)
 
     all_runs_to_update: Set[str] = set(new_run_set).union(active_run_set).union(canary_runs_set)
 
     for run_to_update in all_runs_to_update.intersection(test_fraction_by_run.keys()):
         if test_fraction_by_run[run_to_update] <= 0.0:
-            disable_run(run_to_update)
+            status_by_run[run_to_update] = (ModelStatus.Disabled, 0.0)
         else:
-            change_status(run_to_update, ModelStatus.Active, test_fraction_by_run[run_to_update])
+            status_by_run[run_to_update] = (ModelStatus.Active, test_fraction_by_run[run_to_update])
+
+    return status_by_run
 
 
 def change_test_fractions(test_fraction_by_run: Dict[str, float],
@@ -180,7 +328,8 @@ def change_test_fractions(test_fraction_by_run: Dict[str, float],
                           active_state: Optional[ModelStatus] = None,
                           submodel_name: Optional[str] = None,
                           extra_immutable_metadata: Dict[str, str] = {},
-                          extra_mutable_metadata: Dict[str, float] = {}):
+                          extra_mutable_metadata: Dict[str, float] = {},
+                          max_workers: int = 8) -> Sequence[Run]:
     """
     Updates which runs are in what test fraction for a specified production state.
 
@@ -193,23 +342,39 @@ def change_test_fractions(test_fraction_by_run: Dict[str, float],
         submodel_name (Optional[str]): Submodel name if you have one. If not provided, uses the name of the experiment.
         extra_immutable_metadata (Dict[str, str]): Any additional metadata inherent to the model or model process that you need to filter your search by.
         extra_mutable_metadata (Dict[str, float]): Any additional metadata specific to the model that you need to filter your search by.
+        max_workers (int): Maximum number of concurrent requests to the tracking server.
+
+    Returns:
+        Sequence[Run]: The runs whose status changed.
+
+    Raises:
+        StatusUpdateError: When some runs failed to update, with the error of each and the runs that were updated.
     """
     test_fraction_by_run = _rebalance_test_fractions(test_fraction_by_run)
     runs = list_runs(model_version, experiment_id, experiment_name, active_state, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
+    return change_statuses(_test_fraction_statuses(test_fraction_by_run, runs), max_workers)
 
-    run_dict: Dict[str, Series] = {run.run_id: run for _, run in runs.iterrows()}
+
+def _test_fraction_statuses(test_fraction_by_run: Dict[str, float], runs: DataFrame) -> Dict[str, Tuple[Optional[ModelStatus], Optional[float]]]:
+    """
+    The status changes of change_test_fractions, given the rebalanced test fractions and the runs in the production state.
+    """
+    run_dict: Dict[str, float] = dict(zip(_run_column(runs, "run_id"), _run_column(runs, "metrics.active_state")))
 
     if test_fraction_by_run.keys() - run_dict.keys():
         raise ValueError("Attempting to modify a run that doesn't exist. Exiting to prevent odd behavior.")
 
+    status_by_run: Dict[str, Tuple[Optional[ModelStatus], Optional[float]]] = {}
     for run_not_present in run_dict.keys() - test_fraction_by_run.keys():
-        disable_run(run_not_present)
+        status_by_run[run_not_present] = (ModelStatus.Disabled, 0.0)
 
     for run_to_update in set(run_dict.keys()).intersection(test_fraction_by_run.keys()):
         if test_fraction_by_run[run_to_update] <= 0.0:
-            disable_run(run_to_update)
+            status_by_run[run_to_update] = (ModelStatus.Disabled, 0.0)
         else:
-            change_status(run_to_update, ModelStatus(run_dict[run_to_update]['metrics.active_state']), test_fraction_by_run[run_to_update])
+            status_by_run[run_to_update] = (ModelStatus(run_dict[run_to_update]), test_fraction_by_run[run_to_update])
+
+    return status_by_run
 
 
 def list_runs(model_version: Union[str, Tuple[str, str, str]],
@@ -231,18 +396,32 @@ def list_runs(model_version: Union[str, Tuple[str, str, str]],
         extra_immutable_metadata (Dict[str, str]): Any additional metadata inherent to the model or model process that you want to keep track of.
         extra_mutable_metadata (Dict[str, float]): Any additional metadata specific to the model that can change over time.
     """
+    state_filter = _build_filter_string(False, "active_state", active_state.value) if active_state else None
+    return _list_runs(model_version, experiment_id, experiment_name, state_filter, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
+
+
+def _list_runs(model_version: Union[str, Tuple[str, str, str]],
+               experiment_id: Optional[str],
+               experiment_name: Optional[str],
+               state_filter: Optional[str],
+               submodel_name: Optional[str],
+               extra_immutable_metadata: Dict[str, str],
+               extra_mutable_metadata: Dict[str, float]) -> DataFrame:
     if experiment_id is None and experiment_name is None:
         raise ValueError("Experiment Id or Experiment Name must be set.")
 
-    experiment: Optional[Experiment] = None
-    if experiment_id is not None:
-        experiment = mlflow.get_experiment(experiment_id)
-    else:
-        experiment = mlflow.get_experiment_by_name(experiment_name)
+    experiment = _resolve_experiment(mlflow.get_tracking_uri(), experiment_id, experiment_name)
+    filter_string = _build_run_filter(model_version, state_filter, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
 
-    if not experiment:
-        raise ValueError("Experiment does not exist.")
+    runs = mlflow.search_runs(experiment_ids=[experiment.experiment_id], filter_string=filter_string, order_by=['end_time desc'])
+    return runs
 
+
+def _build_run_filter(model_version: Union[str, Tuple[str, str, str]],
+                      state_filter: Optional[str],
+                      submodel_name: Optional[str],
+                      extra_immutable_metadata: Dict[str, str],
+                      extra_mutable_metadata: Dict[str, float]) -> str:
     if type(model_version) == str:
         model_version = _parse_semver(model_version)
 
@@ -252,8 +431,8 @@ def list_runs(model_version: Union[str, Tuple[str, str, str]],
     filter.append(_build_filter_string(True, "minor_version", model_version[1]))
     filter.append(_build_filter_string(True, "micro_version", model_version[2]))
 
-    if active_state:
-        filter.append(_build_filter_string(False, "active_state", active_state.value))
+    if state_filter:
+        filter.append(state_filter)
     if submodel_name:
         filter.append(_build_filter_string(True, "submodel_name", submodel_name))
 
@@ -262,8 +441,73 @@ def list_runs(model_version: Union[str, Tuple[str, str, str]],
     for mutable_metadata_name, value in extra_mutable_metadata.items():
         filter.append(_build_filter_string(True, mutable_metadata_name, value))
 
-    runs = mlflow.search_runs(experiment_names=[experiment.name], filter_string=" and ".join(filter), order_by=['end_time desc'])
-    return runs
+    return " and ".join(filter)
+
+
+def _run_value(run: Run, column: str) -> Any:
+    # Missing metrics are NaN, like in the float columns of search_runs, while missing params and tags are None.
+    if column == "run_id":
+        return run.info.run_id
+    if column == "artifact_uri":
+        return run.info.artifact_uri
+    kind, _, name = column.partition(".")
+    if kind == "metrics":
+        return run.data.metrics.get(name, float('nan'))
+    if kind == "params":
+        return run.data.params.get(name)
+    if kind == "tags":
+        return run.data.tags.get(name)
+    return getattr(run.info, column)
+
+
+def iter_runs(model_version: Union[str, Tuple[str, str, str]],
+              experiment_id: Optional[str] = None,
+              experiment_name: Optional[str] = None,
+              active_state: Optional[ModelStatus] = None,
+              submodel_name: Optional[str] = None,
+              extra_immutable_metadata: Dict[str, str] = {},
+              extra_mutable_metadata: Dict[str, float] = {},
+              columns: Sequence[str] = DEFAULT_RUN_COLUMNS,
+              page_size: int = 1000,
+              limit: Optional[int] = None) -> Iterator[DataFrame]:
+    """
+    Streaming variant of list_runs: walks the search results one page at a time and yields a small DataFrame per page with only the requested columns, so memory doesn't grow with the size of the experiment. Uses the same filters and order as list_runs.
+
+    Args:
+        model_version (Union[str, Tuple[str, str, str]]): Semantic Version of the model. Can be handled as either a string or as a tuple of 3 numbers (major, minor, and micro version)
+        experiment_id (Optional[str]): Experiment Id if known. Optional with the experiment name.
+        experiment_name (Optional[str]): Experiment Name if known. Optional with the experiment id.
+        active_state (Optional[ModelStatus]): Optional[ModelStatus]: Which production state to search and update.
+        submodel_name (Optional[str]): Submodel name if you have one. If not provided, uses the name of the experiment.
+        extra_immutable_metadata (Dict[str, str]): Any additional metadata inherent to the model or model process that you want to keep track of.
+        extra_mutable_metadata (Dict[str, float]): Any additional metadata specific to the model that can change over time.
+        columns (Sequence[str]): Columns to keep, named like the list_runs columns: "run_id", "artifact_uri", run info attributes, or "metrics.", "params." and "tags." followed by a name.
+        page_size (int): Number of runs requested from the tracking server at a time.
+        limit (Optional[int]): Maximum number of runs to yield in total.
+
+    Returns:
+        Iterator[DataFrame]: One DataFrame per page of runs.
+    """
+    if experiment_id is None and experiment_name is None:
+        raise ValueError("Experiment Id or Experiment Name must be set.")
+
+    experiment = _resolve_experiment(mlflow.get_tracking_uri(), experiment_id, experiment_name)
+    state_filter = _build_filter_string(False, "active_state", active_state.value) if active_state else None
+    filter_string = _build_run_filter(model_version, state_filter, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
+
+    client = MlflowClient()
+    page_token = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        page = client.search_runs([experiment.experiment_id], filter_string=filter_string, order_by=['end_time desc'],
+                                  max_results=page_size if remaining is None else min(page_size, remaining), page_token=page_token)
+        if page:
+            yield DataFrame({column: [_run_value(run, column) for run in page] for column in columns}, columns=list(columns))
+        if remaining is not None:
+            remaining -= len(page)
+        page_token = page.token
+        if not page_token:
+            break
 
 
 def list_models(model_version: Union[str, Tuple[str, str, str]],
@@ -272,9 +516,13 @@ def list_models(model_version: Union[str, Tuple[str, str, str]],
                 active_state: Optional[ModelStatus] = None,
                 submodel_name: Optional[str] = None,
                 extra_immutable_metadata: Dict[str, str] = {},
-                extra_mutable_metadata: Dict[str, float] = {}) -> Sequence:
+                extra_mutable_metadata: Dict[str, float] = {},
+                mlflow_subpackage=None,
+                max_workers: int = 8,
+                lazy: bool = False,
+                cache: Optional[ModelCache] = None) -> Sequence:
     """
-    List models in MLFlow for the semantic versioning framework.
+    List models in MLFlow for the semantic versioning framework. Models are loaded concurrently and cached by run id, so listing the same runs again doesn't deserialize them again.
 
     Args:
         model_version (Union[str, Tuple[str, str, str]]): Semantic Version of the model. Can be handled as either a string or as a tuple of 3 numbers (major, minor, and micro version)
@@ -284,13 +532,25 @@ def list_models(model_version: Union[str, Tuple[str, str, str]],
         submodel_name (Optional[str]): Submodel name if you have one. If not provided, uses the name of the experiment.
         extra_immutable_metadata (Dict[str, str]): Any additional metadata inherent to the model or model process that you want to keep track of.
         extra_mutable_metadata (Dict[str, float]): Any additional metadata specific to the model that can change over time.
+        mlflow_subpackage: The mlflow package the models were saved with (the one passed to save_model), whose "load_model" is used. If none is provided, uses mlflow.sklearn.
+        max_workers (int): Maximum number of models loaded concurrently.
+        lazy (bool): Whether to return LazyModel objects that only load their model the first time it is used.
+        cache (Optional[ModelCache]): Cache of loaded models. Defaults to a cache shared by the process.
     """
     runs = list_runs(model_version, experiment_id, experiment_name, active_state, submodel_name, extra_immutable_metadata, extra_mutable_metadata)
 
-    models = []
+    models = _lazy_models(runs, mlflow_subpackage, cache)
+    if lazy:
+        return models
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(LazyModel.get_model, models))
 
-    for _, run in runs.iterrows():
-        filepath = run.artifact_uri
-        models.append(mlflow.sklearn.load_model(filepath))
 
-    return models
+def _lazy_models(runs: DataFrame, mlflow_subpackage, cache: Optional[ModelCache]) -> List[LazyModel]:
+    if mlflow_subpackage is None:
+        mlflow_subpackage = mlflow.sklearn
+    if cache is None:
+        cache = _default_model_cache
+    return [LazyModel(run_id, filepath, mlflow_subpackage.load_model, cache)
+            for run_id, filepath in zip(_run_column(runs, "run_id"), _run_column(runs, "artifact_uri"))]
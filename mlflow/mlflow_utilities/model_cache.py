@@ -0,0 +1,111 @@
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def _pickled_size(model: Any) -> int:
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class ModelCache:
+    """
+    In-process LRU cache of loaded models keyed by run id and loader, so a run whose model didn't change is never deserialized twice. The cache is bounded by a number of models and/or an estimate of their size in bytes; the least recently used models are evicted first, but the model just loaded is always kept. Threads asking for the same model while it loads wait for that single load.
+    """
+    def __init__(self,
+                 max_models: Optional[int] = 32,
+                 max_bytes: Optional[int] = None,
+                 estimate_bytes: Callable[[Any], int] = _pickled_size):
+        self._max_models: Optional[int] = max_models
+        self._max_bytes: Optional[int] = max_bytes
+        self._estimate_bytes: Callable[[Any], int] = estimate_bytes
+        self._models: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._loading: Dict[Hashable, Future] = {}
+        self._total_bytes: int = 0
+        self._lock = threading.Lock()
+
+    def _evict(self):
+        # Called with the lock held.
+        while len(self._models) > 1 and ((self._max_models is not None and len(self._models) > self._max_models)
+                                         or (self._max_bytes is not None and self._total_bytes > self._max_bytes)):
+            _, (_, size) = self._models.popitem(last=False)
+            self._total_bytes -= size
+
+    def get(self, run_id: str, artifact_uri: str, load_model: Callable[[str], Any]) -> Any:
+        """
+        Returns the model of a run, loading it if it isn't cached.
+
+        Args:
+            run_id (str): The id of the run.
+            artifact_uri (str): Where the model is stored.
+            load_model (Callable[[str], Any]): Function loading a model from its URI, e.g. mlflow.sklearn.load_model.
+
+        Returns:
+            The loaded model.
+        """
+        key = (run_id, getattr(load_model, "__module__", None), getattr(load_model, "__qualname__", repr(load_model)))
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None:
+                self._models.move_to_end(key)
+                return cached[0]
+            loading = self._loading.get(key)
+            if loading is None:
+                future = self._loading[key] = Future()
+        if loading is not None:
+            return loading.result()
+
+        try:
+            model = load_model(artifact_uri)
+            size = self._estimate_bytes(model) if self._max_bytes is not None else 0
+        except BaseException as error:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(error)
+            raise
+        with self._lock:
+            self._models[key] = (model, size)
+            self._total_bytes += size
+            self._evict()
+            del self._loading[key]
+        future.set_result(model)
+        return model
+
+    def get_model_count(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    def get_total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._total_bytes = 0
+
+
+class LazyModel:
+    """
+    A model that is only loaded, through a ModelCache, the first time one of its attributes is used. Attribute access and calls are forwarded to the loaded model, so lazy_model.predict(X) works like model.predict(X) and lazy_model(X) like model(X). Python looks other special methods (len, iteration, indexing, operators) up on the class, so they aren't forwarded; use get_model() for those.
+    """
+    def __init__(self, run_id: str, artifact_uri: str, load_model: Callable[[str], Any], cache: ModelCache):
+        self._run_id: str = run_id
+        self._artifact_uri: str = artifact_uri
+        self._load_model: Callable[[str], Any] = load_model
+        self._cache: ModelCache = cache
+
+    def get_run_id(self) -> str:
+        return self._run_id
+
+    def get_model(self) -> Any:
+        return self._cache.get(self._run_id, self._artifact_uri, self._load_model)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.get_model()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get_model(), name)
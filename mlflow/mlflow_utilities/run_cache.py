@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Hashable, NamedTuple, Optional, Tuple, Union
+
+from pandas import DataFrame
+
+from mlflow_utilities import mlflow_api
+from mlflow_utilities.model_status import ModelStatus
+
+
+class RunStateSnapshot(NamedTuple):
+    """
+    The runs of a model version in a production state, as returned by list_runs, and when they were fetched (time.monotonic()).
+    """
+    runs: DataFrame
+    fetched_at: float
+
+
+class RunStateCache:
+    """
+    Process-local cache of list_runs results for the serving path, keyed by experiment, submodel, model version and production state.
+
+    Entries older than ttl seconds are still returned, and a background thread refreshes them, so callers only wait on the tracking server the first time a key is requested. At most max_entries keys are kept, evicting the least recently used. Status changes made through mlflow_api in this process (change_status, change_statuses, enable_run, disable_run, canary_run and the updates built on them) drop every entry immediately, since they can move runs between states.
+    """
+    def __init__(self, ttl: float = 60.0, max_entries: int = 128, max_workers: int = 2):
+        self._ttl: float = ttl
+        self._max_entries: int = max_entries
+        self._entries: "OrderedDict[Hashable, RunStateSnapshot]" = OrderedDict()
+        self._pending: Dict[Hashable, Future] = {}
+        self._generation: int = 0
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        mlflow_api._add_status_listener(self.invalidate)
+
+    def _fetch(self, key: Hashable, generation: int) -> RunStateSnapshot:
+        experiment_id, experiment_name, submodel_name, model_version, active_state = key
+        snapshot = RunStateSnapshot(mlflow_api.list_runs(model_version, experiment_id, experiment_name, active_state, submodel_name), time.monotonic())
+        with self._lock:
+            # A status change during the fetch may have made the result stale already.
+            if generation == self._generation:
+                self._entries[key] = snapshot
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return snapshot
+
+    def _finish(self, key: Hashable, future: Future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def _submit(self, key: Hashable) -> Future:
+        # Called with the lock held. Requests for a key share a single fetch; a failed refresh is retried on the next request.
+        future = self._pending.get(key)
+        if future is None:
+            future = self._executor.submit(self._fetch, key, self._generation)
+            self._pending[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+
+    def get_runs(self,
+                 model_version: Union[str, Tuple[str, str, str]],
+                 experiment_id: Optional[str] = None,
+                 experiment_name: Optional[str] = None,
+                 active_state: Optional[ModelStatus] = ModelStatus.Active,
+                 submodel_name: Optional[str] = None) -> DataFrame:
+        """
+        Lists the runs of a model version in a production state, from the cache when possible.
+
+        Args:
+            model_version (Union[str, Tuple[str, str, str]]): Semantic Version of the model. Can be handled as either a string or as a tuple of 3 numbers (major, minor, and micro version)
+            experiment_id (Optional[str]): Experiment Id if known. Optional with the experiment name.
+            experiment_name (Optional[str]): Experiment Name if known. Optional with the experiment id.
+            active_state (Optional[ModelStatus]): Which production state to list. Defaults to the active runs being served.
+            submodel_name (Optional[str]): Submodel name if you have one.
+
+        Returns:
+            DataFrame: The runs, as returned by list_runs. Can be up to ttl seconds old, plus the time of a refresh.
+        """
+        if type(model_version) == str:
+            model_version = mlflow_api._parse_semver(model_version)
+        key = (experiment_id, experiment_name, submodel_name, tuple(model_version), active_state)
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is not None:
+                self._entries.move_to_end(key)
+                if time.monotonic() - snapshot.fetched_at > self._ttl:
+                    self._submit(key)
+                return snapshot.runs
+            future = self._submit(key)
+        return future.result().runs
+
+    def invalidate(self):
+        """
+        Drops every entry. Fetches that are in flight are not stored.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._pending.clear()
+
+    def close(self):
+        """
+        Stops listening to status changes and stops the background refresh threads, dropping the refreshes that haven't started and waiting for the ones in flight. The cache can't fetch runs afterwards.
+        """
+        mlflow_api._remove_status_listener(self.invalidate)
+        self._executor.shutdown(wait=True, cancel_futures=True)
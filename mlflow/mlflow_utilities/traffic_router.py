@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from numpy import ndarray, array, asarray, cumsum, float64
+from numpy.random import default_rng
+from pandas import DataFrame
+from pandas.util import hash_array
+
+from mlflow_utilities.mlflow_api import _list_runs, _rebalance_test_fractions, _run_column
+from mlflow_utilities.model_status import ModelStatus
+
+logger = logging.getLogger(__name__)
+
+
+class RoutingTable(NamedTuple):
+    """
+    Weighted assignment of traffic to runs.
+
+    run_ids: The Active runs, sorted so the table doesn't depend on the order runs were listed in. Empty when no run is Active, e.g. while a rollout only has New or Canary runs.
+    cumulative_fractions: The upper end of every run's share of [0, 1).
+    canary_run_ids: The Canary runs, which get a mirrored copy of the traffic.
+    """
+    run_ids: ndarray
+    cumulative_fractions: ndarray
+    canary_run_ids: Tuple[str, ...]
+
+
+def build_routing_table(test_fraction_by_run: Dict[str, float], canary_run_ids: Sequence[str] = ()) -> RoutingTable:
+    """
+    Builds a routing table from the test fractions of the Active runs, normalized the same way update_active_runs does. Without any positive fraction the table is empty and route raises until a run becomes Active.
+
+    Args:
+        test_fraction_by_run (Dict[str, float]): Dictionary of run id to test fraction. Runs with a fraction of 0 get no traffic.
+        canary_run_ids (Sequence[str]): The runs to mirror traffic to.
+
+    Returns:
+        RoutingTable: The routing table.
+    """
+    test_fraction_by_run = {run_id: fraction for run_id, fraction in test_fraction_by_run.items() if fraction > 0}
+    if not test_fraction_by_run:
+        return RoutingTable(array([], dtype=object), array([], dtype=float64), tuple(sorted(canary_run_ids)))
+    test_fraction_by_run = _rebalance_test_fractions(test_fraction_by_run)
+    run_ids = sorted(test_fraction_by_run)
+    cumulative_fractions = cumsum([test_fraction_by_run[run_id] for run_id in run_ids], dtype=float64)
+    cumulative_fractions[-1] = 1.0
+    return RoutingTable(array(run_ids, dtype=object), cumulative_fractions, tuple(sorted(canary_run_ids)))
+
+
+def _table_from_runs(runs: DataFrame) -> RoutingTable:
+    run_ids = _run_column(runs, "run_id")
+    active_states = _run_column(runs, "metrics.active_state")
+    test_fractions = _run_column(runs, "metrics.test_fraction")
+    is_active = active_states == ModelStatus.Active.value
+    return build_routing_table(dict(zip(run_ids[is_active], test_fractions[is_active])),
+                               list(run_ids[active_states == ModelStatus.Canary.value]))
+
+
+class RefreshFailure(NamedTuple):
+    """
+    The latest failure to refresh a routing table.
+
+    error: The exception raised by the refresh.
+    failed_at: When it failed (time.time()).
+    consecutive_failures: Number of refreshes that failed in a row, this one included.
+    """
+    error: Exception
+    failed_at: float
+    consecutive_failures: int
+
+
+def _uniform_hash(entity_ids: Union[Sequence, ndarray]) -> ndarray:
+    # pandas' hash is stable across processes, unlike the built-in hash, and fast on numeric ids; the top 53 bits make a uniform double in [0, 1).
+    entity_ids = asarray(entity_ids)
+    if entity_ids.dtype.kind in 'SU':
+        # pandas only hashes strings stored as objects.
+        entity_ids = entity_ids.astype(object)
+    return (hash_array(entity_ids, categorize=False) >> 11) * (1.0 / (1 << 53))
+
+
+class TrafficRouter:
+    """
+    Routes batches of requests to the Active runs of a model version according to their test fractions, and mirrors them to the Canary runs.
+
+    The routing table is built from a single search of the run states and refreshed every refresh_interval seconds by a background thread. A refresh replaces the whole table at once, so a batch is always routed with one consistent table, and a failed refresh keeps the previous table: the failure is logged and available from get_last_refresh_error until a refresh succeeds. Routing a batch is one vectorized lookup.
+    """
+    def __init__(self,
+                 model_version: Union[str, Tuple[str, str, str]],
+                 experiment_id: Optional[str] = None,
+                 experiment_name: Optional[str] = None,
+                 submodel_name: Optional[str] = None,
+                 refresh_interval: Optional[float] = 60.0,
+                 seed: Optional[int] = None,
+                 max_mirror_workers: int = 4):
+        self._model_version: Union[str, Tuple[str, str, str]] = model_version
+        self._experiment_id: Optional[str] = experiment_id
+        self._experiment_name: Optional[str] = experiment_name
+        self._submodel_name: Optional[str] = submodel_name
+        self._rng = default_rng(seed)
+        self._mirror_executor = ThreadPoolExecutor(max_workers=max_mirror_workers)
+        self._table: RoutingTable = self._load_table()
+        self._last_refresh_error: Optional[RefreshFailure] = None
+
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        if refresh_interval is not None:
+            self._refresher = threading.Thread(target=self._refresh_periodically, args=(refresh_interval,), daemon=True)
+            self._refresher.start()
+
+    def _load_table(self) -> RoutingTable:
+        runs = _list_runs(self._model_version, self._experiment_id, self._experiment_name, "metrics.active_state != " + str(ModelStatus.Disabled.value),
+                          self._submodel_name, {}, {})
+        return _table_from_runs(runs)
+
+    def _refresh_periodically(self, refresh_interval: float):
+        while not self._stop.wait(refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Failed to refresh the routing table %d time(s) in a row, still routing with the previous table.",
+                                 self._last_refresh_error.consecutive_failures)
+
+    def refresh(self):
+        """
+        Rebuilds the routing table from the tracking server and swaps it in. A failure is recorded for get_last_refresh_error and raised.
+        """
+        try:
+            table = self._load_table()
+        except Exception as error:
+            previous = self._last_refresh_error
+            self._last_refresh_error = RefreshFailure(error, time.time(), 1 if previous is None else previous.consecutive_failures + 1)
+            raise
+        self._last_refresh_error = None
+        self.set_table(table)
+
+    def get_last_refresh_error(self) -> Optional[RefreshFailure]:
+        """
+        The latest refresh failure, or None when the latest refresh succeeded. While it isn't None, requests are routed with an older table.
+        """
+        return self._last_refresh_error
+
+    def set_table(self, table: RoutingTable):
+        self._table = table
+
+    def get_table(self) -> RoutingTable:
+        return self._table
+
+    def route(self, batch_size: Optional[int] = None, entity_ids: Optional[Union[Sequence, ndarray]] = None) -> ndarray:
+        """
+        Assigns every request of a batch to an Active run.
+
+        Args:
+            batch_size (Optional[int]): Number of requests, each assigned at random. Not needed with entity_ids.
+            entity_ids (Optional[Union[Sequence, ndarray]]): Entity of every request (e.g. a user id). The same entity always gets the same run while the table doesn't change, in every process.
+
+        Returns:
+            ndarray: The run id of every request.
+
+        Raises:
+            ValueError: When no run is Active.
+        """
+        table = self._table
+        if table.run_ids.shape[0] == 0:
+            raise ValueError("There are no Active runs to route to.")
+        if entity_ids is not None:
+            positions = _uniform_hash(entity_ids)
+        elif batch_size is not None:
+            positions = self._rng.random(batch_size)
+        else:
+            raise ValueError("Either batch_size or entity_ids must be set.")
+        return table.run_ids[table.cumulative_fractions.searchsorted(positions, side='right')]
+
+    def mirror(self, score: Callable[[str], Any]) -> List[Future]:
+        """
+        Sends a copy of a batch to every Canary run in the background. Errors stay in the returned futures, so mirroring never affects the primary result.
+
+        Args:
+            score (Callable[[str], Any]): Function scoring the batch with the model of a run id.
+
+        Returns:
+            List[Future]: One future per Canary run.
+        """
+        return [self._mirror_executor.submit(score, run_id) for run_id in self._table.canary_run_ids]
+
+    def close(self):
+        """
+        Stops the background refresh and waits for the mirrored batches.
+        """
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+        self._mirror_executor.shutdown()
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import mlflow
+from pandas import DataFrame
+
+from mlflow_utilities import mlflow_api
+from mlflow_utilities.async_mlflow_api import AsyncMlflowApi
+from mlflow_utilities.model_status import ModelStatus
+from tests.tracking import TrackingTestCase
+
+
+class RecordingFlavor:
+    """
+    Stands in for an mlflow flavor: records the experiment of the active run every model is logged in.
+    """
+    def __init__(self):
+        self.experiment_by_model = {}
+
+    def log_model(self, model, artifact_path, registered_model_name=None):
+        time.sleep(0.01)
+        self.experiment_by_model[model] = mlflow.active_run().info.experiment_id
+
+
+class TestAsyncMlflowApi(TrackingTestCase):
+    def create_api(self, max_concurrency: int = 8) -> AsyncMlflowApi:
+        api = AsyncMlflowApi(max_concurrency)
+        self.addCleanup(api.close)
+        return api
+
+    def test_concurrent_saves_use_their_experiment(self):
+        other_experiment_id = mlflow.create_experiment("other")
+        experiment_ids = [self.experiment_id, other_experiment_id] * 4
+        flavor = RecordingFlavor()
+        api = self.create_api()
+
+        async def save_all():
+            await asyncio.gather(*[api.save_model(f"model-{i}", "1.0.0", flavor, experiment_id=experiment_id, submodel_name="submodel")
+                                   for i, experiment_id in enumerate(experiment_ids)])
+        asyncio.run(save_all())
+
+        self.assertEqual({f"model-{i}": experiment_id for i, experiment_id in enumerate(experiment_ids)}, flavor.experiment_by_model)
+        self.assertEqual(4, len(mlflow_api.list_runs("1.0.0", experiment_id=other_experiment_id, active_state=ModelStatus.New)))
+
+    def test_update_active_runs(self):
+        active_run, new_run = self.create_run(ModelStatus.Active, 1.0), self.create_run(ModelStatus.New)
+        api = self.create_api()
+
+        runs = asyncio.run(api.update_active_runs({new_run: 1.}, "1.0.0", experiment_id=self.experiment_id))
+
+        self.assertEqual({active_run: ModelStatus.Disabled.value, new_run: ModelStatus.Active.value}, {run.info.run_id: run.data.metrics["active_state"] for run in runs})
+        self.assertEqual((ModelStatus.Disabled, 0.0), self.get_status(active_run))
+        self.assertEqual((ModelStatus.Active, 1.0), self.get_status(new_run))
+
+        async def list_all():
+            return [page async for page in api.iter_runs("1.0.0", experiment_id=self.experiment_id, page_size=1)]
+        self.assertEqual([new_run, active_run], [page.run_id[0] for page in asyncio.run(list_all())])
+
+    def test_change_statuses_partial_failure(self):
+        run_id = self.create_run(ModelStatus.New)
+        api = self.create_api()
+
+        with self.assertRaises(mlflow_api.StatusUpdateError) as raised:
+            asyncio.run(api.change_statuses({run_id: (ModelStatus.Canary, 0.0), "missing": (ModelStatus.Canary, 0.0)}))
+
+        self.assertEqual(["missing"], list(raised.exception.failures))
+        self.assertEqual([run_id], [run.info.run_id for run in raised.exception.runs])
+        self.assertEqual((ModelStatus.Canary, 0.0), self.get_status(run_id))
+
+    def test_timeout_cancels_calls_that_have_not_started(self):
+        release = threading.Event()
+        calls = []
+
+        def list_runs(*args):
+            calls.append(args)
+            release.wait(5)
+            return DataFrame()
+
+        api = self.create_api(max_concurrency=1)
+
+        async def time_out():
+            running = asyncio.ensure_future(api.list_runs("1.0.0", experiment_id="running"))
+            await asyncio.sleep(0.01)
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(api.list_runs("1.0.0", experiment_id="queued"), 0.05)
+            # The loop keeps serving while the pool is busy.
+            self.assertFalse(running.done())
+            release.set()
+            await running
+
+        with patch.object(mlflow_api, "list_runs", list_runs):
+            asyncio.run(time_out())
+            self.assertEqual(["running"], [args[1] for args in calls])
+
+    def test_cancel_change_statuses(self):
+        release = threading.Event()
+        started = []
+
+        def change_and_get_run(client, run_id, new_active_state, new_test_fraction):
+            started.append(run_id)
+            release.wait(5)
+            return run_id
+
+        api = self.create_api(max_concurrency=1)
+
+        async def cancel():
+            task = asyncio.ensure_future(api.change_statuses({run_id: (ModelStatus.Disabled, 0.0) for run_id in ["a", "b", "c"]}))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            release.set()
+            await api._run(time.sleep, 0)
+
+        notifications = []
+        with patch.object(mlflow_api, "_change_and_get_run", change_and_get_run), \
+                patch.object(mlflow_api, "_notify_status_change", lambda: notifications.append(True)):
+            asyncio.run(cancel())
+
+        self.assertEqual(["a"], started)
+        self.assertEqual([True], notifications)
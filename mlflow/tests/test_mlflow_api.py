@@ -0,0 +1,111 @@
+import time
+
+from mlflow.entities import Run
+from mlflow.tracking import MlflowClient
+from numpy import float64
+from pandas import concat
+from pandas.testing import assert_frame_equal
+
+from mlflow_utilities import mlflow_api
+from mlflow_utilities.model_status import ModelStatus
+from tests.tracking import TrackingTestCase
+
+
+class TestMlflowApi(TrackingTestCase):
+    def test_change_statuses(self):
+        first_run = self.create_run(ModelStatus.New)
+        second_run = self.create_run(ModelStatus.Active, 1.0)
+
+        runs = mlflow_api.change_statuses({first_run: (ModelStatus.Active, 0.5), second_run: (ModelStatus.Canary, None)})
+
+        self.assertTrue(all(isinstance(run, Run) for run in runs))
+        self.assertEqual({first_run: (ModelStatus.Active.value, 0.5), second_run: (ModelStatus.Canary.value, 1.0)},
+                         {run.info.run_id: (run.data.metrics["active_state"], run.data.metrics["test_fraction"]) for run in runs})
+        self.assertEqual((ModelStatus.Active, 0.5), self.get_status(first_run))
+        self.assertEqual((ModelStatus.Canary, 1.0), self.get_status(second_run))
+
+    def test_change_statuses_partial_failure(self):
+        run_id = self.create_run(ModelStatus.New)
+
+        with self.assertRaises(mlflow_api.StatusUpdateError) as raised:
+            mlflow_api.change_statuses({run_id: (ModelStatus.Active, 1.0), "missing": (ModelStatus.Active, 1.0)})
+
+        self.assertEqual(["missing"], list(raised.exception.failures))
+        self.assertEqual([run_id], [run.info.run_id for run in raised.exception.runs])
+        self.assertEqual((ModelStatus.Active, 1.0), self.get_status(run_id))
+
+    def test_update_active_runs(self):
+        kept_active, dropped_active = self.create_run(ModelStatus.Active, 0.5), self.create_run(ModelStatus.Active, 0.5)
+        kept_canary, dropped_canary = self.create_run(ModelStatus.Canary), self.create_run(ModelStatus.Canary)
+        kept_new, untouched_new = self.create_run(ModelStatus.New), self.create_run(ModelStatus.New)
+        zero_new = self.create_run(ModelStatus.New)
+        disabled = self.create_run(ModelStatus.Disabled)
+        other_version = self.create_run(ModelStatus.Active, 1.0, model_version="2.0.0")
+
+        runs = mlflow_api.update_active_runs({kept_active: 1., kept_canary: 1., kept_new: 2., zero_new: 0.}, "1.0.0", experiment_id=self.experiment_id)
+
+        self.assertEqual({kept_active, dropped_active, kept_canary, dropped_canary, kept_new, zero_new}, {run.info.run_id for run in runs})
+        self.assertEqual((ModelStatus.Active, 0.25), self.get_status(kept_active))
+        self.assertEqual((ModelStatus.Active, 0.25), self.get_status(kept_canary))
+        self.assertEqual((ModelStatus.Active, 0.5), self.get_status(kept_new))
+        for run_id in [dropped_active, dropped_canary, zero_new]:
+            self.assertEqual((ModelStatus.Disabled, 0.0), self.get_status(run_id))
+        self.assertEqual((ModelStatus.New, 0.0), self.get_status(untouched_new))
+        self.assertEqual((ModelStatus.Disabled, 0.0), self.get_status(disabled))
+        self.assertEqual((ModelStatus.Active, 1.0), self.get_status(other_version))
+
+        with self.assertRaises(ValueError):
+            mlflow_api.update_active_runs({disabled: 1.}, "1.0.0", experiment_id=self.experiment_id)
+
+    def test_change_test_fractions(self):
+        first_run, second_run, third_run = [self.create_run(ModelStatus.Active, 1 / 3) for _ in range(3)]
+        canary_run = self.create_run(ModelStatus.Canary)
+
+        runs = mlflow_api.change_test_fractions({first_run: 3., second_run: 1.}, "1.0.0", experiment_id=self.experiment_id, active_state=ModelStatus.Active)
+
+        self.assertEqual({first_run: 0.75, second_run: 0.25, third_run: 0.0}, {run.info.run_id: run.data.metrics["test_fraction"] for run in runs})
+        self.assertEqual((ModelStatus.Active, 0.75), self.get_status(first_run))
+        self.assertEqual((ModelStatus.Active, 0.25), self.get_status(second_run))
+        self.assertEqual((ModelStatus.Disabled, 0.0), self.get_status(third_run))
+        self.assertEqual((ModelStatus.Canary, 0.0), self.get_status(canary_run))
+
+    def test_list_runs(self):
+        first_run = self.create_run(ModelStatus.Active, 1.0)
+        time.sleep(0.01)
+        second_run = self.create_run(ModelStatus.New)
+        self.create_run(ModelStatus.Active, 1.0, model_version="1.1.0")
+
+        self.assertEqual([second_run, first_run], list(mlflow_api.list_runs("1.0.0", experiment_name="experiment").run_id))
+        self.assertEqual([second_run], list(mlflow_api.list_runs((1, 0, 0), experiment_id=self.experiment_id, active_state=ModelStatus.New).run_id))
+        self.assertEqual([], list(mlflow_api.list_runs("1.0.0", experiment_id=self.experiment_id, active_state=ModelStatus.Canary).run_id))
+
+        # The most recently changed runs come first, like when runs were reopened to change their status.
+        time.sleep(0.01)
+        mlflow_api.canary_run(first_run)
+        self.assertEqual([first_run, second_run], list(mlflow_api.list_runs("1.0.0", experiment_name="experiment").run_id))
+
+        with self.assertRaises(ValueError):
+            mlflow_api.list_runs("1.0.0", experiment_name="missing")
+
+    def test_iter_runs(self):
+        for active_state in [ModelStatus.Active, ModelStatus.New, ModelStatus.Canary, ModelStatus.Active, ModelStatus.New]:
+            self.create_run(active_state)
+            time.sleep(0.01)
+        MlflowClient().log_metric(self.create_run(ModelStatus.New, extra_params={"owner": "team"}), "accuracy", 0.9)
+        columns = ["run_id", "metrics.active_state", "metrics.accuracy", "params.owner"]
+
+        pages = list(mlflow_api.iter_runs("1.0.0", experiment_id=self.experiment_id, columns=columns, page_size=4))
+        expected = mlflow_api.list_runs("1.0.0", experiment_id=self.experiment_id)[columns]
+
+        self.assertEqual([4, 2], [len(page) for page in pages])
+        streamed = concat(pages, ignore_index=True)
+        assert_frame_equal(expected[columns[:3]], streamed[columns[:3]])
+        for page in pages:
+            self.assertEqual([float64, float64], list(page[["metrics.active_state", "metrics.accuracy"]].dtypes))
+        self.assertEqual(["team"], list(streamed["params.owner"].dropna()))
+
+        limited = list(mlflow_api.iter_runs("1.0.0", experiment_id=self.experiment_id, active_state=ModelStatus.New, page_size=2, limit=3))
+        self.assertEqual([2, 1], [len(page) for page in limited])
+        self.assertTrue((concat(limited)["metrics.active_state"] == ModelStatus.New.value).all())
+        self.assertEqual(list(mlflow_api.DEFAULT_RUN_COLUMNS), list(limited[0].columns))
+
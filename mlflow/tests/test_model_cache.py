@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from mlflow_utilities.model_cache import LazyModel, ModelCache
+
+
+class Model:
+    def __init__(self, uri: str):
+        self.uri = uri
+
+    def predict(self, X):
+        return [self.uri] * len(X)
+
+    def __call__(self, X):
+        return self.predict(X)
+
+
+class Loader:
+    """
+    Loads Model objects and counts the loads, optionally waiting for release or failing.
+    """
+    def __init__(self, error: Exception = None):
+        self.loads = 0
+        self.error = error
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+        self._lock = threading.Lock()
+
+    def load_model(self, uri: str) -> Model:
+        with self._lock:
+            self.loads += 1
+        self.started.set()
+        self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return Model(uri)
+
+
+class TestModelCache(TestCase):
+    def test_get_caches(self):
+        cache = ModelCache()
+        loader = Loader()
+
+        first = cache.get("run", "uri", loader.load_model)
+        second = cache.get("run", "uri", loader.load_model)
+
+        self.assertIs(first, second)
+        self.assertEqual(1, loader.loads)
+
+    def test_evicts_least_recently_used_by_count(self):
+        cache = ModelCache(max_models=2)
+        loader = Loader()
+        cache.get("first", "first", loader.load_model)
+        cache.get("second", "second", loader.load_model)
+        cache.get("first", "first", loader.load_model)
+        cache.get("third", "third", loader.load_model)
+
+        self.assertEqual(2, cache.get_model_count())
+        cache.get("first", "first", loader.load_model)
+        self.assertEqual(3, loader.loads)
+        cache.get("second", "second", loader.load_model)
+        self.assertEqual(4, loader.loads)
+
+    def test_evicts_by_bytes(self):
+        cache = ModelCache(max_models=None, max_bytes=25, estimate_bytes=lambda model: 10)
+        loader = Loader()
+        for run_id in ["first", "second", "third"]:
+            cache.get(run_id, run_id, loader.load_model)
+
+        self.assertEqual(2, cache.get_model_count())
+        self.assertEqual(20, cache.get_total_bytes())
+
+        # A model larger than the bound is still kept, alone.
+        large_cache = ModelCache(max_models=None, max_bytes=5, estimate_bytes=lambda model: 10)
+        large_cache.get("first", "first", loader.load_model)
+        large_cache.get("second", "second", loader.load_model)
+        self.assertEqual(1, large_cache.get_model_count())
+        self.assertEqual(10, large_cache.get_total_bytes())
+
+    def test_single_flight(self):
+        cache = ModelCache()
+        loader = Loader()
+        loader.release.clear()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(cache.get, "run", "uri", loader.load_model) for _ in range(4)]
+            self.assertTrue(loader.started.wait(5))
+            time.sleep(0.05)
+            loader.release.set()
+            models = [future.result() for future in futures]
+
+        self.assertEqual(1, loader.loads)
+        self.assertTrue(all(model is models[0] for model in models))
+
+    def test_error_reaches_waiters(self):
+        cache = ModelCache()
+        loader = Loader(error=OSError("unreachable"))
+        loader.release.clear()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(cache.get, "run", "uri", loader.load_model) for _ in range(3)]
+            self.assertTrue(loader.started.wait(5))
+            time.sleep(0.05)
+            loader.release.set()
+            for future in futures:
+                with self.assertRaises(OSError):
+                    future.result()
+
+        self.assertEqual(1, loader.loads)
+        self.assertEqual(0, cache.get_model_count())
+
+        # A failed load isn't cached, so the next request tries again.
+        loader.error = None
+        self.assertEqual("uri", cache.get("run", "uri", loader.load_model).uri)
+        self.assertEqual(2, loader.loads)
+
+
+class TestLazyModel(TestCase):
+    def test_lazy_model(self):
+        cache = ModelCache()
+        loader = Loader()
+        lazy_model = LazyModel("run", "uri", loader.load_model, cache)
+
+        self.assertEqual("run", lazy_model.get_run_id())
+        self.assertEqual(0, loader.loads)
+        self.assertEqual(["uri", "uri"], lazy_model.predict([1, 2]))
+        self.assertEqual(["uri"], lazy_model([1]))
+        self.assertIs(cache.get("run", "uri", loader.load_model), lazy_model.get_model())
+        self.assertEqual(1, loader.loads)
+        with self.assertRaises(AttributeError):
+            lazy_model._private
@@ -0,0 +1,117 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from pandas import DataFrame
+
+from mlflow_utilities import mlflow_api
+from mlflow_utilities.model_status import ModelStatus
+from mlflow_utilities.run_cache import RunStateCache
+
+
+class FakeListRuns:
+    """
+    Stands in for mlflow_api.list_runs: counts the calls and returns a new DataFrame every time, optionally waiting for release first.
+    """
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def __call__(self, model_version, experiment_id, experiment_name, active_state, submodel_name):
+        self.calls += 1
+        self.started.set()
+        self.release.wait()
+        return DataFrame({"run_id": [f"run-{self.calls}"]})
+
+
+class TestRunStateCache(TestCase):
+    def setUp(self):
+        self.list_runs = FakeListRuns()
+        patcher = patch.object(mlflow_api, "list_runs", self.list_runs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def wait_for_refresh(self, cache: RunStateCache):
+        deadline = time.monotonic() + 5
+        while cache._pending and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def test_get_runs_caches(self):
+        cache = RunStateCache(ttl=60)
+        self.addCleanup(cache.close)
+
+        first = cache.get_runs("1.0.0", experiment_name="experiment")
+        second = cache.get_runs((1, 0, 0), experiment_name="experiment")
+        other_state = cache.get_runs("1.0.0", experiment_name="experiment", active_state=ModelStatus.Canary)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_state)
+        self.assertEqual(2, self.list_runs.calls)
+
+    def test_ttl_expiry_refreshes_in_the_background(self):
+        cache = RunStateCache(ttl=0.05)
+        self.addCleanup(cache.close)
+        first = cache.get_runs("1.0.0", experiment_name="experiment")
+        time.sleep(0.1)
+
+        self.list_runs.release.clear()
+        stale = cache.get_runs("1.0.0", experiment_name="experiment")
+        self.assertIs(first, stale)
+        self.assertTrue(self.list_runs.started.wait(5))
+        self.list_runs.release.set()
+        self.wait_for_refresh(cache)
+
+        refreshed = cache.get_runs("1.0.0", experiment_name="experiment")
+        self.assertEqual(["run-2"], list(refreshed.run_id))
+        self.assertEqual(2, self.list_runs.calls)
+
+    def test_status_change_invalidates(self):
+        cache = RunStateCache(ttl=60)
+        self.addCleanup(cache.close)
+        cache.get_runs("1.0.0", experiment_name="experiment")
+
+        mlflow_api._notify_status_change()
+
+        self.assertEqual(["run-2"], list(cache.get_runs("1.0.0", experiment_name="experiment").run_id))
+
+    def test_fetch_started_before_invalidation_is_not_stored(self):
+        cache = RunStateCache(ttl=60)
+        self.addCleanup(cache.close)
+        self.list_runs.release.clear()
+        fetching = threading.Thread(target=cache.get_runs, args=("1.0.0", None, "experiment"))
+        fetching.start()
+        self.assertTrue(self.list_runs.started.wait(5))
+
+        cache.invalidate()
+        self.list_runs.release.set()
+        fetching.join()
+
+        self.assertEqual({}, dict(cache._entries))
+        self.assertEqual(["run-2"], list(cache.get_runs("1.0.0", experiment_name="experiment").run_id))
+
+    def test_max_entries(self):
+        cache = RunStateCache(ttl=60, max_entries=1)
+        self.addCleanup(cache.close)
+        cache.get_runs("1.0.0", experiment_name="experiment")
+        cache.get_runs("2.0.0", experiment_name="experiment")
+        cache.get_runs("1.0.0", experiment_name="experiment")
+
+        self.assertEqual(3, self.list_runs.calls)
+
+    def test_close(self):
+        cache = RunStateCache(ttl=0)
+        cache.get_runs("1.0.0", experiment_name="experiment")
+        cache.get_runs("1.0.0", experiment_name="experiment")
+        threads = list(cache._executor._threads)
+
+        cache.close()
+
+        self.assertTrue(threads)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        mlflow_api._notify_status_change()
+        self.assertEqual(1, len(cache._entries))
+        with self.assertRaises(RuntimeError):
+            cache.get_runs("2.0.0", experiment_name="experiment")
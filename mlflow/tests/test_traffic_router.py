@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+import threading
+from unittest.mock import patch
+
+from numpy import arange, array, unique
+
+from mlflow_utilities import mlflow_api
+from mlflow_utilities.model_status import ModelStatus
+from mlflow_utilities.traffic_router import TrafficRouter, _uniform_hash, build_routing_table
+from tests.tracking import TrackingTestCase
+
+
+class TestTrafficRouter(TrackingTestCase):
+    def create_router(self, **kwargs) -> TrafficRouter:
+        router = TrafficRouter("1.0.0", experiment_id=self.experiment_id, refresh_interval=None, **kwargs)
+        self.addCleanup(router.close)
+        return router
+
+    def test_build_routing_table(self):
+        table = build_routing_table({"b": 3., "a": 1., "c": 0.}, ["z", "y"])
+
+        self.assertEqual(["a", "b"], list(table.run_ids))
+        self.assertEqual([0.25, 1.0], list(table.cumulative_fractions))
+        self.assertEqual(("y", "z"), table.canary_run_ids)
+
+        empty_table = build_routing_table({"a": 0.}, ["y"])
+        self.assertEqual(0, empty_table.run_ids.shape[0])
+        self.assertEqual(("y",), empty_table.canary_run_ids)
+
+    def test_routes_by_test_fraction(self):
+        first_run, second_run = self.create_run(ModelStatus.Active, 0.2), self.create_run(ModelStatus.Active, 0.6)
+        self.create_run(ModelStatus.Active, 1.0, model_version="2.0.0")
+        self.create_run(ModelStatus.Disabled)
+        canary_run = self.create_run(ModelStatus.Canary)
+        router = self.create_router(seed=0)
+
+        self.assertEqual(sorted([first_run, second_run]), list(router.get_table().run_ids))
+        self.assertEqual((canary_run,), router.get_table().canary_run_ids)
+
+        run_ids, counts = unique(router.route(batch_size=100000), return_counts=True)
+        shares = dict(zip(run_ids, counts / 100000))
+        self.assertEqual({first_run, second_run}, set(shares))
+        self.assertAlmostEqual(0.25, shares[first_run], 2)
+        self.assertAlmostEqual(0.75, shares[second_run], 2)
+
+        with self.assertRaises(ValueError):
+            router.route()
+
+    def test_sticky_routing(self):
+        router = self.create_router()
+        router.set_table(build_routing_table({"a": 1., "b": 1., "c": 2.}))
+        entity_ids = arange(100000)
+
+        routed = router.route(entity_ids=entity_ids)
+        self.assertTrue((routed == router.route(entity_ids=entity_ids[::-1])[::-1]).all())
+        self.assertTrue((routed[:10] == router.route(entity_ids=list(entity_ids[:10]))).all())
+        self.assertAlmostEqual(0.5, (routed == "c").mean(), 2)
+
+        # The hash doesn't depend on the process, unlike the built-in hash of strings.
+        user_ids = ["user-1", "user-2", "user-3"]
+        self.assertEqual(list(router.route(entity_ids=array(user_ids, dtype=object))), list(router.route(entity_ids=user_ids)))
+        script = "from mlflow_utilities.traffic_router import _uniform_hash; print(list(_uniform_hash(['user-1', 'user-2', 'user-3'])))"
+        outputs = {subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.dirname(__file__)),
+                                  env={**os.environ, "PYTHONHASHSEED": seed}).stdout for seed in ["1", "2"]}
+        self.assertEqual([str(list(_uniform_hash(user_ids)))], [output.strip() for output in outputs])
+
+    def test_no_active_runs(self):
+        new_run = self.create_run(ModelStatus.New)
+        canary_run = self.create_run(ModelStatus.Canary)
+        router = self.create_router()
+
+        self.assertEqual((canary_run,), router.get_table().canary_run_ids)
+        with self.assertRaisesRegex(ValueError, "no Active runs"):
+            router.route(batch_size=10)
+
+        mlflow_api.enable_run(new_run)
+        router.refresh()
+        self.assertEqual([new_run] * 10, list(router.route(batch_size=10)))
+
+    def test_background_refresh(self):
+        run_id = self.create_run(ModelStatus.New)
+        router = TrafficRouter("1.0.0", experiment_id=self.experiment_id, refresh_interval=0.01)
+        self.addCleanup(router.close)
+        refreshed = threading.Event()
+        set_table = router.set_table
+        router.set_table = lambda table: (set_table(table), table.run_ids.shape[0] and refreshed.set())
+
+        mlflow_api.enable_run(run_id)
+
+        self.assertTrue(refreshed.wait(10))
+        self.assertEqual([run_id], list(router.route(batch_size=1)))
+
+    def test_failed_refresh(self):
+        run_id = self.create_run(ModelStatus.Active, 1.0)
+        router = TrafficRouter("1.0.0", experiment_id=self.experiment_id, refresh_interval=0.01)
+        self.addCleanup(router.close)
+        failed = threading.Event()
+
+        def list_runs(*args):
+            if router.get_last_refresh_error() is not None and router.get_last_refresh_error().consecutive_failures >= 2:
+                failed.set()
+            raise ConnectionError("tracking server down")
+
+        with self.assertLogs("mlflow_utilities.traffic_router", "ERROR") as logs, patch("mlflow_utilities.traffic_router._list_runs", list_runs):
+            self.assertTrue(failed.wait(10))
+
+        router.close()
+        failure = router.get_last_refresh_error()
+        self.assertIsInstance(failure.error, ConnectionError)
+        self.assertGreaterEqual(failure.consecutive_failures, 2)
+        self.assertIn("tracking server down", logs.output[0])
+        # The previous table keeps serving.
+        self.assertEqual([run_id], list(router.route(batch_size=1)))
+
+        router.refresh()
+        self.assertIsNone(router.get_last_refresh_error())
+
+    def test_mirror(self):
+        router = self.create_router()
+        router.set_table(build_routing_table({"a": 1.}, ["canary", "failing"]))
+
+        def score(run_id):
+            if run_id == "failing":
+                raise RuntimeError(run_id)
+            return run_id
+
+        futures = router.mirror(score)
+        self.assertEqual("canary", futures[0].result())
+        self.assertIsInstance(futures[1].exception(), RuntimeError)
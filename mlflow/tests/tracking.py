@@ -0,0 +1,42 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict
+from unittest import TestCase
+
+import mlflow
+
+from mlflow_utilities.model_status import ModelStatus
+
+
+class TrackingTestCase(TestCase):
+    """
+    Test case with its own local file tracking server, removed after every test.
+    """
+    def setUp(self):
+        os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+        self._directory = tempfile.mkdtemp()
+        self._previous_uri = mlflow.get_tracking_uri()
+        mlflow.set_tracking_uri(Path(self._directory).as_uri())
+        self.experiment_id = mlflow.create_experiment("experiment")
+
+    def tearDown(self):
+        mlflow.set_tracking_uri(self._previous_uri)
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def create_run(self, active_state: ModelStatus, test_fraction: float = 0.0, model_version: str = "1.0.0",
+                   extra_params: Dict[str, str] = {}) -> str:
+        """
+        Creates a finished run in the versioning framework, without a model.
+        """
+        major, minor, micro = model_version.split(".")
+        with mlflow.start_run(experiment_id=self.experiment_id) as run:
+            mlflow.log_params({"submodel_name": "experiment", "major_version": major, "minor_version": minor, "micro_version": micro, **extra_params})
+            mlflow.log_metric("active_state", active_state.value)
+            mlflow.log_metric("test_fraction", test_fraction)
+        return run.info.run_id
+
+    def get_status(self, run_id: str):
+        metrics = mlflow.get_run(run_id).data.metrics
+        return ModelStatus(metrics["active_state"]), metrics["test_fraction"]
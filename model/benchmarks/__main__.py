@@ -0,0 +1,48 @@
+import argparse
+import sys
+
+from benchmarks import evaluation, harness, regression
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks for model_utilities. Run from the model folder.")
+    parser.add_argument("--suite", choices=["evaluation", "regression", "all"], default="all")
+    parser.add_argument("--max-rows", type=int, default=10 ** 5, help="Largest row count for the evaluation suite (up to 10000000).")
+    parser.add_argument("--max-cells", type=int, default=10 ** 7, help="Largest rows times classes for the multiclass cases.")
+    parser.add_argument("--max-fit-rows", type=int, default=10 ** 4, help="Largest row count for the regression suite.")
+    parser.add_argument("--max-features", type=int, default=5, help="Largest feature count for the regression suite.")
+    parser.add_argument("--skip-reference", action="store_true", help="Skip the pure Python cutoff functions.")
+    parser.add_argument("--skip-global-seed", action="store_true", help="Skip the fits seeded with the multi-start global search.")
+    parser.add_argument("--repeats", type=int, default=5, help="Minimum number of timed runs per case; the best is kept.")
+    parser.add_argument("--min-total-seconds", type=float, default=0.2, help="Keep repeating fast cases until their timed runs add up to this.")
+    parser.add_argument("--output", help="Write the results as JSON to this path.")
+    parser.add_argument("--baseline", help="Compare against the JSON results stored at this path.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to the --baseline path instead of comparing.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown or memory increase.")
+    parser.add_argument("--min-seconds", type=float, default=1e-3, help="Slowdowns smaller than this are never regressions.")
+    parser.add_argument("--min-bytes", type=int, default=2 ** 16, help="Memory increases smaller than this are never regressions.")
+    args = parser.parse_args(argv)
+
+    cases = []
+    if args.suite in ("evaluation", "all"):
+        cases.extend(evaluation.cases(args.max_rows, args.max_cells, not args.skip_reference))
+    if args.suite in ("regression", "all"):
+        cases.extend(regression.cases(args.max_fit_rows, args.max_features, not args.skip_global_seed))
+
+    results = harness.run(cases, args.repeats,
+                          lambda result: print(f"{result.key():70s} {result.seconds:10.4f}s {result.peak_bytes / 2 ** 20:10.1f} MiB", flush=True),
+                          args.min_total_seconds)
+    if args.output:
+        harness.save(results, args.output)
+    if args.baseline and args.save_baseline:
+        harness.save(results, args.baseline)
+    elif args.baseline:
+        regressions = harness.compare(results, harness.load(args.baseline), args.tolerance, args.min_seconds, args.min_bytes)
+        for regression_message in regressions:
+            print("REGRESSION " + regression_message)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+from typing import Iterator, Tuple
+
+from numpy import ndarray, arange
+from numpy.random import default_rng
+
+from benchmarks.harness import BenchmarkCase
+from model_utilities.evaluation.array_cutoff import find_cutoff_array, find_cutoff_sorted_array, find_multiclass_cutoffs_array
+from model_utilities.evaluation.class_cutoff import find_cutoff, find_cutoff_sorted, find_multiclass_cutoffs
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+
+ROW_COUNTS = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+# Number of distinct probabilities, None meaning continuous scores without ties.
+TIE_LEVELS = [None, 1000, 50]
+CLASS_COUNTS = [3, 30, 300]
+
+
+def _binary_data(rows: int, levels: int) -> Tuple[ndarray, ndarray]:
+    rng = default_rng(0)
+    predicted = rng.random(rows) if levels is None else rng.integers(0, levels, rows) / levels
+    actual = (rng.random(rows) < predicted).astype(int)
+    return actual, predicted
+
+
+def _multiclass_data(rows: int, classes: int) -> Tuple[ndarray, ndarray]:
+    rng = default_rng(0)
+    actual = rng.permutation(rows) % classes
+    predicted = rng.random((rows, classes))
+    predicted[arange(rows), actual] += rng.random(rows)
+    return actual, predicted
+
+
+def _sorted_pairs(rows: int, levels: int):
+    actual, predicted = _binary_data(rows, levels)
+    order = predicted.argsort()[::-1]
+    return actual[order], predicted[order]
+
+
+def cases(max_rows: int = 10 ** 5, max_cells: int = 10 ** 7, reference: bool = True) -> Iterator[BenchmarkCase]:
+    """
+    Benchmark cases for the cutoff search, sweeping the number of rows, the density of tied probabilities and the number of classes.
+
+    Args:
+        max_rows (int): Largest row count to run.
+        max_cells (int): Largest rows times classes to run for the multiclass cases.
+        reference (bool): Whether to include the pure Python functions from class_cutoff, which are slow on large inputs.
+    """
+    for rows in [rows for rows in ROW_COUNTS if rows <= max_rows]:
+        for levels in TIE_LEVELS:
+            parameters = {"rows": rows, "levels": levels or "continuous"}
+            if reference:
+                yield BenchmarkCase("find_cutoff", parameters,
+                                    lambda rows=rows, levels=levels: [list(x) for x in _binary_data(rows, levels)],
+                                    lambda data: find_cutoff(data[0], data[1]))
+                yield BenchmarkCase("find_cutoff_sorted", parameters,
+                                    lambda rows=rows, levels=levels: list(zip(*_sorted_pairs(rows, levels))),
+                                    lambda data: find_cutoff_sorted(data, CutoffMethod.AbsoluteDistance, 1))
+            yield BenchmarkCase("find_cutoff_array", parameters,
+                                lambda rows=rows, levels=levels: _binary_data(rows, levels),
+                                lambda data: find_cutoff_array(data[0], data[1]))
+            yield BenchmarkCase("find_cutoff_sorted_array", parameters,
+                                lambda rows=rows, levels=levels: _sorted_pairs(rows, levels),
+                                lambda data: find_cutoff_sorted_array(data[0], data[1]))
+
+        for classes in [classes for classes in CLASS_COUNTS if rows * classes <= max_cells]:
+            parameters = {"rows": rows, "classes": classes}
+            class_map = {i: i for i in range(classes)}
+            if reference:
+                yield BenchmarkCase("find_multiclass_cutoffs", parameters,
+                                    lambda rows=rows, classes=classes: [data.tolist() for data in _multiclass_data(rows, classes)],
+                                    lambda data, class_map=class_map: find_multiclass_cutoffs(data[0], data[1], class_map))
+            yield BenchmarkCase("find_multiclass_cutoffs_array", parameters,
+                                lambda rows=rows, classes=classes: _multiclass_data(rows, classes),
+                                lambda data, class_map=class_map: find_multiclass_cutoffs_array(data[0], data[1], class_map))
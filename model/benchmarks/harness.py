@@ -0,0 +1,111 @@
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple
+
+
+class BenchmarkCase(NamedTuple):
+    """
+    A single benchmark: a name, the parameters of the sweep point and the function to time. setup is run before every measurement and its result is passed to function, so data generation isn't timed.
+    """
+    name: str
+    parameters: Dict[str, Any]
+    setup: Callable[[], Any]
+    function: Callable[[Any], Any]
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    parameters: Dict[str, Any]
+    seconds: float
+    peak_bytes: int
+
+    def key(self) -> str:
+        return self.name + "[" + ",".join(f"{name}={value}" for name, value in sorted(self.parameters.items())) + "]"
+
+
+def measure(case: BenchmarkCase, repeats: int = 5, min_total_seconds: float = 0.2, max_repeats: int = 1000) -> BenchmarkResult:
+    """
+    Times a benchmark case, keeping the best of several repeats, then measures its peak memory in a separate traced run so tracing doesn't skew the timings. Numpy allocations are included in the peak.
+
+    Fast cases keep repeating until min_total_seconds of timed runs, so the best time of a sub-millisecond case is taken over enough runs to be stable.
+
+    Args:
+        case (BenchmarkCase): The case to run.
+        repeats (int): Minimum number of timed runs.
+        min_total_seconds (float): Keep repeating until the timed runs add up to this many seconds.
+        max_repeats (int): Maximum number of timed runs.
+
+    Returns:
+        BenchmarkResult: The best wall time in seconds and the peak traced memory in bytes.
+    """
+    best = float("inf")
+    total = 0.0
+    count = 0
+    while count < repeats or (total < min_total_seconds and count < max_repeats):
+        argument = case.setup()
+        start = time.perf_counter()
+        case.function(argument)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        count += 1
+
+    argument = case.setup()
+    tracemalloc.start()
+    try:
+        case.function(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(case.name, case.parameters, best, peak)
+
+
+def run(cases: Iterable[BenchmarkCase], repeats: int = 5, report: Callable[[BenchmarkResult], None] = lambda result: None, min_total_seconds: float = 0.2) -> List[BenchmarkResult]:
+    results = []
+    for case in cases:
+        result = measure(case, repeats, min_total_seconds)
+        report(result)
+        results.append(result)
+    return results
+
+
+def save(results: Iterable[BenchmarkResult], path: str):
+    with open(path, "w") as f:
+        json.dump([result._asdict() for result in results], f, indent=2)
+
+
+def load(path: str) -> List[BenchmarkResult]:
+    with open(path) as f:
+        return [BenchmarkResult(**result) for result in json.load(f)]
+
+
+def compare(results: Iterable[BenchmarkResult],
+            baseline: Iterable[BenchmarkResult],
+            tolerance: float = 0.25,
+            min_seconds: float = 1e-3,
+            min_bytes: int = 2 ** 16) -> List[str]:
+    """
+    Compares results against a baseline. Cases missing from the baseline are skipped. A case counts as a regression only when it is both tolerance slower (or larger) relative to the baseline and at least min_seconds (or min_bytes) worse in absolute terms, so timer noise on sub-millisecond cases isn't reported.
+
+    Args:
+        results (Iterable[BenchmarkResult]): The new results.
+        baseline (Iterable[BenchmarkResult]): The stored results.
+        tolerance (float): Allowed relative increase in time or peak memory before a case counts as a regression.
+        min_seconds (float): Increases in time below this many seconds are never regressions.
+        min_bytes (int): Increases in peak memory below this many bytes are never regressions.
+
+    Returns:
+        List[str]: A description of every regression.
+    """
+    baseline_by_key = {result.key(): result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_key.get(result.key())
+        if previous is None:
+            continue
+        if result.seconds > previous.seconds * (1 + tolerance) and result.seconds - previous.seconds >= min_seconds:
+            regressions.append(f"{result.key()}: time {previous.seconds:.4f}s -> {result.seconds:.4f}s")
+        if result.peak_bytes > previous.peak_bytes * (1 + tolerance) and result.peak_bytes - previous.peak_bytes >= min_bytes:
+            regressions.append(f"{result.key()}: peak memory {previous.peak_bytes} -> {result.peak_bytes} bytes")
+    return regressions
@@ -0,0 +1,35 @@
+from typing import Iterator, Tuple
+
+from numpy import ndarray, exp
+from numpy.random import default_rng
+
+from benchmarks.harness import BenchmarkCase
+from model_utilities.regression.logistic import NumpyLassoLogisticModel
+
+ROW_COUNTS = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+FEATURE_COUNTS = [1, 5, 20]
+
+
+def _logistic_data(rows: int, features: int) -> Tuple[ndarray, ndarray]:
+    rng = default_rng(0)
+    X = rng.normal(size=(rows, features))
+    theta = rng.normal(size=features)
+    Y = 1. / (1. + exp(X.dot(theta) + 0.5)) + rng.normal(scale=0.01, size=rows)
+    return X, Y
+
+
+def cases(max_rows: int = 10 ** 4, max_features: int = 5, global_seed: bool = True) -> Iterator[BenchmarkCase]:
+    """
+    Benchmark cases for NumpyLassoLogisticModel.fit, sweeping the number of rows, the number of features and global_seed.
+
+    Args:
+        max_rows (int): Largest row count to run.
+        max_features (int): Largest feature count to run.
+        global_seed (bool): Whether to include the fits seeded with the multi-start global search, which are slower.
+    """
+    for rows in [rows for rows in ROW_COUNTS if rows <= max_rows]:
+        for features in [features for features in FEATURE_COUNTS if features <= max_features]:
+            for seeded in [False, True] if global_seed else [False]:
+                yield BenchmarkCase("NumpyLassoLogisticModel.fit", {"rows": rows, "features": features, "global_seed": seeded},
+                                    lambda rows=rows, features=features: _logistic_data(rows, features),
+                                    lambda data, seeded=seeded: NumpyLassoLogisticModel(alpha=0.001).fit(data[0], data[1], global_seed=seeded))
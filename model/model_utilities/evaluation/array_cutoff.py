@@ -0,0 +1,493 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Sequence, Tuple, Union, Dict, Any, List, NamedTuple, Optional
+
+from numpy import ndarray, asarray, argmin, argsort, arange, array, bincount, concatenate, cumsum, diff, empty, flatnonzero, errstate, float64, inf, int64, add, maximum, multiply, take_along_axis, unique, where, zeros
+
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+
+ArrayLike = Union[ndarray, Sequence[float]]
+
+
+class CutoffSweep(NamedTuple):
+    """
+    Result of sweep_cutoffs.
+
+    scores: The distinct probabilities in descending order.
+    true_positives: Number of true positives at each cutoff. Entry 0 classifies nothing as positive and entry k classifies the k highest distinct probabilities as positive.
+    false_positives: Number of false positives at each cutoff, in the same layout.
+    penalties: Penalty curves keyed by (cutoff method, use rates over counts), with one row per cutoff and one column per importance ratio.
+    cutoffs: Optimal cutoffs keyed by (cutoff method, importance ratio, use rates over counts).
+    """
+    scores: ndarray
+    true_positives: ndarray
+    false_positives: ndarray
+    penalties: Dict[Tuple[CutoffMethod, bool], ndarray]
+    cutoffs: Dict[Tuple[CutoffMethod, float, bool], float]
+
+
+def _as_input_arrays(actual: ArrayLike, predicted: ArrayLike) -> Tuple[ndarray, ndarray]:
+    """
+    Converts the inputs into flat arrays without copying them when they are already arrays (this includes pandas Series).
+
+    Args:
+        actual: Observed values (true positive is 1, true negative is 0).
+        predicted: Probabilities of a positive value. Must match the ordering of the actuals provided.
+
+    Returns:
+        A boolean array flagging the positives and the array of predictions.
+    """
+    actual_array = asarray(actual).ravel()
+    predicted_array = asarray(predicted).ravel()
+    if actual_array.shape != predicted_array.shape:
+        raise ValueError("Actual and predicted must be the same size.")
+    return actual_array != 0, predicted_array
+
+
+def _aggregate_sorted(is_positive: ndarray, sorted_predicted: ndarray) -> Tuple[ndarray, ndarray, ndarray]:
+    """
+    Groups observations already sorted in descending order of probability by their distinct probabilities.
+
+    Args:
+        is_positive (ndarray): Boolean array flagging the positives.
+        sorted_predicted (ndarray): Probabilities sorted in descending order.
+
+    Returns:
+        The distinct probabilities in descending order, and the positive and negative counts for each of them.
+    """
+    if sorted_predicted.shape[0] == 0:
+        return sorted_predicted, empty(0, dtype=int64), empty(0, dtype=int64)
+    starts = concatenate(([0], flatnonzero(sorted_predicted[1:] != sorted_predicted[:-1]) + 1))
+    positives = add.reduceat(is_positive.astype(int64), starts)
+    totals = diff(concatenate((starts, [sorted_predicted.shape[0]])))
+    return sorted_predicted[starts], positives, totals - positives
+
+
+def _aggregate_unsorted(is_positive: ndarray, predicted: ndarray, sample_weight: Optional[ndarray] = None) -> Tuple[ndarray, ndarray, ndarray]:
+    """
+    Groups observations by their distinct probabilities. Sorting is done once by numpy rather than with Python tuples.
+
+    Args:
+        is_positive (ndarray): Boolean array flagging the positives.
+        predicted (ndarray): Probabilities in any order.
+        sample_weight (Optional[ndarray]): Weight of each observation. Counts are used when not provided.
+
+    Returns:
+        The distinct probabilities in descending order, and the positive and negative counts (or weights) for each of them.
+    """
+    scores, inverse = unique(predicted, return_inverse=True)
+    inverse = inverse.ravel()
+    if sample_weight is not None:
+        positives = bincount(inverse, weights=where(is_positive, sample_weight, 0.0), minlength=scores.shape[0])
+        negatives = bincount(inverse, weights=where(is_positive, 0.0, sample_weight), minlength=scores.shape[0])
+        return scores[::-1], positives[::-1], negatives[::-1]
+    totals = bincount(inverse, minlength=scores.shape[0])
+    positives = bincount(inverse[is_positive], minlength=scores.shape[0])
+    return scores[::-1], positives[::-1], (totals - positives)[::-1]
+
+
+def _merge_aggregates(scores: ndarray, positives: ndarray, negatives: ndarray,
+                      other_scores: ndarray, other_positives: ndarray, other_negatives: ndarray) -> Tuple[ndarray, ndarray, ndarray]:
+    """
+    Merges two sets of distinct probabilities with their counts, adding the counts of probabilities present in both.
+
+    Args:
+        scores (ndarray): First set of distinct probabilities, in any order.
+        positives (ndarray): Positive counts for the first set.
+        negatives (ndarray): Negative counts for the first set.
+        other_scores (ndarray): Second set of distinct probabilities, in any order.
+        other_positives (ndarray): Positive counts for the second set.
+        other_negatives (ndarray): Negative counts for the second set.
+
+    Returns:
+        The merged distinct probabilities in ascending order, and their positive and negative counts.
+    """
+    return _merge_many_aggregates([scores, other_scores], [positives, other_positives], [negatives, other_negatives])
+
+
+def _merge_many_aggregates(scores: Sequence[ndarray], positives: Sequence[ndarray], negatives: Sequence[ndarray]) -> Tuple[ndarray, ndarray, ndarray]:
+    """
+    Merges any number of sets of distinct probabilities with their counts in a single pass, adding the counts of probabilities present in several of them.
+
+    Args:
+        scores (Sequence[ndarray]): The sets of distinct probabilities, each in any order. Must not be empty.
+        positives (Sequence[ndarray]): Positive counts for each set.
+        negatives (Sequence[ndarray]): Negative counts for each set.
+
+    Returns:
+        The merged distinct probabilities in ascending order, and their positive and negative counts.
+    """
+    merged_scores, inverse = unique(concatenate(scores), return_inverse=True)
+    inverse = inverse.ravel()
+    all_positives = concatenate(positives)
+    all_negatives = concatenate(negatives)
+    # bincount sums in float64, which is exact for counts below 2 ** 53.
+    merged_positives = bincount(inverse, weights=all_positives, minlength=merged_scores.shape[0]).astype(all_positives.dtype, copy=False)
+    merged_negatives = bincount(inverse, weights=all_negatives, minlength=merged_scores.shape[0]).astype(all_negatives.dtype, copy=False)
+    return merged_scores, merged_positives, merged_negatives
+
+
+def _penalty_curve(positives: ndarray,
+                   negatives: ndarray,
+                   cutoff_method: CutoffMethod,
+                   false_positive_versus_negative_importance: Union[float, ndarray],
+                   use_rates_over_counts: bool) -> ndarray:
+    """
+    Calculates the penalty for every possible cutoff. The first entry is the penalty when nothing is classified as positive and entry k is the penalty once the k highest distinct probabilities are classified as positive.
+
+    The score updates are accumulated in the same order as the incremental updates of find_cutoff_sorted (cumsum is sequential), so both produce the same floating point values.
+
+    Args:
+        positives (ndarray): Positive counts (or weights) for each distinct probability, in descending order of probability.
+        negatives (ndarray): Negative counts (or weights) for each distinct probability, in descending order of probability.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives. A 1-dimensional array evaluates every ratio at once.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+
+    Returns:
+        ndarray: The penalties, one longer than the number of distinct probabilities. Has an extra dimension for the ratios when several are provided.
+    """
+    total_positives = positives.sum().item()
+    total_negatives = negatives.sum().item()
+    denominator_positives = total_positives if use_rates_over_counts else 1
+    denominator_negatives = total_negatives if use_rates_over_counts else 1
+    if denominator_positives == 0 or denominator_negatives == 0:
+        raise ValueError("Both positive and negative observations are required when using rates.")
+
+    importance = asarray(false_positive_versus_negative_importance)
+    positive_steps = positives.reshape(positives.shape + (1,) * importance.ndim)
+    if cutoff_method == CutoffMethod.AbsoluteDistance:
+        # find_cutoff_sorted subtracts the true positives and then adds the false positives, so both are interleaved to keep the rounding identical.
+        steps = empty((2 * positives.shape[0] + 1,) + importance.shape, dtype=float64)
+        steps[0] = total_positives / denominator_positives
+        steps[1::2] = -(positive_steps / denominator_positives)
+        steps[2::2] = multiply.outer(negatives, importance) / denominator_negatives
+        return cumsum(steps, axis=0)[::2]
+    elif cutoff_method == CutoffMethod.DistanceSquared:
+        false_negatives = total_positives - (cumsum(positive_steps, axis=0) - positive_steps)
+        false_positives = cumsum(negatives) - negatives
+        steps = empty((positives.shape[0] + 1,) + importance.shape, dtype=float64)
+        steps[0] = (total_positives * total_positives) / (denominator_positives * denominator_positives)
+        steps[1:] = (positive_steps * positive_steps - 2 * positive_steps * false_negatives) / (denominator_positives * denominator_positives)
+        steps[1:] += multiply.outer(negatives * negatives + 2 * false_positives * negatives, importance) / (denominator_negatives * denominator_negatives)
+        return cumsum(steps, axis=0)
+    raise ValueError("Unknown cutoff method.")
+
+
+def _column_penalty_curves(positives: ndarray,
+                           negatives: ndarray,
+                           cutoff_method: CutoffMethod,
+                           false_positive_versus_negative_importance: float,
+                           use_rates_over_counts: bool) -> ndarray:
+    """
+    Column-wise version of _penalty_curve: calculates the penalty curves of many independent problems at once, one per column, each with its own totals. Rows with no observations leave the penalty unchanged.
+
+    Args:
+        positives (ndarray): 2-dimensional array of positive counts, in descending order of probability down each column.
+        negatives (ndarray): 2-dimensional array of negative counts, in the same layout.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+
+    Returns:
+        ndarray: The penalties, with one more row than the counts. Columns without both positives and negatives are not finite when using rates.
+    """
+    total_positives = positives.sum(axis=0)
+    total_negatives = negatives.sum(axis=0)
+    denominator_positives = total_positives if use_rates_over_counts else 1
+    denominator_negatives = total_negatives if use_rates_over_counts else 1
+
+    with errstate(divide="ignore", invalid="ignore"):
+        if cutoff_method == CutoffMethod.AbsoluteDistance:
+            steps = empty((2 * positives.shape[0] + 1, positives.shape[1]), dtype=float64)
+            steps[0] = total_positives / denominator_positives
+            steps[1::2] = -(positives / denominator_positives)
+            steps[2::2] = negatives * false_positive_versus_negative_importance / denominator_negatives
+            return cumsum(steps, axis=0)[::2]
+        elif cutoff_method == CutoffMethod.DistanceSquared:
+            false_negatives = total_positives - (cumsum(positives, axis=0) - positives)
+            false_positives = cumsum(negatives, axis=0) - negatives
+            steps = empty((positives.shape[0] + 1, positives.shape[1]), dtype=float64)
+            steps[0] = (total_positives * total_positives) / (denominator_positives * denominator_positives)
+            steps[1:] = (positives * positives - 2 * positives * false_negatives) / (denominator_positives * denominator_positives)
+            steps[1:] += (false_positive_versus_negative_importance * (negatives * negatives + 2 * false_positives * negatives)) / (denominator_negatives * denominator_negatives)
+            return cumsum(steps, axis=0)
+    raise ValueError("Unknown cutoff method.")
+
+
+def _best_cutoff(scores: ndarray, penalties: ndarray) -> float:
+    """
+    Picks the cutoff with the lowest penalty. Ties go to the highest probability, like find_cutoff_sorted.
+
+    Args:
+        scores (ndarray): The distinct probabilities in descending order.
+        penalties (ndarray): The penalty curve from _penalty_curve.
+
+    Returns:
+        The cutoff probability, or 0 if classifying nothing as positive is best.
+    """
+    best_index = int(argmin(penalties))
+    return 0.0 if best_index == 0 else scores[best_index - 1].item()
+
+
+def find_cutoff_sorted_array(sorted_actual: ArrayLike,
+                             sorted_predicted: ArrayLike,
+                             cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                             false_positive_versus_negative_importance: float = 1,
+                             use_rates_over_counts: bool = True) -> float:
+    """
+    Array version of find_cutoff_sorted. Runs of tied probabilities are grouped at once and the penalties are calculated with cumulative sums instead of a Python loop.
+
+    Args:
+        sorted_actual: Array of observed values (true positive is 1, true negative is 0), sorted in descending order of probability.
+        sorted_predicted: Array of probabilities of a positive value, sorted in descending order.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+
+    Returns:
+        The cutoff probability that optimizes the balance of false positives and false negatives.
+    """
+    is_positive, predicted = _as_input_arrays(sorted_actual, sorted_predicted)
+    scores, positives, negatives = _aggregate_sorted(is_positive, predicted)
+    penalties = _penalty_curve(positives, negatives, cutoff_method, false_positive_versus_negative_importance, use_rates_over_counts)
+    return _best_cutoff(scores, penalties)
+
+
+def find_cutoff_array(actual: ArrayLike,
+                      predicted: ArrayLike,
+                      cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                      false_positive_versus_negative_importance: float = 1,
+                      use_rates_over_counts: bool = True,
+                      sample_weight: Optional[ArrayLike] = None) -> float:
+    """
+    Array version of find_cutoff. Accepts numpy arrays and pandas Series directly and returns the same cutoff as find_cutoff, without building Python tuples.
+
+    Args:
+        actual: Array of observed values (true positive is 1, true negative is 0).
+        predicted: Array of probabilities of a positive value. Must match the ordering of the actuals provided.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+        sample_weight: Optional weight of each observation. Penalties then use weighted counts.
+
+    Returns:
+        The cutoff probability that optimizes the balance of false positives and false negatives.
+    """
+    scores, positives, negatives = aggregate_scores(actual, predicted, sample_weight)
+    penalties = _penalty_curve(positives, negatives, cutoff_method, false_positive_versus_negative_importance, use_rates_over_counts)
+    return _best_cutoff(scores, penalties)
+
+
+def aggregate_scores(actual: ArrayLike,
+                     predicted: ArrayLike,
+                     sample_weight: Optional[ArrayLike] = None) -> Tuple[ndarray, ndarray, ndarray]:
+    """
+    Builds the aggregated input of find_cutoff_aggregated from raw arrays, i.e. the positive and negative count for every distinct probability.
+
+    Args:
+        actual: Array of observed values (true positive is 1, true negative is 0).
+        predicted: Array of probabilities of a positive value. Must match the ordering of the actuals provided.
+        sample_weight: Optional weight of each observation. The counts are then sums of weights.
+
+    Returns:
+        The distinct probabilities in descending order, and the positive and negative counts for each of them.
+    """
+    is_positive, predicted_array = _as_input_arrays(actual, predicted)
+    weights = None
+    if sample_weight is not None:
+        weights = asarray(sample_weight, dtype=float64).ravel()
+        if weights.shape != predicted_array.shape:
+            raise ValueError("Sample weights must be the same size as the predictions.")
+    return _aggregate_unsorted(is_positive, predicted_array, weights)
+
+
+def find_cutoff_aggregated(scores: ArrayLike,
+                           positives: ArrayLike,
+                           negatives: ArrayLike,
+                           cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                           false_positive_versus_negative_importance: float = 1,
+                           use_rates_over_counts: bool = True) -> float:
+    """
+    Finds the optimal cutoff from pre-aggregated input, so runtime and memory scale with the number of distinct probabilities rather than the number of observations (e.g. for tree models). Returns the same cutoff as find_cutoff on the expanded observations.
+
+    Args:
+        scores: Distinct probabilities, in any order.
+        positives: Number (or total weight) of positive observations for each probability.
+        negatives: Number (or total weight) of negative observations for each probability.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+
+    Returns:
+        The cutoff probability that optimizes the balance of false positives and false negatives.
+    """
+    score_array = asarray(scores).ravel()
+    positive_array = asarray(positives).ravel()
+    negative_array = asarray(negatives).ravel()
+    if not (score_array.shape == positive_array.shape == negative_array.shape):
+        raise ValueError("Scores, positives and negatives must be the same size.")
+    order = argsort(score_array, kind="stable")[::-1]
+    sorted_scores = score_array[order]
+    if (sorted_scores[1:] == sorted_scores[:-1]).any():
+        raise ValueError("Scores must be distinct.")
+    penalties = _penalty_curve(positive_array[order], negative_array[order], cutoff_method, false_positive_versus_negative_importance, use_rates_over_counts)
+    return _best_cutoff(sorted_scores, penalties)
+
+
+def sweep_cutoffs(actual: ArrayLike,
+                  predicted: ArrayLike,
+                  false_positive_versus_negative_importances: Sequence[float],
+                  cutoff_methods: Sequence[CutoffMethod] = tuple(CutoffMethod),
+                  use_rates_over_counts: Sequence[bool] = (True, False)) -> CutoffSweep:
+    """
+    Finds the optimal cutoffs for many combinations of cutoff method, importance ratio and rates versus counts at once. The data is sorted and the cumulative confusion matrix is built a single time, then every combination is evaluated against it. Each cutoff is the same as find_cutoff returns for that combination.
+
+    Args:
+        actual: Array of observed values (true positive is 1, true negative is 0).
+        predicted: Array of probabilities of a positive value. Must match the ordering of the actuals provided.
+        false_positive_versus_negative_importances: Ratios of the penalties associated to false positives over false negatives.
+        cutoff_methods: Cutoff metrics you would like applied.
+        use_rates_over_counts: Whether to use rates (True) and/or counts (False) when evaluating the penalties.
+
+    Returns:
+        CutoffSweep: The optimal cutoffs along with the confusion matrix and penalty curves.
+    """
+    is_positive, predicted_array = _as_input_arrays(actual, predicted)
+    scores, positives, negatives = _aggregate_unsorted(is_positive, predicted_array)
+    importances = asarray(false_positive_versus_negative_importances)
+
+    penalties: Dict[Tuple[CutoffMethod, bool], ndarray] = {}
+    cutoffs: Dict[Tuple[CutoffMethod, float, bool], float] = {}
+    for cutoff_method in cutoff_methods:
+        for use_rates in use_rates_over_counts:
+            curve = _penalty_curve(positives, negatives, cutoff_method, importances, use_rates)
+            penalties[(cutoff_method, use_rates)] = curve
+            for importance, best_index in zip(false_positive_versus_negative_importances, argmin(curve, axis=0)):
+                cutoffs[(cutoff_method, importance, use_rates)] = 0.0 if best_index == 0 else scores[best_index - 1].item()
+
+    return CutoffSweep(scores=scores,
+                       true_positives=concatenate(([0], cumsum(positives))),
+                       false_positives=concatenate(([0], cumsum(negatives))),
+                       penalties=penalties,
+                       cutoffs=cutoffs)
+
+
+# Number of matrix cells sorted and scanned at once by find_multiclass_cutoffs_array. Bounds the temporary arrays to a few tens of megabytes each.
+_MULTICLASS_BLOCK_CELLS = 1 << 22
+
+
+def _encode_classes(actual: ArrayLike, class_map: Dict[Any, int]) -> ndarray:
+    """
+    Encodes the observed classes as the column index of their class, or -1 for classes missing from the class map.
+
+    Args:
+        actual: Observed classes.
+        class_map: Dictionary of class type to the order of the classes in the inner prediction lists.
+
+    Returns:
+        ndarray: The encoded classes.
+    """
+    labels, inverse = unique(asarray(actual), return_inverse=True)
+    codes = array([class_map.get(label, -1) for label in labels], dtype=int64)
+    return codes[inverse.ravel()]
+
+
+def _multiclass_block_cutoffs(columns: ndarray,
+                              block: ndarray,
+                              encoded_actual: ndarray,
+                              cutoff_method: CutoffMethod,
+                              false_positive_versus_negative_importance: float,
+                              use_rates_over_counts: bool) -> List[float]:
+    """
+    Finds the cutoffs of a block of classes at once. Every column is sorted in a single argsort and the penalties are accumulated down the columns. Rows inside a run of tied probabilities contribute nothing until the last row of the run, which keeps the floating point results identical to find_cutoff.
+
+    Args:
+        columns (ndarray): The column index of each class in the block.
+        block (ndarray): The predictions for the classes in the block, one column per class.
+        encoded_actual (ndarray): The column index of the observed class for each row.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+
+    Returns:
+        The cutoff for each class of the block.
+    """
+    n = block.shape[0]
+    if n == 0:
+        return [0.0] * block.shape[1]
+    order = argsort(block, axis=0)[::-1]
+    sorted_scores = take_along_axis(block, order, axis=0)
+    is_positive = encoded_actual[order] == columns
+
+    group_end = empty(sorted_scores.shape, dtype=bool)
+    group_end[:-1] = sorted_scores[1:] != sorted_scores[:-1]
+    group_end[-1] = True
+
+    cumulative_positives = cumsum(is_positive, axis=0, dtype=int64)
+    cumulative_totals = arange(1, n + 1, dtype=int64)[:, None]
+    previous_positives = zeros(sorted_scores.shape, dtype=int64)
+    previous_totals = zeros(sorted_scores.shape, dtype=int64)
+    previous_positives[1:] = maximum.accumulate(where(group_end, cumulative_positives, 0), axis=0)[:-1]
+    previous_totals[1:] = maximum.accumulate(where(group_end, cumulative_totals, 0), axis=0)[:-1]
+    positives = where(group_end, cumulative_positives - previous_positives, 0)
+    negatives = where(group_end, cumulative_totals - previous_totals, 0) - positives
+
+    if use_rates_over_counts and ((cumulative_positives[-1] == 0).any() or (cumulative_positives[-1] == n).any()):
+        raise ValueError("Both positive and negative observations are required for every class when using rates.")
+
+    penalties = _column_penalty_curves(positives, negatives, cutoff_method, false_positive_versus_negative_importance, use_rates_over_counts)
+    penalties[1:][~group_end] = inf
+    best_indices = argmin(penalties, axis=0)
+    return [0.0 if best_index == 0 else sorted_scores[best_index - 1, i].item() for i, best_index in enumerate(best_indices)]
+
+
+def find_multiclass_cutoffs_array(actual: ArrayLike,
+                                  predicted: ndarray,
+                                  class_map: Dict[Any, int],
+                                  cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                                  false_positive_versus_negative_importance: float = 1,
+                                  use_rates_over_counts: bool = True,
+                                  max_workers: int = 1) -> Dict[Any, float]:
+    """
+    Array version of find_multiclass_cutoffs. The observed classes are encoded once and the prediction matrix is handled in blocks of columns that are sorted and scanned together, instead of building and sorting Python lists for every class. Returns the same cutoffs as find_multiclass_cutoffs.
+
+    Args:
+        actual: Array of observed values.
+        predicted: 2-dimensional array of probabilities with one row per observation and one column per class. Must match the ordering of the actuals provided.
+        class_map: Dictionary of class type to the order of the classes in the inner prediction lists.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+        max_workers: Number of processes to spread the blocks of classes across. The default of 1 runs everything in the calling process.
+
+    Returns:
+        Dictionary of the classes and their respective cutoffs.
+    """
+    predicted_matrix = asarray(predicted)
+    if predicted_matrix.ndim != 2:
+        raise ValueError("Predicted must be a 2-dimensional array.")
+    encoded_actual = _encode_classes(actual, class_map)
+    if encoded_actual.shape[0] != predicted_matrix.shape[0]:
+        raise ValueError("Actual and predicted must be the same size.")
+
+    classes = list(class_map.keys())
+    columns = array([class_map[this_class] for this_class in classes], dtype=int64)
+    block_size = max(1, _MULTICLASS_BLOCK_CELLS // max(1, predicted_matrix.shape[0]))
+    if max_workers > 1:
+        block_size = min(block_size, -(-columns.shape[0] // max_workers))
+    column_blocks = [columns[start:start + block_size] for start in range(0, columns.shape[0], block_size)]
+
+    block_cutoffs = partial(_multiclass_block_cutoffs,
+                            encoded_actual=encoded_actual,
+                            cutoff_method=cutoff_method,
+                            false_positive_versus_negative_importance=false_positive_versus_negative_importance,
+                            use_rates_over_counts=use_rates_over_counts)
+    blocks = (predicted_matrix[:, column_block] for column_block in column_blocks)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            cutoffs = [cutoff for block_result in executor.map(block_cutoffs, column_blocks, blocks) for cutoff in block_result]
+    else:
+        cutoffs = [cutoff for block_result in map(block_cutoffs, column_blocks, blocks) for cutoff in block_result]
+
+    return dict(zip(classes, cutoffs))
@@ -0,0 +1,108 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import NamedTuple, Optional
+
+from numpy import ndarray, argmin, concatenate, float64, isfinite, nan, nanpercentile, where
+from numpy.random import SeedSequence, default_rng
+
+from model_utilities.evaluation.array_cutoff import ArrayLike, _best_cutoff, _column_penalty_curves, _penalty_curve, aggregate_scores
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+
+
+class BootstrapCutoffs(NamedTuple):
+    """
+    Result of bootstrap_cutoff.
+
+    cutoff: The optimal cutoff on the full test set.
+    replicate_cutoffs: The optimal cutoff of every bootstrap replicate. Replicates missing positives or negatives when using rates are nan.
+    lower: Lower bound of the percentile interval.
+    upper: Upper bound of the percentile interval.
+    """
+    cutoff: float
+    replicate_cutoffs: ndarray
+    lower: float
+    upper: float
+
+
+def _bootstrap_batch(seed: SeedSequence,
+                     replicates: int,
+                     scores: ndarray,
+                     cell_probabilities: ndarray,
+                     observations: int,
+                     cutoff_method: CutoffMethod,
+                     false_positive_versus_negative_importance: float,
+                     use_rates_over_counts: bool) -> ndarray:
+    """
+    Finds the optimal cutoffs of a batch of bootstrap replicates. Drawing the observations with replacement is the same as drawing multinomial counts for every (probability, positive/negative) cell, so each replicate only needs the distinct probabilities.
+
+    Args:
+        seed (SeedSequence): Seed of the batch.
+        replicates (int): Number of replicates in the batch.
+        scores (ndarray): The distinct probabilities in descending order.
+        cell_probabilities (ndarray): Fraction of the observations that are positives for each distinct probability, followed by the same for negatives.
+        observations (int): Number of observations drawn per replicate.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+
+    Returns:
+        ndarray: The cutoff of every replicate in the batch.
+    """
+    counts = default_rng(seed).multinomial(observations, cell_probabilities, size=replicates).T
+    penalties = _column_penalty_curves(counts[:scores.shape[0]], counts[scores.shape[0]:], cutoff_method,
+                                       false_positive_versus_negative_importance, use_rates_over_counts)
+    best_indices = argmin(penalties, axis=0)
+    cutoffs = concatenate(([0.0], scores.astype(float64)))[best_indices]
+    return where(isfinite(penalties[-1]), cutoffs, nan)
+
+
+def bootstrap_cutoff(actual: ArrayLike,
+                     predicted: ArrayLike,
+                     cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                     false_positive_versus_negative_importance: float = 1,
+                     use_rates_over_counts: bool = True,
+                     replicates: int = 1000,
+                     confidence: float = 0.95,
+                     seed: Optional[int] = None,
+                     batch_size: int = 100,
+                     max_workers: int = 1) -> BootstrapCutoffs:
+    """
+    Estimates how stable the optimal cutoff is by bootstrapping the test set. The data is sorted once, each replicate is a multinomial resample of the sorted data, and replicates are evaluated in batches of matrix operations. Batches can be spread across worker processes; every batch gets its own child seed, so results only depend on the seed and the batch size, not on the number of workers.
+
+    Args:
+        actual: Array of observed values (true positive is 1, true negative is 0).
+        predicted: Array of probabilities of a positive value. Must match the ordering of the actuals provided.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+        replicates (int): Number of bootstrap replicates.
+        confidence (float): Coverage of the percentile interval.
+        seed (Optional[int]): Seed for reproducible replicates.
+        batch_size (int): Number of replicates evaluated together.
+        max_workers (int): Number of processes to spread the batches across. The default of 1 runs everything in the calling process.
+
+    Returns:
+        BootstrapCutoffs: The cutoff on the full data, the replicate cutoffs and the percentile interval.
+    """
+    scores, positives, negatives = aggregate_scores(actual, predicted)
+    observations = int(positives.sum() + negatives.sum())
+    cutoff = _best_cutoff(scores, _penalty_curve(positives, negatives, cutoff_method, false_positive_versus_negative_importance, use_rates_over_counts))
+
+    batch_sizes = [min(batch_size, replicates - start) for start in range(0, replicates, batch_size)]
+    batch_seeds = SeedSequence(seed).spawn(len(batch_sizes))
+    batch = partial(_bootstrap_batch,
+                    scores=scores,
+                    cell_probabilities=concatenate((positives, negatives)) / observations,
+                    observations=observations,
+                    cutoff_method=cutoff_method,
+                    false_positive_versus_negative_importance=false_positive_versus_negative_importance,
+                    use_rates_over_counts=use_rates_over_counts)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            replicate_cutoffs = concatenate(list(executor.map(batch, batch_seeds, batch_sizes)))
+    else:
+        replicate_cutoffs = concatenate(list(map(batch, batch_seeds, batch_sizes)))
+
+    tail = (1 - confidence) / 2 * 100
+    lower, upper = nanpercentile(replicate_cutoffs, [tail, 100 - tail])
+    return BootstrapCutoffs(cutoff=cutoff, replicate_cutoffs=replicate_cutoffs, lower=float(lower), upper=float(upper))
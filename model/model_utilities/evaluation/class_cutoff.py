@@ -83,6 +83,8 @@ def find_cutoff_sorted(sorted_test_pairs: Sequence[Tuple[float, float]],
             best_score = current_score
             best_cutoff = sorted_test_pairs[i][1]
 
+        false_negatives -= new_true_positives
+        false_positives += new_false_positives
         i += j
         if j == 0:
             break
@@ -0,0 +1,158 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, Optional, Sequence, Tuple
+
+from numpy import ndarray, empty, float64, int64, load
+
+from model_utilities.evaluation.array_cutoff import ArrayLike, _best_cutoff, _merge_aggregates, _merge_many_aggregates, _penalty_curve, aggregate_scores
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+
+
+class CutoffSummary:
+    """
+    Mergeable summary of a scored test set: the positive and negative count for every distinct probability. Each shard of a dataset can be summarized on its own, the summaries merged in any order and grouping, and the merged summary gives exactly the cutoff find_cutoff would give on the concatenated data.
+    """
+    def __init__(self,
+                 scores: Optional[ndarray] = None,
+                 positives: Optional[ndarray] = None,
+                 negatives: Optional[ndarray] = None):
+        self._scores: ndarray = empty(0, dtype=float64) if scores is None else scores
+        self._positives: ndarray = empty(0, dtype=int64) if positives is None else positives
+        self._negatives: ndarray = empty(0, dtype=int64) if negatives is None else negatives
+
+    @classmethod
+    def from_arrays(cls, actual: ArrayLike, predicted: ArrayLike, sample_weight: Optional[ArrayLike] = None) -> 'CutoffSummary':
+        """
+        Summarizes a shard of the test set.
+
+        Args:
+            actual: Array of observed values (true positive is 1, true negative is 0).
+            predicted: Array of probabilities of a positive value. Must match the ordering of the actuals provided.
+            sample_weight: Optional weight of each observation.
+
+        Returns:
+            CutoffSummary: The summary of the shard.
+        """
+        scores, positives, negatives = aggregate_scores(actual, predicted, sample_weight)
+        return cls(scores[::-1], positives[::-1], negatives[::-1])
+
+    def merge(self, other: 'CutoffSummary') -> 'CutoffSummary':
+        """
+        Merges two summaries into a new one. Merging is associative and commutative.
+
+        Args:
+            other (CutoffSummary): The summary to merge with.
+
+        Returns:
+            CutoffSummary: The summary of both shards.
+        """
+        return CutoffSummary(*_merge_aggregates(self._scores, self._positives, self._negatives,
+                                                other._scores, other._positives, other._negatives))
+
+    def get_scores(self) -> ndarray:
+        return self._scores
+
+    def get_positives(self) -> ndarray:
+        return self._positives
+
+    def get_negatives(self) -> ndarray:
+        return self._negatives
+
+    def find_cutoff(self,
+                    cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                    false_positive_versus_negative_importance: float = 1,
+                    use_rates_over_counts: bool = True) -> float:
+        """
+        Finds the optimal cutoff for everything in the summary.
+
+        Args:
+            cutoff_method: Cutoff metric you would like applied.
+            false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+            use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+
+        Returns:
+            The cutoff probability that optimizes the balance of false positives and false negatives.
+        """
+        penalties = _penalty_curve(self._positives[::-1], self._negatives[::-1], cutoff_method,
+                                   false_positive_versus_negative_importance, use_rates_over_counts)
+        return _best_cutoff(self._scores[::-1], penalties)
+
+
+def merge_summaries(summaries: Iterable[CutoffSummary]) -> CutoffSummary:
+    """
+    Merges any number of summaries in a single pass over their distinct probabilities.
+
+    Args:
+        summaries (Iterable[CutoffSummary]): The summaries to merge.
+
+    Returns:
+        CutoffSummary: The summary of all the shards.
+    """
+    summaries = list(summaries)
+    if not summaries:
+        return CutoffSummary()
+    # Every shard is aggregated once, rather than re-merging the growing result with each shard.
+    return CutoffSummary(*_merge_many_aggregates([summary._scores for summary in summaries],
+                                                  [summary._positives for summary in summaries],
+                                                  [summary._negatives for summary in summaries]))
+
+
+def load_npz_shard(path: str) -> Tuple[ndarray, ndarray]:
+    """
+    Default shard loader: a numpy .npz file with "actual" and "predicted" arrays.
+
+    Args:
+        path (str): Path of the shard file.
+
+    Returns:
+        The observed values and the probabilities of the shard.
+    """
+    with load(path) as shard:
+        return shard["actual"], shard["predicted"]
+
+
+def _summarize_shard(path: str, load_shard: Callable[[str], Tuple[ArrayLike, ArrayLike]]) -> CutoffSummary:
+    actual, predicted = load_shard(path)
+    return CutoffSummary.from_arrays(actual, predicted)
+
+
+def summarize_shards(shard_paths: Sequence[str],
+                     load_shard: Callable[[str], Tuple[ArrayLike, ArrayLike]] = load_npz_shard,
+                     max_workers: Optional[int] = None) -> CutoffSummary:
+    """
+    Summarizes a list of shard files in parallel worker processes and merges the results.
+
+    Args:
+        shard_paths (Sequence[str]): Paths of the shard files.
+        load_shard: Function returning the (actual, predicted) arrays of a shard file. Must be picklable, i.e. defined at module level.
+        max_workers (Optional[int]): Number of worker processes. Defaults to the number of processors.
+
+    Returns:
+        CutoffSummary: The summary of all the shards.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return merge_summaries(executor.map(partial(_summarize_shard, load_shard=load_shard), shard_paths))
+
+
+def find_cutoff_sharded(shard_paths: Sequence[str],
+                        cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                        false_positive_versus_negative_importance: float = 1,
+                        use_rates_over_counts: bool = True,
+                        load_shard: Callable[[str], Tuple[ArrayLike, ArrayLike]] = load_npz_shard,
+                        max_workers: Optional[int] = None) -> float:
+    """
+    Finds the optimal cutoff for a test set split across shard files, evaluating the shards in parallel. Returns the same cutoff as find_cutoff on the concatenated data.
+
+    Args:
+        shard_paths (Sequence[str]): Paths of the shard files.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+        load_shard: Function returning the (actual, predicted) arrays of a shard file. Must be picklable, i.e. defined at module level.
+        max_workers (Optional[int]): Number of worker processes. Defaults to the number of processors.
+
+    Returns:
+        The cutoff probability that optimizes the balance of false positives and false negatives.
+    """
+    summary = summarize_shards(shard_paths, load_shard, max_workers)
+    return summary.find_cutoff(cutoff_method, false_positive_versus_negative_importance, use_rates_over_counts)
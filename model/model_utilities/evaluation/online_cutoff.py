@@ -0,0 +1,353 @@
+import time
+from collections import deque
+from random import Random
+from typing import Deque, Dict, List, Optional, Tuple
+
+from numpy import ndarray, argsort, array, concatenate, empty, float64, insert, int64, searchsorted, zeros
+
+from model_utilities.evaluation.array_cutoff import ArrayLike, _best_cutoff, _penalty_curve
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+
+
+class _ScoreNode:
+    """
+    Node of _ScoreTree: the counts of one distinct probability and, for its subtree, the total counts and either the counts up to the end of its best prefix (with counts) or the convex hull of its prefix points (with rates).
+    """
+    __slots__ = ('score', 'priority', 'positives', 'negatives', 'left', 'right',
+                 'total_positives', 'total_negatives', 'best_positives', 'best_negatives', 'best_score', 'hull')
+
+    def __init__(self, score: float, priority: float, positives: int, negatives: int):
+        self.score: float = score
+        self.priority: float = priority
+        self.positives: int = positives
+        self.negatives: int = negatives
+        self.left: Optional[_ScoreNode] = None
+        self.right: Optional[_ScoreNode] = None
+        self.total_positives: int = 0
+        self.total_negatives: int = 0
+        self.best_positives: int = 0
+        self.best_negatives: int = 0
+        self.best_score: float = score
+        self.hull: List[Tuple[int, int, float]] = []
+
+
+class _ScoreTree:
+    """
+    Treap of the distinct probabilities in descending order, for the AbsoluteDistance penalty.
+
+    Classifying the k highest distinct probabilities as positive gives k prefix counts of false positives FP_k and true positives TP_k. Writing the importance as the exact ratio a / b of its binary value, the penalty is minimized by the prefix minimizing a * FP_k - b * TP_k with counts, and a * P * FP_k - b * N * TP_k with rates, where P and N are the total positives and negatives of the window. Both are compared with integers, so ties are exact and go to the highest probability.
+
+    With counts the weights are fixed, so every node keeps the best prefix of its subtree, like a segment tree with a min-prefix query: an update refreshes a single root-to-leaf path, O(log n) in the number of distinct probabilities, and the query reads the root. With rates the weights change with every update, so every node keeps the upper convex hull of its subtree's prefix points instead, since a linear function is minimized on it: an update rebuilds the hulls along the path, O(h log n) for hulls of h vertices, and the query is a binary search over the hull of the root, O(log h). Hulls of ROC curves are small, about a hundred vertices for 50,000 distinct probabilities.
+    """
+    def __init__(self, importance: float, use_rates_over_counts: bool):
+        self._importance_numerator, self._importance_denominator = float(importance).as_integer_ratio()
+        self._use_rates_over_counts: bool = use_rates_over_counts
+        self._root: Optional[_ScoreNode] = None
+        # Fixed priorities keep the tree shape reproducible.
+        self._random: Random = Random(0)
+
+    def _value(self, positives: int, negatives: int) -> int:
+        return self._importance_numerator * negatives - self._importance_denominator * positives
+
+    @staticmethod
+    def _push(hull: List[Tuple[int, int, float]], point: Tuple[int, int, float]):
+        # Monotone chain step: drops the vertices that the new point makes concave or collinear, which are never strictly better.
+        x, y = point[0], point[1]
+        while len(hull) > 1:
+            origin_x, origin_y, _ = hull[-2]
+            last_x, last_y, _ = hull[-1]
+            if (last_x - origin_x) * (y - origin_y) - (last_y - origin_y) * (x - origin_x) < 0:
+                break
+            hull.pop()
+        hull.append(point)
+
+    def _refresh_hull(self, node: _ScoreNode, negatives: int, positives: int):
+        # Points are (false positives, true positives, probability) relative to the start of the subtree.
+        hull = node.left.hull[:] if node.left is not None else []
+        self._push(hull, (negatives, positives, node.score))
+        if node.right is not None:
+            right_hull = node.right.hull
+            for index, (x, y, score) in enumerate(right_hull):
+                self._push(hull, (negatives + x, positives + y, score))
+                if index + 1 < len(right_hull) and len(hull) > 1:
+                    # Once the next edge of the right hull turns clockwise from the last edge, the rest of it is kept as is.
+                    origin_x, origin_y, _ = hull[-2]
+                    next_x, next_y, _ = right_hull[index + 1]
+                    if (negatives + x - origin_x) * (next_y - y) - (positives + y - origin_y) * (next_x - x) < 0:
+                        hull.extend([(negatives + x, positives + y, score) for x, y, score in right_hull[index + 1:]])
+                        break
+        node.hull = hull
+
+    def _refresh(self, node: _ScoreNode):
+        left, right = node.left, node.right
+        positives, negatives = node.positives, node.negatives
+        if left is not None:
+            positives += left.total_positives
+            negatives += left.total_negatives
+        if self._use_rates_over_counts:
+            self._refresh_hull(node, negatives, positives)
+        else:
+            value = self._value(positives, negatives)
+            best_positives, best_negatives, best_score, best_value = positives, negatives, node.score, value
+            # Ties keep the higher probability, like find_cutoff_sorted.
+            if left is not None and self._value(left.best_positives, left.best_negatives) <= value:
+                best_positives, best_negatives, best_score = left.best_positives, left.best_negatives, left.best_score
+                best_value = self._value(best_positives, best_negatives)
+            if right is not None:
+                value = self._value(positives + right.best_positives, negatives + right.best_negatives)
+                if value < best_value:
+                    best_positives, best_negatives, best_score = positives + right.best_positives, negatives + right.best_negatives, right.best_score
+            node.best_positives, node.best_negatives, node.best_score = best_positives, best_negatives, best_score
+        if right is not None:
+            positives += right.total_positives
+            negatives += right.total_negatives
+        node.total_positives, node.total_negatives = positives, negatives
+
+    def _rotate_right(self, node: _ScoreNode) -> _ScoreNode:
+        child = node.left
+        node.left, child.right = child.right, node
+        self._refresh(node)
+        self._refresh(child)
+        return child
+
+    def _rotate_left(self, node: _ScoreNode) -> _ScoreNode:
+        child = node.right
+        node.right, child.left = child.left, node
+        self._refresh(node)
+        self._refresh(child)
+        return child
+
+    def _merge(self, higher: Optional[_ScoreNode], lower: Optional[_ScoreNode]) -> Optional[_ScoreNode]:
+        if higher is None:
+            return lower
+        if lower is None:
+            return higher
+        if higher.priority > lower.priority:
+            higher.right = self._merge(higher.right, lower)
+            self._refresh(higher)
+            return higher
+        lower.left = self._merge(higher, lower.left)
+        self._refresh(lower)
+        return lower
+
+    def _update(self, node: Optional[_ScoreNode], score: float, positives: int, negatives: int) -> Optional[_ScoreNode]:
+        if node is None:
+            node = _ScoreNode(score, self._random.random(), positives, negatives)
+        elif score == node.score:
+            node.positives += positives
+            node.negatives += negatives
+            if node.positives == 0 and node.negatives == 0:
+                return self._merge(node.left, node.right)
+        elif score > node.score:
+            node.left = self._update(node.left, score, positives, negatives)
+            if node.left is not None and node.left.priority > node.priority:
+                return self._rotate_right(node)
+        else:
+            node.right = self._update(node.right, score, positives, negatives)
+            if node.right is not None and node.right.priority > node.priority:
+                return self._rotate_left(node)
+        self._refresh(node)
+        return node
+
+    def update(self, score: float, positives: int, negatives: int):
+        """
+        Adds (or with negative counts, removes) observations of a probability. A probability is dropped once it has no observations left.
+        """
+        self._root = self._update(self._root, score, positives, negatives)
+
+    def best_cutoff(self) -> float:
+        """
+        The cutoff with the lowest penalty, or 0 if classifying nothing as positive is best.
+        """
+        root = self._root
+        if not self._use_rates_over_counts:
+            if root is None or not self._value(root.best_positives, root.best_negatives) < 0:
+                return 0.0
+            return root.best_score
+        if root is None or root.total_positives == 0 or root.total_negatives == 0:
+            raise ValueError("Both positive and negative observations are required when using rates.")
+        false_positive_weight = self._importance_numerator * root.total_positives
+        true_positive_weight = self._importance_denominator * root.total_negatives
+        # Along the hull the gain true_positive_weight * y - false_positive_weight * x rises then falls, so the best vertex is the first one followed by an edge that doesn't gain.
+        hull = root.hull
+        low, high = 0, len(hull) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if true_positive_weight * (hull[middle + 1][1] - hull[middle][1]) - false_positive_weight * (hull[middle + 1][0] - hull[middle][0]) > 0:
+                low = middle + 1
+            else:
+                high = middle
+        false_positives, true_positives, score = hull[low]
+        return score if true_positive_weight * true_positives - false_positive_weight * false_positives > 0 else 0.0
+
+
+class OnlineCutoffTracker:
+    """
+    Tracks the optimal cutoff over a sliding window of labeled predictions as they arrive, e.g. from live traffic.
+
+    Observations are expired once the window holds more than max_observations of them or once they are older than max_age seconds. With max_age, timestamps must not decrease from one update to the next.
+
+    With AbsoluteDistance, the distinct probabilities are kept in a _ScoreTree: updates take O(log n) in the number of distinct probabilities with counts, and O(h log n) with rates for convex hulls of h vertices, while find_cutoff reads or searches the root. The penalties are compared exactly, so find_cutoff returns the cutoff with the lowest penalty, ties going to the highest probability. find_cutoff_sorted accumulates the penalties in floating point and can break the tie the other way between cutoffs whose penalties differ by less than the rounding error, but otherwise returns the same cutoff.
+
+    With DistanceSquared the penalties square the totals, so they have no such structure. Updates only change the counts of their probability, O(1), and the distinct probabilities are kept in descending order: find_cutoff inserts the ones added since the last query and drops the expired ones, then evaluates the penalties in one vectorized O(n) pass, cached until the window changes. It returns the same cutoff as find_cutoff_sorted.
+    """
+    def __init__(self,
+                 cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                 false_positive_versus_negative_importance: float = 1,
+                 use_rates_over_counts: bool = True,
+                 max_observations: Optional[int] = None,
+                 max_age: Optional[float] = None):
+        self._cutoff_method: CutoffMethod = cutoff_method
+        self._false_positive_versus_negative_importance: float = false_positive_versus_negative_importance
+        self._use_rates_over_counts: bool = use_rates_over_counts
+        self._max_observations: Optional[int] = max_observations
+        self._max_age: Optional[float] = max_age
+
+        self._window: Deque[Tuple[float, float, bool]] = deque()
+        self._tree: Optional[_ScoreTree] = None
+        if cutoff_method == CutoffMethod.AbsoluteDistance:
+            self._tree = _ScoreTree(false_positive_versus_negative_importance, use_rates_over_counts)
+
+        # Without a tree, the counts of every distinct probability live in a slot. _order lists the slots in descending order of probability as of the last query; slots created since then wait in _unordered, and emptied slots wait in _released until they are dropped from the order and can be reused.
+        self._slot_by_score: Dict[float, int] = {}
+        self._free_slots: List[int] = list(range(15, -1, -1))
+        self._scores: ndarray = zeros(16, dtype=float64)
+        self._positives: ndarray = zeros(16, dtype=int64)
+        self._negatives: ndarray = zeros(16, dtype=int64)
+        self._order: ndarray = empty(0, dtype=int64)
+        self._unordered: List[int] = []
+        self._released: List[int] = []
+        self._cutoff: Optional[float] = None
+
+    def _slot(self, score: float) -> int:
+        slot = self._slot_by_score.get(score)
+        if slot is not None:
+            return slot
+        if not self._free_slots:
+            size = self._scores.shape[0]
+            self._scores = concatenate((self._scores, zeros(size, dtype=float64)))
+            self._positives = concatenate((self._positives, zeros(size, dtype=int64)))
+            self._negatives = concatenate((self._negatives, zeros(size, dtype=int64)))
+            self._free_slots.extend(range(2 * size - 1, size - 1, -1))
+        slot = self._free_slots.pop()
+        self._scores[slot] = score
+        self._slot_by_score[score] = slot
+        self._unordered.append(slot)
+        return slot
+
+    def _sort_slots(self):
+        """
+        Brings _order up to date: drops the emptied slots, which become reusable, and inserts the new ones. O(n + m log m) for m new slots.
+        """
+        if self._released:
+            order = self._order
+            self._order = order[(self._positives[order] + self._negatives[order]) > 0]
+        if self._unordered:
+            new_slots = array(self._unordered, dtype=int64)
+            new_slots = new_slots[(self._positives[new_slots] + self._negatives[new_slots]) > 0]
+            new_slots = new_slots[argsort(self._scores[new_slots])[::-1]]
+            positions = searchsorted(-self._scores[self._order], -self._scores[new_slots])
+            self._order = insert(self._order, positions, new_slots)
+            self._unordered.clear()
+        self._free_slots.extend(self._released)
+        self._released.clear()
+
+    def _remove_oldest(self):
+        _, score, is_positive = self._window.popleft()
+        if self._tree is not None:
+            self._tree.update(score, -int(is_positive), -int(not is_positive))
+            return
+        slot = self._slot_by_score[score]
+        if is_positive:
+            self._positives[slot] -= 1
+        else:
+            self._negatives[slot] -= 1
+        if self._positives[slot] == 0 and self._negatives[slot] == 0:
+            del self._slot_by_score[score]
+            self._released.append(slot)
+            # Without queries the emptied slots would pile up, so they are recycled once they outnumber the live ones.
+            if len(self._released) > len(self._slot_by_score):
+                self._sort_slots()
+
+    def expire(self, now: Optional[float] = None):
+        """
+        Removes the observations that fell out of the window.
+
+        Args:
+            now (Optional[float]): Current time in seconds, in the same clock as the update timestamps. Defaults to time.time().
+        """
+        expired = False
+        if self._max_observations is not None:
+            while len(self._window) > self._max_observations:
+                self._remove_oldest()
+                expired = True
+        if self._max_age is not None:
+            oldest_allowed = (time.time() if now is None else now) - self._max_age
+            while self._window and self._window[0][0] < oldest_allowed:
+                self._remove_oldest()
+                expired = True
+        if expired:
+            self._cutoff = None
+
+    def update(self, actual: float, predicted: float, timestamp: Optional[float] = None):
+        """
+        Adds a single labeled prediction to the window.
+
+        Args:
+            actual (float): Observed value (true positive is 1, true negative is 0).
+            predicted (float): Probability of a positive value.
+            timestamp (Optional[float]): Time of the observation in seconds. Defaults to time.time(). With max_age, must not be before the previous update.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        if self._max_age is not None and self._window and timestamp < self._window[-1][0]:
+            raise ValueError("Timestamps must not decrease when max_age is set, since the oldest observations are expired first.")
+        score = float(predicted)
+        is_positive = bool(actual != 0)
+        if self._tree is not None:
+            self._tree.update(score, int(is_positive), int(not is_positive))
+        else:
+            slot = self._slot(score)
+            if is_positive:
+                self._positives[slot] += 1
+            else:
+                self._negatives[slot] += 1
+        self._window.append((timestamp, score, is_positive))
+        self._cutoff = None
+        self.expire(timestamp)
+
+    def update_many(self, actual: ArrayLike, predicted: ArrayLike, timestamp: Optional[float] = None):
+        """
+        Adds a batch of labeled predictions to the window, all with the same timestamp.
+
+        Args:
+            actual: Observed values (true positive is 1, true negative is 0).
+            predicted: Probabilities of a positive value. Must match the ordering of the actuals provided.
+            timestamp (Optional[float]): Time of the observations in seconds. Defaults to time.time(). With max_age, must not be before the previous update.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        for this_actual, this_predicted in zip(actual, predicted):
+            self.update(this_actual, this_predicted, timestamp)
+
+    def get_observation_count(self) -> int:
+        return len(self._window)
+
+    def find_cutoff(self, now: Optional[float] = None) -> float:
+        """
+        Finds the optimal cutoff for the observations currently in the window.
+
+        Args:
+            now (Optional[float]): Current time in seconds, used to expire old observations when a max_age is set. Defaults to time.time().
+
+        Returns:
+            The cutoff probability that optimizes the balance of false positives and false negatives.
+        """
+        self.expire(now)
+        if self._tree is not None:
+            return self._tree.best_cutoff()
+        if self._cutoff is None:
+            self._sort_slots()
+            order = self._order
+            penalties = _penalty_curve(self._positives[order], self._negatives[order], self._cutoff_method,
+                                       self._false_positive_versus_negative_importance, self._use_rates_over_counts)
+            self._cutoff = _best_cutoff(self._scores[order], penalties)
+        return self._cutoff
@@ -0,0 +1,162 @@
+from typing import Iterable, Tuple
+
+from numpy import ndarray, add, concatenate, clip, cumsum, empty, floor, float64, inf, int64, maximum, minimum, zeros
+
+from model_utilities.evaluation.array_cutoff import ArrayLike, _as_input_arrays, _aggregate_unsorted, _best_cutoff, _merge_aggregates, _penalty_curve
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+
+
+class StreamingCutoffSummary:
+    """
+    Fixed-size summary of a scored test set that can be filled chunk by chunk, so the optimal cutoff can be found on data that doesn't fit in memory.
+
+    The summary keeps exact positive and negative counts for every distinct probability until there are more than max_bins of them. It then collapses into max_bins equal-width bins over score_range (probabilities outside the range go into the first or last bin), remembering the lowest and highest probability seen in each bin. Memory never grows beyond max_bins entries plus the distinct probabilities of the chunk being added.
+
+    While exact, find_cutoff returns the same cutoff as find_cutoff_sorted. Once binned, cutoffs can only fall between bins and the returned cutoff is the lowest probability of the lowest bin classified as positive, so classifying with predicted >= cutoff reproduces the evaluated penalty. penalty_error_bound gives how far that penalty can be above the exact optimum.
+    """
+    def __init__(self,
+                 max_bins: int = 65536,
+                 score_range: Tuple[float, float] = (0.0, 1.0)):
+        if max_bins < 1:
+            raise ValueError("max_bins must be at least 1.")
+        if score_range[1] <= score_range[0]:
+            raise ValueError("score_range must be increasing.")
+        self._max_bins: int = max_bins
+        self._score_range: Tuple[float, float] = score_range
+
+        self._binned: bool = False
+        self._lowest_scores: ndarray = empty(0, dtype=float64)
+        self._highest_scores: ndarray = empty(0, dtype=float64)
+        self._positives: ndarray = empty(0, dtype=int64)
+        self._negatives: ndarray = empty(0, dtype=int64)
+
+    def _bin_indices(self, scores: ndarray) -> ndarray:
+        low, high = self._score_range
+        return clip(floor((scores - low) / (high - low) * self._max_bins), 0, self._max_bins - 1).astype(int64)
+
+    def _add_binned(self, lowest_scores: ndarray, highest_scores: ndarray, positives: ndarray, negatives: ndarray):
+        indices = self._bin_indices(lowest_scores)
+        add.at(self._positives, indices, positives)
+        add.at(self._negatives, indices, negatives)
+        minimum.at(self._lowest_scores, indices, lowest_scores)
+        maximum.at(self._highest_scores, indices, highest_scores)
+
+    def _collapse(self):
+        lowest_scores, highest_scores = self._lowest_scores, self._highest_scores
+        positives, negatives = self._positives, self._negatives
+        self._lowest_scores = zeros(self._max_bins, dtype=float64) + inf
+        self._highest_scores = zeros(self._max_bins, dtype=float64) - inf
+        self._positives = zeros(self._max_bins, dtype=int64)
+        self._negatives = zeros(self._max_bins, dtype=int64)
+        self._binned = True
+        self._add_binned(lowest_scores, highest_scores, positives, negatives)
+
+    def update(self, actual: ArrayLike, predicted: ArrayLike):
+        """
+        Adds a chunk of the test set to the summary.
+
+        Args:
+            actual: Array of observed values (true positive is 1, true negative is 0).
+            predicted: Array of probabilities of a positive value. Must match the ordering of the actuals provided.
+        """
+        is_positive, predicted_array = _as_input_arrays(actual, predicted)
+        scores, positives, negatives = _aggregate_unsorted(is_positive, predicted_array.astype(float64, copy=False))
+        if self._binned:
+            self._add_binned(scores, scores, positives, negatives)
+            return
+
+        merged_scores, merged_positives, merged_negatives = _merge_aggregates(self._lowest_scores, self._positives, self._negatives, scores, positives, negatives)
+        self._lowest_scores = merged_scores
+        self._highest_scores = merged_scores
+        self._positives = merged_positives
+        self._negatives = merged_negatives
+        if merged_scores.shape[0] > self._max_bins:
+            self._collapse()
+
+    def get_binned(self) -> bool:
+        return self._binned
+
+    def _descending_counts(self) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        occupied = (self._positives + self._negatives) > 0
+        return (self._lowest_scores[occupied][::-1], self._highest_scores[occupied][::-1],
+                self._positives[occupied][::-1], self._negatives[occupied][::-1])
+
+    def find_cutoff(self,
+                    cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                    false_positive_versus_negative_importance: float = 1,
+                    use_rates_over_counts: bool = True) -> float:
+        """
+        Finds the optimal cutoff for everything added to the summary so far.
+
+        Args:
+            cutoff_method: Cutoff metric you would like applied.
+            false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+            use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+
+        Returns:
+            The cutoff probability that optimizes the balance of false positives and false negatives.
+        """
+        lowest_scores, _, positives, negatives = self._descending_counts()
+        penalties = _penalty_curve(positives, negatives, cutoff_method, false_positive_versus_negative_importance, use_rates_over_counts)
+        return _best_cutoff(lowest_scores, penalties)
+
+    def penalty_error_bound(self,
+                            cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                            false_positive_versus_negative_importance: float = 1,
+                            use_rates_over_counts: bool = True) -> float:
+        """
+        Upper bound on how much the penalty of the cutoff from find_cutoff can exceed the exact optimal penalty. The exact optimum can only split a bin holding more than one distinct probability, and its penalty is at least the penalty at either edge of that bin minus the largest change the bin can cause on that side.
+
+        Args:
+            cutoff_method: Cutoff metric you would like applied.
+            false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+            use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+
+        Returns:
+            The bound, which is 0 while the summary is exact.
+        """
+        lowest_scores, highest_scores, positives, negatives = self._descending_counts()
+        split = lowest_scores != highest_scores
+        if not split.any():
+            return 0.0
+
+        denominator_positives = positives.sum() if use_rates_over_counts else 1
+        denominator_negatives = negatives.sum() if use_rates_over_counts else 1
+        false_negatives = positives.sum() - concatenate(([0], cumsum(positives)))
+        false_positives = concatenate(([0], cumsum(negatives)))
+        if cutoff_method == CutoffMethod.AbsoluteDistance:
+            negative_term = false_negatives / denominator_positives
+            positive_term = false_positive_versus_negative_importance * false_positives / denominator_negatives
+        elif cutoff_method == CutoffMethod.DistanceSquared:
+            negative_term = (false_negatives / denominator_positives) ** 2
+            positive_term = false_positive_versus_negative_importance * (false_positives / denominator_negatives) ** 2
+        else:
+            raise ValueError("Unknown cutoff method.")
+        bin_errors = minimum(negative_term[:-1] - negative_term[1:], positive_term[1:] - positive_term[:-1])
+        return float(bin_errors[split].max())
+
+
+def find_cutoff_streaming(chunks: Iterable[Tuple[ArrayLike, ArrayLike]],
+                          cutoff_method: CutoffMethod = CutoffMethod.AbsoluteDistance,
+                          false_positive_versus_negative_importance: float = 1,
+                          use_rates_over_counts: bool = True,
+                          max_bins: int = 65536,
+                          score_range: Tuple[float, float] = (0.0, 1.0)) -> float:
+    """
+    Finds the optimal cutoff for a binary classification from an iterator of (actual, predicted) chunks, e.g. batches read from a Parquet dataset. Memory stays bounded by max_bins and the chunk size. The result matches find_cutoff_sorted when there are at most max_bins distinct probabilities; otherwise see StreamingCutoffSummary for the error bound.
+
+    Args:
+        chunks: Iterable of pairs of observed values and probabilities of a positive value.
+        cutoff_method: Cutoff metric you would like applied.
+        false_positive_versus_negative_importance: Ratio of the penalties associated to false positives over false negatives.
+        use_rates_over_counts: Whether to use rates (True) or counts (False) when evaluating the penalties.
+        max_bins: Number of distinct probabilities kept exactly, and number of bins once there are more.
+        score_range: Range of the bins once the summary is binned.
+
+    Returns:
+        The cutoff probability that optimizes the balance of false positives and false negatives.
+    """
+    summary = StreamingCutoffSummary(max_bins, score_range)
+    for actual, predicted in chunks:
+        summary.update(actual, predicted)
+    return summary.find_cutoff(cutoff_method, false_positive_versus_negative_importance, use_rates_over_counts)
@@ -1,7 +1,113 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
-from typing import Optional, Sequence
-from numpy import array, dot, append, ones, exp, sum, abs
-from scipy.optimize import minimize, basinhopping
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+from numpy import array, asarray, dot, sum, abs, sign, concatenate, maximum, ndarray, empty, float64, geomspace, zeros, mean, argmin, count_nonzero
+from numpy.random import default_rng
+from scipy.optimize import minimize
+from scipy.sparse import issparse
+from scipy.special import expit
+
+# Solves the lasso exactly by splitting the parameters into positive and negative parts, theta = u - v with u, v >= 0, so the L1 term becomes linear and L-BFGS-B can use its bounds.
+SPLIT_LBFGSB = 'split-L-BFGS-B'
+# The squared error objective is small, so L-BFGS-B's default relative tolerance stops well before the parameters converge.
+_SPLIT_DEFAULT_TOL = 1e-12
+
+# scipy.optimize.minimize methods that get the analytic gradient and, where supported, the Hessian-vector product.
+_GRADIENT_METHODS = {'CG', 'BFGS', 'Newton-CG', 'L-BFGS-B', 'TNC', 'SLSQP', 'trust-ncg', 'trust-krylov', 'trust-constr'}
+_HESSP_METHODS = {'Newton-CG', 'trust-ncg', 'trust-krylov', 'trust-constr'}
+
+# Rows converted at a time when the features aren't stored in the compute dtype, which bounds the temporary copies.
+_CONVERSION_ROWS = 65536
+
+# Training data for fit_batches: a pair of (possibly memory-mapped) arrays, a function returning a fresh iterable of (X, Y) chunks for every epoch, or a single-use iterable of chunks.
+BatchSource = Union[Tuple[ndarray, ndarray], Callable[[], Iterable[Tuple[ndarray, ndarray]]], Iterable[Tuple[ndarray, ndarray]]]
+
+# scipy.optimize.minimize methods whose callback only receives the parameters, not the intermediate result with the objective.
+_PARAMETER_CALLBACK_METHODS = {'TNC', 'SLSQP', 'COBYLA', 'COBYQA'}
+
+# Progress hook of fit: called with the iteration number and the objective after every iteration of the final solve.
+FitCallback = Callable[[int, float], None]
+
+# Two local solves agree on the optimum when their objectives are within this relative (and absolute) distance.
+_AGREEMENT_TOL = 1e-6
+
+# The model, data and method of the global search in a pool worker process, set once by the pool initializer so the data isn't sent with every start. Never set in the calling process, so concurrent fits don't share it.
+_worker_problem: Optional[Tuple['NumpyLassoLogisticModel', ndarray, ndarray, str]] = None
+
+
+def _set_worker_problem(model: 'NumpyLassoLogisticModel', X: ndarray, Y: ndarray, method: str):
+    global _worker_problem
+    _worker_problem = (model, X, Y, method)
+
+
+def _solve(model: 'NumpyLassoLogisticModel', x0: ndarray, X: ndarray, Y: ndarray, method: str) -> Tuple[float, ndarray, int, int]:
+    result = model._minimize(x0, X, Y, method)
+    return float(result.fun), result.x, int(result.get('nfev', 0)), int(result.get('njev', 0))
+
+
+def _solve_in_worker(x0: ndarray) -> Tuple[float, ndarray, int, int]:
+    model, X, Y, method = _worker_problem
+    return _solve(model, x0, X, Y, method)
+
+
+def _predict_chunks(X: ndarray, coefficients: ndarray, intercepts: Union[float, ndarray], compute_dtype: type,
+                    out: Optional[ndarray], chunk_rows: int) -> ndarray:
+    """
+    Evaluates 1 / (1 + exp(X * C + D)) as expit(-(X * C + D)), which doesn't overflow for large margins, chunk_rows rows at a time so the temporaries stay bounded. C is a vector for one model or a matrix with one column per model.
+    """
+    shape = (X.shape[0],) + coefficients.shape[1:]
+    if out is None:
+        out = empty(shape, dtype=compute_dtype)
+    elif out.shape != shape:
+        raise ValueError(f"out must have shape {shape}.")
+    coefficients = coefficients.astype(compute_dtype)
+    intercepts = asarray(intercepts, dtype=compute_dtype)
+    if issparse(X):
+        # The sparse product only allocates the margins, which are the size of the output, so there's nothing to chunk.
+        margin = X @ coefficients
+        margin += intercepts
+        expit(-margin, out=out)
+        return out
+    for start in range(0, X.shape[0], chunk_rows):
+        margin = dot(X[start:start + chunk_rows].astype(compute_dtype, copy=False), coefficients)
+        margin += intercepts
+        expit(-margin, out=out[start:start + chunk_rows])
+    return out
+
+
+def _agreed_prefix(objectives: Sequence[float], agreement: int) -> Optional[int]:
+    """
+    Finds the shortest prefix of the starts in which agreement starts reached the best objective of that prefix. Looking at prefixes in start order keeps the result independent of how many starts run at once.
+    """
+    for end in range(agreement, len(objectives) + 1):
+        best = min(objectives[:end])
+        if sum(abs(array(objectives[:end]) - best) <= _AGREEMENT_TOL * (1 + abs(best))) >= agreement:
+            return end
+    return None
+
+
+class FitDiagnostics(NamedTuple):
+    """
+    What happened during the last NumpyLassoLogisticModel.fit.
+
+    nfev: Objective evaluations, over every phase.
+    njev: Gradient evaluations, over every phase.
+    nit: Iterations of the final solve. 0 for COBYLA without a callback, which doesn't report them.
+    success: Whether the final solve converged.
+    message: The optimizer's description of why the final solve stopped.
+    phase_seconds: Wall time of every phase: "global_search" (when global_seed is set) and "final".
+    objective_trace: The objective after every iteration of the final solve. Left empty for TNC, SLSQP, COBYLA and COBYQA unless fit has a callback, since they don't report the objective and recording it costs an extra evaluation per iteration.
+    global_starts: Number of starting points the global search ran.
+    """
+    nfev: int
+    njev: int
+    nit: int
+    success: bool
+    message: str
+    phase_seconds: Dict[str, float]
+    objective_trace: List[float]
+    global_starts: int = 0
 
 
 class NumpyLassoLogisticModel:
@@ -13,28 +119,87 @@ class NumpyLassoLogisticModel:
         B -> B + A
         C -> -C
         D -> -D
+
+    Features are used as provided when they are already a floating point numpy array (C or F ordered, float32 or float64, numpy.memmap included): the intercept is handled separately instead of appending a column of ones, so nothing the size of the data is copied. Computations run in float64 unless compute_dtype is set to float32, which halves the memory traffic on float32 data. scipy.sparse matrices are used through sparse matrix-vector products, so time and memory scale with the number of non-zeros.
     """
     def __init__(self,
                  alpha: float = 0.0,
-                 tol: float = None):
+                 tol: float = None,
+                 compute_dtype: type = float64):
         self._alpha: float = alpha
         self._tol = tol
+        self._compute_dtype = compute_dtype
 
         self._parameters: Optional[Sequence[float]] = None
         self._initialized: bool = False
+        self._diagnostics: Optional[FitDiagnostics] = None
+
+    def _as_features(self, x: Sequence[Sequence[float]]) -> ndarray:
+        """
+        Returns the features without copying them when they are already a floating point numpy array, whatever their memory order. scipy.sparse matrices stay sparse (CSR or CSC), converted to the compute dtype, which only copies the non-zeros.
+        """
+        if issparse(x):
+            x = x if x.format in ('csr', 'csc') else x.tocsr()
+            return x if x.dtype == self._compute_dtype else x.astype(self._compute_dtype)
+        if isinstance(x, ndarray) and x.dtype.kind == 'f':
+            return x
+        return asarray(x, dtype=self._compute_dtype)
+
+    def _margin(self, X: ndarray, theta: array) -> ndarray:
+        """
+        Calculates X * C + D, where C is every parameter but the last and D the last one (the intercept).
+
+        Args:
+            X (ndarray): A 2-dimensional array with the number of points and the point dimensions.
+            theta (array): The parameters of the logistic model_utilities. Must be a 1-dimensional array.
+
+        Returns:
+            ndarray: The linear part of the model for every point, in the compute dtype.
+        """
+        coefficients = theta[:-1].astype(self._compute_dtype)
+        intercept = self._compute_dtype(theta[-1])
+        if issparse(X):
+            return X @ coefficients + intercept
+        if X.dtype == self._compute_dtype:
+            return dot(X, coefficients) + intercept
+        margin = empty(X.shape[0], dtype=self._compute_dtype)
+        for start in range(0, X.shape[0], _CONVERSION_ROWS):
+            margin[start:start + _CONVERSION_ROWS] = dot(X[start:start + _CONVERSION_ROWS].astype(self._compute_dtype), coefficients)
+        return margin + intercept
+
+    def _transposed_dot(self, weights: ndarray, X: ndarray) -> array:
+        """
+        Calculates the transpose of the design matrix (the features plus the intercept column) times a vector, without building the design matrix.
+
+        Args:
+            weights (ndarray): A 1-dimensional array with one weight per point.
+            X (ndarray): A 2-dimensional array with the number of points and the point dimensions.
+
+        Returns:
+            array: One value per parameter, in float64.
+        """
+        weights = weights.astype(self._compute_dtype, copy=False)
+        if issparse(X):
+            product = X.T @ weights
+        elif X.dtype == self._compute_dtype:
+            product = dot(weights, X)
+        else:
+            product = sum([dot(weights[start:start + _CONVERSION_ROWS], X[start:start + _CONVERSION_ROWS].astype(self._compute_dtype))
+                           for start in range(0, X.shape[0], _CONVERSION_ROWS)], axis=0)
+        return concatenate((product, [sum(weights)])).astype(float64)
 
-    def _evalute_point(self, X: array, theta: array) -> array:
+    def _evalute_point(self, X: ndarray, theta: array) -> array:
         """
         Evaluates points of the logistic curve.
 
         Args:
-            x (array): A 2-dimensional array with the number of points and the point dimensions. Assumes an extra value of "1" has been appended to the inputs so the shapes match.
+            X (ndarray): A 2-dimensional array with the number of points and the point dimensions. The intercept is handled separately, no column of ones is needed.
             theta (array): The parameters of the logistic model_utilities. Must be a 1-dimensional array.
 
         Returns:
             array: The predictions for the points.
         """
-        return 1 / (1 + exp(dot(X, theta)))
+        return expit(-self._margin(X, theta))
 
     def _constrained_lasso(self, theta: array, X: array, Y: array) -> array:
         """
@@ -42,41 +207,265 @@ class NumpyLassoLogisticModel:
 
         Args:
             theta (array): The parameters of the logistic model_utilities. Must be a 1-dimensional array.
-            x (array): A 2-dimensional array with the number of points and the point dimensions. Assumes an extra value of "1" has been appended to the inputs so the shapes match.
+            x (array): A 2-dimensional array with the number of points and the point dimensions.
             y (array): A 1-dimensional array with the observed points.
 
         Returns:
             array: The predictions for the points.
         """
-        return sum((Y - self._evalute_point(X, theta)) ** 2) / 2 / X.shape[0] + sum(self._alpha * abs(theta))
+        return float(sum((Y - self._evalute_point(X, theta)) ** 2)) / 2 / X.shape[0] + sum(self._alpha * abs(theta))
 
-    def _copy_and_add_intercept(self, x: array) -> array:
-        return append(x, ones((x.shape[0], 1)), axis=1)
+    def _squared_error_gradient(self, theta: array, X: array, Y: array) -> array:
+        """
+        Gradient of the squared error part of the objective. With p = 1 / (1 + exp(X theta)), dp/d(X theta) = -p (1 - p).
 
-    # BFGS isn't very good on constrained optimization. Nelder-Mead does a much better job.
+        Args:
+            theta (array): The parameters of the logistic model_utilities. Must be a 1-dimensional array.
+            X (array): A 2-dimensional array with the number of points and the point dimensions.
+            Y (array): A 1-dimensional array with the observed points.
+
+        Returns:
+            array: The gradient with respect to theta.
+        """
+        predictions = self._evalute_point(X, theta)
+        return self._transposed_dot((Y - predictions) * predictions * (1 - predictions), X) / X.shape[0]
+
+    def _constrained_lasso_gradient(self, theta: array, X: array, Y: array) -> array:
+        """
+        Gradient of _constrained_lasso, using sign(theta) as the subgradient of the L1 term.
+        """
+        return self._squared_error_gradient(theta, X, Y) + self._alpha * sign(theta)
+
+    def _constrained_lasso_hessp(self, theta: array, vector: array, X: array, Y: array) -> array:
+        """
+        Product of the Hessian of the squared error part of the objective with a vector, without building the Hessian. The L1 term contributes nothing away from 0.
+
+        Args:
+            theta (array): The parameters of the logistic model_utilities. Must be a 1-dimensional array.
+            vector (array): The vector to multiply with.
+            X (array): A 2-dimensional array with the number of points and the point dimensions.
+            Y (array): A 1-dimensional array with the observed points.
+
+        Returns:
+            array: The Hessian-vector product.
+        """
+        predictions = self._evalute_point(X, theta)
+        slopes = predictions * (1 - predictions)
+        curvatures = slopes * slopes - (Y - predictions) * slopes * (1 - 2 * predictions)
+        return self._transposed_dot(curvatures * self._margin(X, vector), X) / X.shape[0]
+
+    def _split_lasso(self, split_theta: array, X: array, Y: array) -> Tuple[float, array]:
+        """
+        Objective and gradient of the lasso with theta = u - v, where split_theta is u followed by v and both are non-negative. The L1 term is then alpha * sum(u + v).
+
+        Args:
+            split_theta (array): The positive parts followed by the negative parts of the parameters.
+            X (array): A 2-dimensional array with the number of points and the point dimensions.
+            Y (array): A 1-dimensional array with the observed points.
+
+        Returns:
+            The objective and its gradient with respect to split_theta.
+        """
+        d = X.shape[1] + 1
+        theta = split_theta[:d] - split_theta[d:]
+        predictions = self._evalute_point(X, theta)
+        residuals = Y - predictions
+        value = float(sum(residuals ** 2)) / 2 / X.shape[0] + self._alpha * sum(split_theta)
+        gradient = self._transposed_dot(residuals * predictions * (1 - predictions), X) / X.shape[0]
+        return value, concatenate((gradient + self._alpha, self._alpha - gradient))
+
+    def _minimize(self, x0: array, X: array, Y: array, method: str, callback: Optional[Callable] = None):
+        if method == SPLIT_LBFGSB:
+            split_x0 = concatenate((maximum(x0, 0), maximum(-x0, 0)))
+            result = minimize(self._split_lasso, split_x0, args=(X, Y), jac=True, method='L-BFGS-B',
+                              bounds=[(0, None)] * split_x0.shape[0], tol=_SPLIT_DEFAULT_TOL if self._tol is None else self._tol, callback=callback)
+            result.x = result.x[:X.shape[1] + 1] - result.x[X.shape[1] + 1:]
+            return result
+
+        options = {}
+        if method in _GRADIENT_METHODS:
+            options['jac'] = self._constrained_lasso_gradient
+        if method in _HESSP_METHODS:
+            options['hessp'] = self._constrained_lasso_hessp
+        return minimize(self._constrained_lasso, x0, args=(X, Y), method=method, tol=self._tol, callback=callback, **options)
+
+    def _iteration_recorder(self, X: ndarray, Y: ndarray, method: str, trace: List[float], callback: Optional[FitCallback]) -> Optional[Callable]:
+        """
+        Builds the minimize callback that appends the objective after every iteration to trace and passes it on to callback. Most methods hand over the objective they already computed; the few that only hand over the parameters would cost one extra objective evaluation per iteration, so they only get a recorder when there is a callback.
+        """
+        if method in _PARAMETER_CALLBACK_METHODS:
+            if callback is None:
+                return None
+
+            def record_parameters(xk: ndarray):
+                trace.append(float(self._constrained_lasso(xk, X, Y)))
+                callback(len(trace), trace[-1])
+            return record_parameters
+
+        def record(intermediate_result):
+            trace.append(float(intermediate_result.fun))
+            if callback is not None:
+                callback(len(trace), trace[-1])
+        return record
+
+    # BFGS isn't very good on constrained optimization. Nelder-Mead does a much better job on small problems; use SPLIT_LBFGSB for many features.
     def fit(self, X: Sequence[Sequence[float]], Y: Sequence[float], x0: Optional[Sequence[float]] = None,
-            method: str = 'Nelder-Mead', global_seed: bool = False):
-        return self._internal_fit(X, Y, x0, method, global_seed)
+            method: str = 'Nelder-Mead', global_seed: bool = False, n_starts: int = 16, agreement: int = 3,
+            time_budget: Optional[float] = None, max_workers: int = 1, seed: Optional[int] = None,
+            callback: Optional[FitCallback] = None):
+        return self._internal_fit(X, Y, x0, method, global_seed, n_starts, agreement, time_budget, max_workers, seed, callback)
+
+    def _global_search(self, x0: array, X: ndarray, Y: ndarray, method: str, n_starts: int, agreement: int,
+                       time_budget: Optional[float], max_workers: int, seed: Optional[int]) -> Tuple[array, int, int, int]:
+        """
+        Runs local solves from several starting points and returns the best solution. The starts are x0 and random points, each followed by its negation so both signs of the logistic symmetry are covered. Starts run in rounds of max_workers processes and the search stops once agreement starts reach the same best objective, once every start ran, or once time_budget seconds passed.
+
+        Args:
+            x0 (array): The first starting point.
+            X (ndarray): A 2-dimensional array with the number of points and the point dimensions.
+            Y (ndarray): A 1-dimensional array with the observed points.
+            method (str): Optimization method of the local solves.
+            n_starts (int): Maximum number of starting points.
+            agreement (int): Number of starts that must agree on the best objective to stop early.
+            time_budget (Optional[float]): Seconds after which no new round of starts is launched.
+            max_workers (int): Number of processes running starts concurrently. The default of 1 runs them in the calling process.
+            seed (Optional[int]): Seed of the random starting points. Without a time budget the result only depends on the seed, not on max_workers.
+
+        Returns:
+            The parameters with the lowest objective, the objective and gradient evaluations of every start run, and the number of starts run.
+        """
+        rng = default_rng(seed)
+        random_starts = rng.normal(size=((n_starts - 1) // 2, x0.shape[0]))
+        starts = [x0, -x0] + [start for random_start in random_starts for start in (random_start, -random_start)]
+        starts = starts[:n_starts]
+
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        objectives = []
+        solutions = []
+        nfev, njev, starts_run = 0, 0, 0
+        executor = ProcessPoolExecutor(max_workers, initializer=_set_worker_problem, initargs=(self, X, Y, method)) if max_workers > 1 else None
+        try:
+            for start in range(0, len(starts), max_workers):
+                if deadline is not None and objectives and time.perf_counter() > deadline:
+                    break
+                round_starts = starts[start:start + max_workers]
+                if executor is not None:
+                    results = list(executor.map(_solve_in_worker, round_starts))
+                else:
+                    results = [_solve(self, round_starts[0], X, Y, method)]
+                objectives.extend(result[0] for result in results)
+                solutions.extend(result[1] for result in results)
+                nfev += sum([result[2] for result in results])
+                njev += sum([result[3] for result in results])
+                starts_run += len(results)
+                agreed = _agreed_prefix(objectives, agreement)
+                if agreed is not None:
+                    objectives, solutions = objectives[:agreed], solutions[:agreed]
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return solutions[int(argmin(objectives))], nfev, njev, starts_run
 
     # BFGS isn't very good on constrained optimization. Nelder-Mead does a much better job.
     def _internal_fit(self, x: Sequence[Sequence[float]], y: Sequence[float], x0: Optional[Sequence[float]] = None,
-                      method: str = 'Nelder-Mead', global_seed: bool = False):
-        copied_x = self._copy_and_add_intercept(array(x))
-        copied_y = array(y)
-
-        fit_fun = partial(self._constrained_lasso, X=copied_x, Y=copied_y)
+                      method: str = 'Nelder-Mead', global_seed: bool = False, n_starts: int = 16, agreement: int = 3,
+                      time_budget: Optional[float] = None, max_workers: int = 1, seed: Optional[int] = None,
+                      callback: Optional[FitCallback] = None):
+        features = self._as_features(x)
+        targets = asarray(y, dtype=self._compute_dtype)
 
         x0_internal = x0
         if x0_internal is None:
-            x0_internal = array([1.0 / (copied_x.shape[1] - 1)] * (copied_x.shape[1] - 1) + [0.0])
+            x0_internal = array([1.0 / features.shape[1]] * features.shape[1] + [0.0])
+        x0_internal = array(x0_internal, dtype=float)
 
+        phase_seconds = {}
+        nfev, njev, global_starts = 0, 0, 0
         if global_seed:
-            xhat_seed = basinhopping(fit_fun, x0_internal)
-            x0_internal = xhat_seed.x
-        xhat = minimize(fit_fun, x0_internal, method=method, tol=self._tol)
+            start = time.perf_counter()
+            x0_internal, nfev, njev, global_starts = self._global_search(x0_internal, features, targets, method, n_starts, agreement,
+                                                                         time_budget, max_workers, seed)
+            phase_seconds['global_search'] = time.perf_counter() - start
+
+        trace = []
+        start = time.perf_counter()
+        xhat = self._minimize(x0_internal, features, targets, method, self._iteration_recorder(features, targets, method, trace, callback))
+        phase_seconds['final'] = time.perf_counter() - start
 
         self._parameters = xhat.x
         self._initialized = True
+        self._diagnostics = FitDiagnostics(nfev=nfev + int(xhat.get('nfev', 0)), njev=njev + int(xhat.get('njev', 0)), nit=int(xhat.get('nit', len(trace))),
+                                           success=bool(xhat.success), message=str(xhat.message), phase_seconds=phase_seconds,
+                                           objective_trace=trace, global_starts=global_starts)
+
+    def fit_batches(self, batches: BatchSource, epochs: int = 5, batch_size: int = 10000, learning_rate: float = 5.0,
+                    learning_rate_decay: float = 0.0, x0: Optional[Sequence[float]] = None):
+        return self._internal_fit_batches(batches, epochs, batch_size, learning_rate, learning_rate_decay, x0)
+
+    def _epoch_batches(self, batches: BatchSource, batch_size: int) -> Iterable[Tuple[ndarray, ndarray]]:
+        if isinstance(batches, tuple):
+            x, y = batches
+            return ((x[start:start + batch_size], y[start:start + batch_size]) for start in range(0, x.shape[0], batch_size))
+        if callable(batches):
+            return batches()
+        return batches
+
+    def _internal_fit_batches(self, batches: BatchSource, epochs: int = 5, batch_size: int = 10000, learning_rate: float = 5.0,
+                              learning_rate_decay: float = 0.0, x0: Optional[Sequence[float]] = None):
+        """
+        Fits the same lasso objective as fit with mini-batch proximal gradient descent, so peak memory is bounded by the chunk size rather than the data size. Each chunk takes a gradient step on the squared error followed by soft-thresholding for the L1 term.
+
+        Args:
+            batches (BatchSource): Either a pair of arrays (numpy.memmap works) that is read batch_size rows at a time, a function returning an iterable of (X, Y) chunks for each epoch, or an iterable of chunks, which only supports one epoch if it is a one-shot iterator like a generator.
+            epochs (int): Number of passes over the data.
+            batch_size (int): Number of rows per step when batches is a pair of arrays.
+            learning_rate (float): Initial step size.
+            learning_rate_decay (float): The step size at step t is learning_rate / (1 + learning_rate_decay * t).
+            x0 (Optional[Sequence[float]]): Starting parameters. Defaults to the same start as fit.
+        """
+        if epochs > 1 and not isinstance(batches, tuple) and not callable(batches) and iter(batches) is batches:
+            raise ValueError("A one-shot iterator can only be used for a single epoch. Pass a function returning the chunks instead.")
+
+        theta = None if x0 is None else array(x0, dtype=float)
+        step = 0
+        for _ in range(epochs):
+            for x, y in self._epoch_batches(batches, batch_size):
+                features = self._as_features(x)
+                targets = asarray(y, dtype=self._compute_dtype)
+                if theta is None:
+                    theta = array([1.0 / features.shape[1]] * features.shape[1] + [0.0])
+
+                step_size = learning_rate / (1 + learning_rate_decay * step)
+                theta = theta - step_size * self._squared_error_gradient(theta, features, targets)
+                theta = sign(theta) * maximum(abs(theta) - step_size * self._alpha, 0)
+                step += 1
+
+        if theta is None:
+            raise ValueError("No training data was provided.")
+        self._parameters = theta
+        self._initialized = True
+        self._diagnostics = None
+
+    def predict(self, X: Sequence[Sequence[float]], out: Optional[ndarray] = None, chunk_rows: int = _CONVERSION_ROWS) -> ndarray:
+        return self._internal_predict(X, out, chunk_rows)
+
+    def _internal_predict(self, x: Sequence[Sequence[float]], out: Optional[ndarray] = None, chunk_rows: int = _CONVERSION_ROWS) -> ndarray:
+        """
+        Predicts the logistic curve at new points.
+
+        Args:
+            x (Sequence[Sequence[float]]): A 2-dimensional array with the number of points and the point dimensions, without an intercept column.
+            out (Optional[ndarray]): A 1-dimensional array with one entry per point to write the predictions into.
+            chunk_rows (int): Number of rows evaluated at a time.
+
+        Returns:
+            ndarray: The predictions, in out when provided.
+        """
+        if not self._initialized:
+            raise ValueError("The model must be fit before predicting.")
+        parameters = asarray(self._parameters, dtype=float64)
+        return _predict_chunks(self._as_features(x), parameters[:-1], parameters[-1], self._compute_dtype, out, chunk_rows)
 
     def get_parameters(self) -> Sequence[float]:
         return self._internal_get_parameters()
@@ -89,3 +478,148 @@ class NumpyLassoLogisticModel:
 
     def _internal_get_initialized(self) -> bool:
         return self._initialized
+
+    def get_diagnostics(self) -> Optional[FitDiagnostics]:
+        return self._internal_get_diagnostics()
+
+    def _internal_get_diagnostics(self) -> Optional[FitDiagnostics]:
+        return self._diagnostics
+
+
+def predict_many(models: Sequence[NumpyLassoLogisticModel],
+                 X: Sequence[Sequence[float]],
+                 out: Optional[ndarray] = None,
+                 chunk_rows: int = _CONVERSION_ROWS) -> ndarray:
+    """
+    Scores the same points with several fitted models at once, e.g. the arms of an A/B test. The parameter vectors are stacked into a matrix, so every chunk of the data is read once for all the models.
+
+    Args:
+        models (Sequence[NumpyLassoLogisticModel]): Fitted models with the same number of features. The first model's compute_dtype is used.
+        X (Sequence[Sequence[float]]): A 2-dimensional array with the number of points and the point dimensions, without an intercept column.
+        out (Optional[ndarray]): A 2-dimensional array with one row per point and one column per model to write the predictions into.
+        chunk_rows (int): Number of rows evaluated at a time.
+
+    Returns:
+        ndarray: The predictions, one column per model, in out when provided.
+    """
+    if not all(model.get_initialized() for model in models):
+        raise ValueError("Every model must be fit before predicting.")
+    parameters = array([model.get_parameters() for model in models], dtype=float64)
+    compute_dtype = models[0]._compute_dtype
+    return _predict_chunks(models[0]._as_features(X), parameters[:, :-1].T, parameters[:, -1], compute_dtype, out, chunk_rows)
+
+
+class RegularizationPath(NamedTuple):
+    """
+    Result of fit_regularization_path.
+
+    alphas: The alphas in the order they were fit (descending).
+    parameters: The parameters at every alpha, one row per alpha.
+    objectives: The objective at every alpha on the full data.
+    nonzero_counts: Number of non-zero linear parameters (C) at every alpha.
+    cv_errors: Mean squared error on the held out folds at every alpha, averaged over the folds, when cross-validating.
+    best_alpha: The alpha with the lowest cross-validation error, when cross-validating.
+    """
+    alphas: ndarray
+    parameters: ndarray
+    objectives: ndarray
+    nonzero_counts: ndarray
+    cv_errors: Optional[ndarray] = None
+    best_alpha: Optional[float] = None
+
+
+def _default_alphas(X: ndarray, Y: ndarray, n_alphas: int, compute_dtype: type) -> ndarray:
+    """
+    Geometric sequence of alphas starting where all the parameters being 0 satisfies the optimality conditions (the largest gradient at 0) and going down three orders of magnitude.
+    """
+    model = NumpyLassoLogisticModel(compute_dtype=compute_dtype)
+    largest_gradient = abs(model._squared_error_gradient(zeros(X.shape[1] + 1), X, Y)).max()
+    return geomspace(largest_gradient, largest_gradient * 1e-3, n_alphas)
+
+
+def _fit_path(X: ndarray, Y: ndarray, alphas: ndarray, tol: Optional[float], method: str, compute_dtype: type) -> ndarray:
+    """
+    Fits the alphas in order, warm starting each fit from the previous solution. Only the features that are non-zero or pass the sequential strong rule (|gradient| > 2 * alpha - previous alpha) are optimized; the others are held at 0 and added back if they violate the optimality condition |gradient| <= alpha.
+
+    Returns:
+        ndarray: The parameters at every alpha, one row per alpha.
+    """
+    d = X.shape[1]
+    theta = zeros(d + 1)
+    path = empty((alphas.shape[0], d + 1))
+    previous_alpha = alphas[0]
+    for i, alpha in enumerate(alphas):
+        model = NumpyLassoLogisticModel(alpha=alpha, tol=tol, compute_dtype=compute_dtype)
+        gradient = model._squared_error_gradient(theta, X, Y)[:-1]
+        active = (theta[:-1] != 0) | (abs(gradient) > 2 * alpha - previous_alpha)
+        while True:
+            features = X if active.all() else X[:, active]
+            result = model._minimize(concatenate((theta[:-1][active], theta[-1:])), features, Y, method)
+            theta = zeros(d + 1)
+            theta[:-1][active] = result.x[:-1]
+            theta[-1] = result.x[-1]
+            violations = ~active & (abs(model._squared_error_gradient(theta, X, Y)[:-1]) > alpha)
+            if not violations.any():
+                break
+            active |= violations
+        path[i] = theta
+        previous_alpha = alpha
+    return path
+
+
+def _cross_validation_fold(fold: Tuple[ndarray, ndarray], X: ndarray, Y: ndarray, alphas: ndarray, tol: Optional[float], method: str, compute_dtype: type) -> ndarray:
+    train, test = fold
+    path = _fit_path(X[train], Y[train], alphas, tol, method, compute_dtype)
+    model = NumpyLassoLogisticModel(compute_dtype=compute_dtype)
+    return array([mean((Y[test] - model._evalute_point(X[test], theta)) ** 2) for theta in path])
+
+
+def fit_regularization_path(X: Sequence[Sequence[float]],
+                            Y: Sequence[float],
+                            alphas: Optional[Sequence[float]] = None,
+                            n_alphas: int = 20,
+                            tol: Optional[float] = None,
+                            method: str = SPLIT_LBFGSB,
+                            compute_dtype: type = float64,
+                            cv: Optional[int] = None,
+                            max_workers: int = 1,
+                            seed: Optional[int] = None) -> RegularizationPath:
+    """
+    Fits NumpyLassoLogisticModel for a descending sequence of alphas in a single call. Each fit warm starts from the previous solution and only optimizes the features that can be non-zero, which makes the strongly regularized fits cheap.
+
+    Args:
+        X (Sequence[Sequence[float]]): A 2-dimensional array with the number of points and the point dimensions.
+        Y (Sequence[float]): A 1-dimensional array with the observed points.
+        alphas (Optional[Sequence[float]]): The alphas to fit, sorted in descending order. Defaults to n_alphas values from the smallest alpha where every parameter is 0 down three orders of magnitude.
+        n_alphas (int): Number of default alphas.
+        tol (Optional[float]): Tolerance of every fit.
+        method (str): Optimization method, see NumpyLassoLogisticModel.fit. SPLIT_LBFGSB produces exact zeros.
+        compute_dtype (type): See NumpyLassoLogisticModel.
+        cv (Optional[int]): Number of cross-validation folds. No cross-validation when not provided.
+        max_workers (int): Number of processes running the cross-validation folds. The default of 1 runs them in the calling process.
+        seed (Optional[int]): Seed for the assignment of points to folds.
+
+    Returns:
+        RegularizationPath: The parameters, objective and sparsity at every alpha, and the cross-validation errors when requested.
+    """
+    features = NumpyLassoLogisticModel(compute_dtype=compute_dtype)._as_features(X)
+    targets = asarray(Y, dtype=compute_dtype)
+    alpha_array = _default_alphas(features, targets, n_alphas, compute_dtype) if alphas is None else array(sorted(alphas, reverse=True), dtype=float)
+
+    path = _fit_path(features, targets, alpha_array, tol, method, compute_dtype)
+    objectives = array([NumpyLassoLogisticModel(alpha=alpha, compute_dtype=compute_dtype)._constrained_lasso(theta, features, targets)
+                        for alpha, theta in zip(alpha_array, path)])
+    nonzero_counts = count_nonzero(path[:, :-1], axis=1)
+    if cv is None:
+        return RegularizationPath(alpha_array, path, objectives, nonzero_counts)
+
+    fold_ids = default_rng(seed).permutation(features.shape[0]) % cv
+    folds = [((fold_ids != k).nonzero()[0], (fold_ids == k).nonzero()[0]) for k in range(cv)]
+    fold_errors = partial(_cross_validation_fold, X=features, Y=targets, alphas=alpha_array, tol=tol, method=method, compute_dtype=compute_dtype)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            errors = array(list(executor.map(fold_errors, folds)))
+    else:
+        errors = array(list(map(fold_errors, folds)))
+    cv_errors = errors.mean(axis=0)
+    return RegularizationPath(alpha_array, path, objectives, nonzero_counts, cv_errors, float(alpha_array[argmin(cv_errors)]))
@@ -0,0 +1,154 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Optional, Sequence, Tuple
+
+from numpy import ndarray, add, argsort, array, asarray, concatenate, cumsum, dot, einsum, empty, float64, median, repeat, unique, zeros
+from scipy.optimize import minimize
+from scipy.special import expit
+
+from model_utilities.regression.logistic import NumpyLassoLogisticModel, SPLIT_LBFGSB, _CONVERSION_ROWS, _SPLIT_DEFAULT_TOL
+
+
+class SegmentModels:
+    """
+    The parameters of one NumpyLassoLogisticModel per segment, stored as a single matrix with one row per segment so every segment can be scored in bulk.
+    """
+    def __init__(self, keys: ndarray, parameters: ndarray):
+        self._keys: ndarray = keys
+        self._parameters: ndarray = parameters
+
+    def get_keys(self) -> ndarray:
+        return self._keys
+
+    def get_parameters(self) -> ndarray:
+        return self._parameters
+
+    def _segment_indices(self, segments: ndarray) -> ndarray:
+        indices = self._keys.searchsorted(segments).clip(0, self._keys.shape[0] - 1)
+        if (self._keys[indices] != segments).any():
+            raise ValueError("Every segment must have a fitted model.")
+        return indices
+
+    def get_model(self, key) -> NumpyLassoLogisticModel:
+        """
+        Builds a standalone model for one segment.
+
+        Args:
+            key: The segment key.
+
+        Returns:
+            NumpyLassoLogisticModel: A fitted model with the segment's parameters.
+        """
+        model = NumpyLassoLogisticModel()
+        model._parameters = self._parameters[self._segment_indices(asarray([key]))[0]].copy()
+        model._initialized = True
+        return model
+
+    def predict(self, X: Sequence[Sequence[float]], segments: Sequence, out: Optional[ndarray] = None, chunk_rows: int = _CONVERSION_ROWS) -> ndarray:
+        """
+        Scores every point with the model of its segment.
+
+        Args:
+            X (Sequence[Sequence[float]]): A 2-dimensional array with the number of points and the point dimensions, without an intercept column.
+            segments (Sequence): The segment key of every point.
+            out (Optional[ndarray]): A 1-dimensional array with one entry per point to write the predictions into.
+            chunk_rows (int): Number of rows evaluated at a time.
+
+        Returns:
+            ndarray: The predictions, in out when provided.
+        """
+        features = asarray(X, dtype=float64)
+        indices = self._segment_indices(asarray(segments))
+        if out is None:
+            out = empty(features.shape[0], dtype=float64)
+        for start in range(0, features.shape[0], chunk_rows):
+            theta = self._parameters[indices[start:start + chunk_rows]]
+            margin = einsum('ij,ij->i', features[start:start + chunk_rows], theta[:, :-1]) + theta[:, -1]
+            expit(-margin, out=out[start:start + chunk_rows])
+        return out
+
+
+def _joint_split_lasso(split_theta: ndarray, X: ndarray, Y: ndarray, counts: ndarray, starts: ndarray, row_weights: ndarray, alpha: float) -> Tuple[float, ndarray]:
+    """
+    Objective and gradient of the sum of every segment's split lasso (see NumpyLassoLogisticModel._split_lasso). The rows are sorted by segment, so the per-segment gradients are sums over contiguous blocks of rows. The segments don't share parameters, so minimizing the sum minimizes every segment.
+    """
+    segments, d = counts.shape[0], X.shape[1] + 1
+    theta = (split_theta[:segments * d] - split_theta[segments * d:]).reshape(segments, d)
+    row_theta = repeat(theta, counts, axis=0)
+    predictions = expit(-(einsum('ij,ij->i', X, row_theta[:, :-1]) + row_theta[:, -1]))
+    residuals = Y - predictions
+    value = float(dot(residuals ** 2, row_weights)) / 2 + alpha * float(split_theta.sum())
+    weights = residuals * predictions * (1 - predictions) * row_weights
+    gradient = empty((segments, d))
+    gradient[:, :-1] = add.reduceat(X * weights[:, None], starts, axis=0)
+    gradient[:, -1] = add.reduceat(weights, starts)
+    gradient = gradient.ravel()
+    return value, concatenate((gradient + alpha, alpha - gradient))
+
+
+def _fit_jointly(X: ndarray, Y: ndarray, counts: ndarray, alpha: float, tol: Optional[float]) -> ndarray:
+    segments, d = counts.shape[0], X.shape[1] + 1
+    starts = concatenate(([0], cumsum(counts)[:-1]))
+    x0 = zeros((segments, d))
+    x0[:, :-1] = 1.0 / X.shape[1]
+    split_x0 = concatenate((x0.ravel(), zeros(segments * d)))
+    result = minimize(_joint_split_lasso, split_x0, args=(X, Y, counts, starts, repeat(1.0 / counts, counts), alpha), jac=True,
+                      method='L-BFGS-B', bounds=[(0, None)] * split_x0.shape[0], tol=_SPLIT_DEFAULT_TOL if tol is None else tol,
+                      options={'maxiter': 15000})
+    return (result.x[:segments * d] - result.x[segments * d:]).reshape(segments, d)
+
+
+def _fit_one(data: Tuple[ndarray, ndarray], alpha: float, tol: Optional[float]) -> ndarray:
+    model = NumpyLassoLogisticModel(alpha=alpha, tol=tol)
+    model.fit(data[0], data[1], method=SPLIT_LBFGSB)
+    return model.get_parameters()
+
+
+def fit_segments(X: Sequence[Sequence[float]],
+                 Y: Sequence[float],
+                 segments: Sequence,
+                 alpha: float = 0.0,
+                 tol: Optional[float] = None,
+                 large_segment_rows: Optional[int] = None,
+                 max_workers: int = 1) -> SegmentModels:
+    """
+    Fits one NumpyLassoLogisticModel per segment in a single call. The segments are fit together as one vectorized split-L-BFGS-B problem, which avoids a separate optimizer call per segment. Segments much larger than the rest would make every joint iteration as expensive as fitting them, so they are fit separately in a process pool instead.
+
+    Args:
+        X (Sequence[Sequence[float]]): A 2-dimensional array with the number of points and the point dimensions.
+        Y (Sequence[float]): A 1-dimensional array with the observed points.
+        segments (Sequence): The segment key of every point.
+        alpha (float): The lasso penalty of every segment model.
+        tol (Optional[float]): Tolerance of the fits.
+        large_segment_rows (Optional[int]): Segments with more rows are fit separately. Defaults to 10 times the median segment size.
+        max_workers (int): Number of processes fitting the large segments. The default of 1 fits them in the calling process.
+
+    Returns:
+        SegmentModels: The parameters of every segment, ordered by segment key.
+    """
+    features = asarray(X, dtype=float64)
+    targets = asarray(Y, dtype=float64)
+    keys, inverse, counts = unique(asarray(segments), return_inverse=True, return_counts=True)
+    if large_segment_rows is None:
+        large_segment_rows = int(10 * median(counts))
+
+    order = argsort(inverse, kind='stable')
+    features, targets = features[order], targets[order]
+    ends = cumsum(counts)
+    is_large = counts > large_segment_rows
+    parameters = empty((keys.shape[0], features.shape[1] + 1))
+
+    small_rows = repeat(~is_large, counts)
+    if (~is_large).any():
+        parameters[~is_large] = _fit_jointly(features[small_rows], targets[small_rows], counts[~is_large], alpha, tol)
+
+    large_data = [(features[end - count:end], targets[end - count:end]) for end, count in zip(ends[is_large], counts[is_large])]
+    fit_one = partial(_fit_one, alpha=alpha, tol=tol)
+    if max_workers > 1 and len(large_data) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            large_parameters = list(executor.map(fit_one, large_data))
+    else:
+        large_parameters = list(map(fit_one, large_data))
+    if large_parameters:
+        parameters[is_large] = array(large_parameters)
+    return SegmentModels(keys, parameters)
@@ -0,0 +1,75 @@
+from unittest import TestCase
+from numpy import array, repeat
+from numpy.random import default_rng
+from model_utilities.evaluation.array_cutoff import find_cutoff_array, find_cutoff_sorted_array, find_multiclass_cutoffs_array, sweep_cutoffs, aggregate_scores, find_cutoff_aggregated
+from model_utilities.evaluation.class_cutoff import find_cutoff_sorted, find_cutoff, find_multiclass_cutoffs
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+
+
+class TestArrayCutoff(TestCase):
+    def setUp(self):
+        rng = default_rng(7)
+        self.predicted = rng.integers(0, 50, 2000) / 50.
+        self.actual = (rng.random(2000) < self.predicted).astype(int)
+
+    def test_find_cutoff_array_matches_find_cutoff(self):
+        for cutoff_method in CutoffMethod:
+            for importance in [0.5, 1, 3.]:
+                for use_rates_over_counts in [True, False]:
+                    self.assertEqual(find_cutoff(list(self.actual), list(self.predicted), cutoff_method, importance, use_rates_over_counts),
+                                     find_cutoff_array(self.actual, self.predicted, cutoff_method, importance, use_rates_over_counts))
+
+    def test_find_cutoff_sorted_array_matches_find_cutoff_sorted(self):
+        order = self.predicted.argsort(kind="stable")[::-1]
+        sorted_actual = self.actual[order]
+        sorted_predicted = self.predicted[order]
+        sorted_test_pairs = list(zip(sorted_actual, sorted_predicted))
+        for cutoff_method in CutoffMethod:
+            self.assertEqual(find_cutoff_sorted(sorted_test_pairs, cutoff_method, 2.),
+                             find_cutoff_sorted_array(sorted_actual, sorted_predicted, cutoff_method, 2.))
+
+    def test_find_cutoff_array_without_positives_predicted(self):
+        self.assertEqual(0., find_cutoff_array(array([1, 0, 0]), array([0.1, 0.9, 0.8])))
+
+    def test_find_cutoff_aggregated_matches_find_cutoff(self):
+        scores, positives, negatives = aggregate_scores(self.actual, self.predicted)
+        self.assertEqual(len(self.actual), positives.sum() + negatives.sum())
+        order = default_rng(1).permutation(scores.shape[0])
+        for cutoff_method in CutoffMethod:
+            self.assertEqual(find_cutoff(list(self.actual), list(self.predicted), cutoff_method, 1.5),
+                             find_cutoff_aggregated(scores[order], positives[order], negatives[order], cutoff_method, 1.5))
+
+    def test_find_cutoff_array_with_sample_weight_matches_repeated_rows(self):
+        weights = default_rng(2).integers(1, 4, len(self.actual))
+        for cutoff_method in CutoffMethod:
+            self.assertEqual(find_cutoff_array(repeat(self.actual, weights), repeat(self.predicted, weights), cutoff_method),
+                             find_cutoff_array(self.actual, self.predicted, cutoff_method, sample_weight=weights))
+
+    def test_sweep_cutoffs_matches_find_cutoff(self):
+        importances = [0.25, 1, 2.5, 4.]
+        sweep = sweep_cutoffs(self.actual, self.predicted, importances)
+        for cutoff_method in CutoffMethod:
+            for importance in importances:
+                for use_rates_over_counts in [True, False]:
+                    self.assertEqual(find_cutoff(list(self.actual), list(self.predicted), cutoff_method, importance, use_rates_over_counts),
+                                     sweep.cutoffs[(cutoff_method, importance, use_rates_over_counts)])
+            self.assertEqual((sweep.scores.shape[0] + 1, len(importances)), sweep.penalties[(cutoff_method, True)].shape)
+        self.assertEqual(self.actual.sum(), sweep.true_positives[-1])
+        self.assertEqual(len(self.actual) - self.actual.sum(), sweep.false_positives[-1])
+
+    def test_find_multiclass_cutoffs_array_matches_find_multiclass_cutoffs(self):
+        rng = default_rng(11)
+        predicted = rng.integers(0, 20, (500, 3)) / 20.
+        actual = array(["a", "b", "c"])[rng.integers(0, 3, 500)]
+        class_map = {"a": 0, "b": 1, "c": 2}
+        for cutoff_method in CutoffMethod:
+            self.assertEqual(find_multiclass_cutoffs(list(actual), [list(row) for row in predicted], class_map, cutoff_method, 1.5),
+                             find_multiclass_cutoffs_array(actual, predicted, class_map, cutoff_method, 1.5))
+
+    def test_find_multiclass_cutoffs_array_with_process_pool(self):
+        rng = default_rng(5)
+        predicted = rng.random((300, 4))
+        actual = rng.integers(0, 4, 300)
+        class_map = {i: i for i in range(4)}
+        self.assertEqual(find_multiclass_cutoffs_array(actual, predicted, class_map),
+                         find_multiclass_cutoffs_array(actual, predicted, class_map, max_workers=2))
@@ -0,0 +1,26 @@
+from unittest import TestCase
+from numpy.random import default_rng
+from numpy.testing import assert_array_equal
+from model_utilities.evaluation.array_cutoff import find_cutoff_array
+from model_utilities.evaluation.bootstrap_cutoff import bootstrap_cutoff
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+
+
+class TestBootstrapCutoff(TestCase):
+    def setUp(self):
+        rng = default_rng(19)
+        self.predicted = rng.integers(0, 100, 5000) / 100.
+        self.actual = (rng.random(5000) < self.predicted).astype(int)
+
+    def test_bootstrap_cutoff_interval(self):
+        for cutoff_method in CutoffMethod:
+            result = bootstrap_cutoff(self.actual, self.predicted, cutoff_method, replicates=200, seed=3)
+            self.assertEqual(find_cutoff_array(self.actual, self.predicted, cutoff_method), result.cutoff)
+            self.assertEqual(200, result.replicate_cutoffs.shape[0])
+            self.assertLessEqual(result.lower, result.cutoff)
+            self.assertLessEqual(result.cutoff, result.upper)
+
+    def test_bootstrap_cutoff_is_reproducible_across_workers(self):
+        serial = bootstrap_cutoff(self.actual, self.predicted, replicates=50, seed=7, batch_size=10)
+        pooled = bootstrap_cutoff(self.actual, self.predicted, replicates=50, seed=7, batch_size=10, max_workers=2)
+        assert_array_equal(serial.replicate_cutoffs, pooled.replicate_cutoffs)
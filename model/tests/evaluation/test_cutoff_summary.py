@@ -0,0 +1,39 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from numpy import savez
+from numpy.random import default_rng
+from model_utilities.evaluation.class_cutoff import find_cutoff
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+from model_utilities.evaluation.cutoff_summary import CutoffSummary, merge_summaries, find_cutoff_sharded
+
+
+class TestCutoffSummary(TestCase):
+    def setUp(self):
+        rng = default_rng(17)
+        self.predicted = rng.integers(0, 60, 3000) / 60.
+        self.actual = (rng.random(3000) < self.predicted).astype(int)
+        self.shards = [(self.actual[i:i + 1000], self.predicted[i:i + 1000]) for i in range(0, 3000, 1000)]
+
+    def test_merged_summary_matches_find_cutoff(self):
+        a, b, c = [CutoffSummary.from_arrays(actual, predicted) for actual, predicted in self.shards]
+        for cutoff_method in CutoffMethod:
+            expected = find_cutoff(list(self.actual), list(self.predicted), cutoff_method, 2.)
+            self.assertEqual(expected, a.merge(b).merge(c).find_cutoff(cutoff_method, 2.))
+            self.assertEqual(expected, a.merge(c.merge(b)).find_cutoff(cutoff_method, 2.))
+            self.assertEqual(expected, merge_summaries([c, a, b]).find_cutoff(cutoff_method, 2.))
+
+        merged, pairwise = merge_summaries([c, a, b]), a.merge(b).merge(c)
+        for get in [CutoffSummary.get_scores, CutoffSummary.get_positives, CutoffSummary.get_negatives]:
+            self.assertEqual(list(get(pairwise)), list(get(merged)))
+        self.assertEqual(pairwise.get_positives().dtype, merged.get_positives().dtype)
+        self.assertEqual(0, merge_summaries([]).get_scores().shape[0])
+
+    def test_find_cutoff_sharded(self):
+        with TemporaryDirectory() as directory:
+            paths = []
+            for i, (actual, predicted) in enumerate(self.shards):
+                paths.append(os.path.join(directory, f"shard_{i}.npz"))
+                savez(paths[-1], actual=actual, predicted=predicted)
+            self.assertEqual(find_cutoff(list(self.actual), list(self.predicted)),
+                             find_cutoff_sharded(paths, max_workers=2))
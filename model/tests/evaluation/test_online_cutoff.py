@@ -0,0 +1,121 @@
+from fractions import Fraction
+from unittest import TestCase
+from numpy.random import default_rng
+from model_utilities.evaluation.class_cutoff import find_cutoff
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+from model_utilities.evaluation.online_cutoff import OnlineCutoffTracker
+
+
+def exact_penalty(actual, predicted, cutoff, cutoff_method, importance, use_rates_over_counts) -> Fraction:
+    """
+    Penalty of a cutoff in exact arithmetic, with the binary value of the importance. A cutoff of 0 can mean classifying nothing or everything as positive, so the lower penalty is used.
+    """
+    actual = [int(value) for value in actual]
+    positives = sum(actual)
+    negatives = len(actual) - positives
+
+    def penalty(is_predicted_positive):
+        true_positives = sum(value for value, flag in zip(actual, is_predicted_positive) if flag)
+        false_positives = sum(1 - value for value, flag in zip(actual, is_predicted_positive) if flag)
+        false_negative_rate = Fraction(positives - true_positives, positives if use_rates_over_counts else 1)
+        false_positive_rate = Fraction(false_positives, negatives if use_rates_over_counts else 1)
+        if cutoff_method == CutoffMethod.AbsoluteDistance:
+            return false_negative_rate + Fraction(importance) * false_positive_rate
+        return false_negative_rate * false_negative_rate + Fraction(importance) * false_positive_rate * false_positive_rate
+
+    if cutoff == 0:
+        return min(penalty([False] * len(actual)), penalty([value >= 0 for value in predicted]))
+    return penalty([value >= cutoff for value in predicted])
+
+
+class TestOnlineCutoffTracker(TestCase):
+    def setUp(self):
+        rng = default_rng(13)
+        self.predicted = rng.integers(0, 40, 3000) / 40.
+        self.actual = (rng.random(3000) < self.predicted).astype(int)
+
+    def assertMatchesFindCutoff(self, actual, predicted, cutoff_method, importance, use_rates_over_counts, cutoff):
+        """
+        DistanceSquared must agree with find_cutoff. With AbsoluteDistance the tracker compares penalties exactly, so where find_cutoff breaks a rounding-level tie the other way the tracker's cutoff must have the lower exact penalty.
+        """
+        expected = find_cutoff(list(actual), list(predicted), cutoff_method, importance, use_rates_over_counts)
+        if cutoff_method == CutoffMethod.DistanceSquared or cutoff == expected:
+            self.assertEqual(expected, cutoff)
+            return
+        penalty = exact_penalty(actual, predicted, cutoff, cutoff_method, importance, use_rates_over_counts)
+        expected_penalty = exact_penalty(actual, predicted, expected, cutoff_method, importance, use_rates_over_counts)
+        self.assertLessEqual(penalty, expected_penalty)
+        self.assertAlmostEqual(float(expected_penalty), float(penalty), 12)
+
+    def test_count_window_matches_find_cutoff(self):
+        for cutoff_method in CutoffMethod:
+            for importance in [0.7, 2.]:
+                tracker = OnlineCutoffTracker(cutoff_method, importance, max_observations=500)
+                for i in range(len(self.actual)):
+                    tracker.update(self.actual[i], self.predicted[i], timestamp=float(i))
+                    if i % 250 == 249:
+                        start = max(0, i + 1 - 500)
+                        self.assertEqual(i + 1 - start, tracker.get_observation_count())
+                        self.assertMatchesFindCutoff(self.actual[start:i + 1], self.predicted[start:i + 1], cutoff_method, importance, True, tracker.find_cutoff())
+
+    def test_time_window_matches_find_cutoff(self):
+        tracker = OnlineCutoffTracker(max_age=100.)
+        tracker.update_many(self.actual[:1000], self.predicted[:1000], timestamp=0.)
+        tracker.update_many(self.actual[1000:], self.predicted[1000:], timestamp=50.)
+        self.assertEqual(find_cutoff(list(self.actual), list(self.predicted)), tracker.find_cutoff(now=60.))
+        self.assertEqual(find_cutoff(list(self.actual[1000:]), list(self.predicted[1000:])), tracker.find_cutoff(now=120.))
+        self.assertEqual(2000, tracker.get_observation_count())
+
+    def test_counts_window_matches_find_cutoff(self):
+        rng = default_rng(14)
+        predicted = rng.random(4000)
+        actual = (rng.random(4000) < predicted).astype(int)
+        for cutoff_method in CutoffMethod:
+            for use_rates_over_counts in [False, True]:
+                for importance in [0.5, 0.7, 1., 1 / 3, 3.]:
+                    tracker = OnlineCutoffTracker(cutoff_method, importance, use_rates_over_counts, max_observations=700)
+                    for i in range(len(actual)):
+                        tracker.update(actual[i], predicted[i], timestamp=float(i))
+                        if i % 400 == 399:
+                            start = max(0, i + 1 - 700)
+                            self.assertMatchesFindCutoff(actual[start:i + 1], predicted[start:i + 1], cutoff_method, importance, use_rates_over_counts, tracker.find_cutoff())
+
+    def test_counts_window_with_repeated_scores(self):
+        for importance in [2., 0.7]:
+            tracker = OnlineCutoffTracker(use_rates_over_counts=False, false_positive_versus_negative_importance=importance, max_observations=500)
+            for i in range(len(self.actual)):
+                tracker.update(self.actual[i], self.predicted[i], timestamp=float(i))
+                start = max(0, i + 1 - 500)
+                if i % 50 == 49:
+                    self.assertMatchesFindCutoff(self.actual[start:i + 1], self.predicted[start:i + 1], CutoffMethod.AbsoluteDistance, importance, False, tracker.find_cutoff())
+        self.assertEqual(0., OnlineCutoffTracker(use_rates_over_counts=False).find_cutoff())
+        with self.assertRaises(ValueError):
+            OnlineCutoffTracker().find_cutoff()
+
+    def test_exact_ties(self):
+        # Both cutoffs have a penalty of 42/5 with an importance of 7/10, but 0.7 is slightly less than 7/10, so classifying everything as positive is strictly better.
+        actual = [0, 1, 1, 1, 1, 0, 0, 1, 0, 0, 1, 0, 1, 0, 0, 0, 0, 1, 1, 1, 0, 0]
+        predicted = [k / 7 for k in [0, 5, 1, 1, 0, 1, 4, 6, 2, 6, 4, 3, 1, 3, 3, 3, 2, 1, 0, 1, 0, 2]]
+        tracker = OnlineCutoffTracker(false_positive_versus_negative_importance=0.7, use_rates_over_counts=False)
+        tracker.update_many(actual, predicted, timestamp=0.)
+        self.assertEqual(0., tracker.find_cutoff())
+        self.assertMatchesFindCutoff(actual, predicted, CutoffMethod.AbsoluteDistance, 0.7, False, tracker.find_cutoff())
+
+        # With a dyadic importance the tie is exact and goes to the highest probability, like find_cutoff.
+        tracker = OnlineCutoffTracker(false_positive_versus_negative_importance=0.5, use_rates_over_counts=False)
+        tracker.update_many([1, 0, 0, 1], [0.9, 0.8, 0.7, 0.6], timestamp=0.)
+        self.assertEqual(find_cutoff([1, 0, 0, 1], [0.9, 0.8, 0.7, 0.6], CutoffMethod.AbsoluteDistance, 0.5, False), tracker.find_cutoff())
+        self.assertEqual(0.9, tracker.find_cutoff())
+
+    def test_decreasing_timestamps_are_rejected(self):
+        tracker = OnlineCutoffTracker(max_age=10.)
+        tracker.update(1, 0.9, timestamp=5.)
+        tracker.update(0, 0.1, timestamp=5.)
+        with self.assertRaises(ValueError):
+            tracker.update(1, 0.8, timestamp=4.)
+        self.assertEqual(2, tracker.get_observation_count())
+
+        count_tracker = OnlineCutoffTracker(max_observations=10)
+        count_tracker.update(1, 0.9, timestamp=5.)
+        count_tracker.update(0, 0.1, timestamp=4.)
+        self.assertEqual(2, count_tracker.get_observation_count())
@@ -0,0 +1,69 @@
+from unittest import TestCase
+from numpy import unique
+from numpy.random import default_rng
+from model_utilities.evaluation.array_cutoff import find_cutoff_array
+from model_utilities.evaluation.cutoff_methods import CutoffMethod
+from model_utilities.evaluation.streaming_cutoff import StreamingCutoffSummary, find_cutoff_streaming
+
+
+def penalty(actual, predicted, cutoff, cutoff_method, importance, use_rates_over_counts) -> float:
+    """
+    Penalty of classifying predicted >= cutoff as positive, computed from the raw data. A cutoff of 0 can also mean classifying nothing as positive, so the lower penalty is used.
+    """
+    def classify(is_predicted_positive):
+        positives = actual.sum()
+        negatives = actual.shape[0] - positives
+        false_negatives = (actual[~is_predicted_positive] == 1).sum()
+        false_positives = (actual[is_predicted_positive] == 0).sum()
+        false_negative_rate = false_negatives / (positives if use_rates_over_counts else 1)
+        false_positive_rate = false_positives / (negatives if use_rates_over_counts else 1)
+        if cutoff_method == CutoffMethod.AbsoluteDistance:
+            return false_negative_rate + importance * false_positive_rate
+        return false_negative_rate ** 2 + importance * false_positive_rate ** 2
+
+    if cutoff == 0:
+        return min(classify(predicted >= 0), classify(predicted > 1))
+    return classify(predicted >= cutoff)
+
+
+class TestStreamingCutoff(TestCase):
+    def setUp(self):
+        rng = default_rng(3)
+        self.predicted = rng.integers(0, 200, 5000) / 200.
+        self.actual = (rng.random(5000) < self.predicted).astype(int)
+        self.chunks = [(self.actual[i:i + 700], self.predicted[i:i + 700]) for i in range(0, 5000, 700)]
+
+    def test_find_cutoff_streaming_is_exact_with_enough_bins(self):
+        for cutoff_method in CutoffMethod:
+            self.assertEqual(find_cutoff_array(self.actual, self.predicted, cutoff_method, 2.),
+                             find_cutoff_streaming(self.chunks, cutoff_method, 2., max_bins=200))
+
+    def test_binned_summary_is_bounded(self):
+        summary = StreamingCutoffSummary(max_bins=16)
+        for actual, predicted in self.chunks:
+            summary.update(actual, predicted)
+        self.assertTrue(summary.get_binned())
+        self.assertLessEqual(summary._positives.shape[0], 16)
+        self.assertLess(0., summary.penalty_error_bound())
+        self.assertAlmostEqual(find_cutoff_array(self.actual, self.predicted), summary.find_cutoff(), delta=1. / 16)
+
+    def test_binned_penalty_is_within_the_error_bound(self):
+        rng = default_rng(4)
+        continuous_predicted = rng.random(5000)
+        continuous_actual = (rng.random(5000) < continuous_predicted).astype(int)
+        for actual, predicted in [(self.actual, self.predicted), (continuous_actual, continuous_predicted)]:
+            summary = StreamingCutoffSummary(max_bins=16)
+            for start in range(0, 5000, 700):
+                summary.update(actual[start:start + 700], predicted[start:start + 700])
+            self.assertTrue(summary.get_binned())
+            for cutoff_method in CutoffMethod:
+                for use_rates_over_counts in [True, False]:
+                    for importance in [0.5, 2.]:
+                        # The optimum over every threshold the raw data allows, including classifying nothing as positive.
+                        optimal_penalty = min(penalty(actual, predicted, threshold, cutoff_method, importance, use_rates_over_counts)
+                                              for threshold in list(unique(predicted)) + [2.])
+                        cutoff = summary.find_cutoff(cutoff_method, importance, use_rates_over_counts)
+                        bound = summary.penalty_error_bound(cutoff_method, importance, use_rates_over_counts)
+                        error = penalty(actual, predicted, cutoff, cutoff_method, importance, use_rates_over_counts) - optimal_penalty
+                        self.assertLessEqual(0., error + 1e-12)
+                        self.assertLessEqual(error, bound + 1e-12)
@@ -1,7 +1,11 @@
 import time
 import unittest
-from numpy import exp
-from model_utilities.regression.logistic import NumpyLassoLogisticModel
+from concurrent.futures import ThreadPoolExecutor
+from numpy import allclose, exp, asfortranarray, empty, float32, float64, isfinite
+from numpy.random import default_rng
+from scipy.optimize import check_grad
+from scipy.sparse import random as sparse_random
+from model_utilities.regression.logistic import NumpyLassoLogisticModel, SPLIT_LBFGSB, fit_regularization_path, predict_many
 
 
 class TestNumpyLassoLogisticModel(unittest.TestCase):
@@ -21,3 +25,177 @@ class TestNumpyLassoLogisticModel(unittest.TestCase):
         self.assertTrue(lasso_model_no_intercept._initialized)
         self.assertAlmostEqual(lasso_model_no_intercept.get_parameters()[0], -1.5, 4)
         self.assertAlmostEqual(lasso_model_no_intercept.get_parameters()[1], -0.5, 4)
+
+    def test_NumpyLassoLogisticModel_global_search_is_deterministic(self):
+        rng = default_rng(4)
+        X = rng.normal(size=(2000, 2))
+        Y = 1. / (1. + exp(X.dot([1.5, -1.]) + 0.5))
+
+        serial_model = NumpyLassoLogisticModel(alpha=0.0)
+        serial_model.fit(X, Y, method=SPLIT_LBFGSB, global_seed=True, seed=7)
+        parallel_model = NumpyLassoLogisticModel(alpha=0.0)
+        parallel_model.fit(X, Y, method=SPLIT_LBFGSB, global_seed=True, seed=7, max_workers=2)
+        budget_model = NumpyLassoLogisticModel(alpha=0.0)
+        budget_model.fit(X, Y, method=SPLIT_LBFGSB, global_seed=True, seed=7, time_budget=0.)
+
+        for expected, serial_parameter, parallel_parameter, budget_parameter in zip([1.5, -1., 0.5], serial_model.get_parameters(), parallel_model.get_parameters(), budget_model.get_parameters()):
+            self.assertEqual(serial_parameter, parallel_parameter)
+            self.assertAlmostEqual(expected, serial_parameter, 4)
+            self.assertAlmostEqual(expected, budget_parameter, 4)
+
+    def test_NumpyLassoLogisticModel_global_search_in_threads(self):
+        rng = default_rng(5)
+        problems = []
+        for d in range(2, 6):
+            X = rng.normal(size=(400, d))
+            problems.append((X, 1. / (1. + exp(X.dot(rng.normal(size=d)) + 0.5))))
+
+        def fit(problem):
+            model = NumpyLassoLogisticModel(alpha=0.0)
+            model.fit(problem[0], problem[1], method=SPLIT_LBFGSB, global_seed=True, seed=0)
+            return model.get_parameters()
+
+        with ThreadPoolExecutor(max_workers=len(problems)) as executor:
+            threaded_parameters = list(executor.map(fit, problems))
+        for problem, parameters in zip(problems, threaded_parameters):
+            self.assertTrue(allclose(fit(problem), parameters))
+
+    def test_NumpyLassoLogisticModel_fit_split_lbfgsb(self):
+        lasso_model = NumpyLassoLogisticModel(alpha=0.0)
+
+        X = [x / 10. - 5. for x in range(10000)]
+        Y = [1. / (1. + exp(-1.5 * x - 0.5)) for x in X]
+        X = [[x] for x in X]
+
+        lasso_model.fit(X, Y, method=SPLIT_LBFGSB)
+
+        self.assertTrue(lasso_model.get_initialized())
+        self.assertAlmostEqual(lasso_model.get_parameters()[0], -1.5, 4)
+        self.assertAlmostEqual(lasso_model.get_parameters()[1], -0.5, 4)
+
+    def test_NumpyLassoLogisticModel_gradient(self):
+        lasso_model = NumpyLassoLogisticModel(alpha=0.01)
+        rng = default_rng(0)
+        X = rng.normal(size=(200, 3))
+        Y = rng.random(200)
+        theta = rng.normal(size=4)
+
+        self.assertLess(check_grad(lasso_model._constrained_lasso, lasso_model._constrained_lasso_gradient, theta, X, Y), 1e-6)
+
+    def test_NumpyLassoLogisticModel_fit_batches_matches_fit(self):
+        rng = default_rng(1)
+        X = rng.normal(size=(20000, 3))
+        Y = 1. / (1. + exp(X.dot([1., -2., 0.5]) + 0.5))
+
+        full_model = NumpyLassoLogisticModel(alpha=0.001)
+        full_model.fit(X, Y, method=SPLIT_LBFGSB)
+        array_model = NumpyLassoLogisticModel(alpha=0.001)
+        array_model.fit_batches((X, Y), epochs=10, batch_size=1000)
+        chunk_model = NumpyLassoLogisticModel(alpha=0.001)
+        chunk_model.fit_batches(lambda: ((X[i:i + 1000], Y[i:i + 1000]) for i in range(0, 20000, 1000)), epochs=10)
+
+        for expected, array_parameter, chunk_parameter in zip(full_model.get_parameters(), array_model.get_parameters(), chunk_model.get_parameters()):
+            self.assertAlmostEqual(expected, array_parameter, 2)
+            self.assertAlmostEqual(expected, chunk_parameter, 2)
+
+    def test_NumpyLassoLogisticModel_fit_float32_fortran_features(self):
+        rng = default_rng(2)
+        X = rng.normal(size=(5000, 3))
+        Y = 1. / (1. + exp(X.dot([1., -2., 0.5]) + 0.5))
+        X32 = asfortranarray(X, dtype=float32)
+
+        for compute_dtype in [float64, float32]:
+            lasso_model = NumpyLassoLogisticModel(alpha=0.0, compute_dtype=compute_dtype)
+            lasso_model.fit(X32, Y, method=SPLIT_LBFGSB)
+            for expected, parameter in zip([1., -2., 0.5, 0.5], lasso_model.get_parameters()):
+                self.assertAlmostEqual(expected, parameter, 2)
+
+    def test_fit_regularization_path_matches_fit(self):
+        rng = default_rng(3)
+        X = rng.normal(size=(5000, 10))
+        Y = 1. / (1. + exp(X.dot([1., -2., 0.5, 0., 0., 0., 0., 0., 0., 0.]) + 0.5))
+
+        path = fit_regularization_path(X, Y, n_alphas=8, cv=3, seed=0)
+
+        self.assertEqual(0, path.nonzero_counts[0])
+        self.assertTrue((path.nonzero_counts[:-1] <= path.nonzero_counts[1:]).all())
+        self.assertIn(path.best_alpha, path.alphas)
+        self.assertEqual((8,), path.cv_errors.shape)
+        for alpha, parameters, objective in zip(path.alphas, path.parameters, path.objectives):
+            lasso_model = NumpyLassoLogisticModel(alpha=alpha)
+            lasso_model.fit(X, Y, method=SPLIT_LBFGSB)
+            self.assertAlmostEqual(lasso_model._constrained_lasso(lasso_model.get_parameters(), X, Y), objective, 6)
+
+    def test_NumpyLassoLogisticModel_predict(self):
+        rng = default_rng(5)
+        X = rng.normal(size=(3000, 3))
+        Y = 1. / (1. + exp(X.dot([1., -2., 0.5]) + 0.5))
+        first_model = NumpyLassoLogisticModel(alpha=0.0)
+        first_model.fit(X, Y, method=SPLIT_LBFGSB)
+        second_model = NumpyLassoLogisticModel(alpha=0.01)
+        second_model.fit(X, Y, method=SPLIT_LBFGSB)
+
+        out = empty(3000)
+        predictions = first_model.predict(X, out=out, chunk_rows=1000)
+        self.assertIs(out, predictions)
+        for expected, prediction in zip(Y[:10], predictions[:10]):
+            self.assertAlmostEqual(expected, prediction, 4)
+        self.assertTrue(isfinite(first_model.predict(X * 1e4)).all())
+
+        both = predict_many([first_model, second_model], X, chunk_rows=1000)
+        self.assertEqual((3000, 2), both.shape)
+        self.assertTrue(allclose(both[:, 0], predictions, rtol=0, atol=1e-12))
+        self.assertTrue(allclose(both[:, 1], second_model.predict(X), rtol=0, atol=1e-12))
+
+    def test_NumpyLassoLogisticModel_diagnostics(self):
+        rng = default_rng(7)
+        X = rng.normal(size=(2000, 3))
+        Y = 1. / (1. + exp(X.dot([1., -2., 0.5]) + 0.5))
+        progress = []
+
+        seeded_model = NumpyLassoLogisticModel(alpha=0.001)
+        seeded_model.fit(X, Y, method='L-BFGS-B', global_seed=True, seed=0)
+        self.assertGreaterEqual(seeded_model.get_diagnostics().global_starts, 3)
+        self.assertEqual({'global_search', 'final'}, set(seeded_model.get_diagnostics().phase_seconds))
+
+        lasso_model = NumpyLassoLogisticModel(alpha=0.001)
+        lasso_model.fit(X, Y, method='L-BFGS-B', callback=lambda iteration, objective: progress.append((iteration, objective)))
+        diagnostics = lasso_model.get_diagnostics()
+
+        self.assertTrue(diagnostics.success)
+        self.assertEqual({'final'}, set(diagnostics.phase_seconds))
+        self.assertEqual(diagnostics.nit, len(progress))
+        self.assertGreater(diagnostics.nfev, 0)
+        self.assertGreater(diagnostics.njev, 0)
+        self.assertEqual(diagnostics.objective_trace, [objective for _, objective in progress])
+        self.assertEqual(list(range(1, len(progress) + 1)), [iteration for iteration, _ in progress])
+        self.assertAlmostEqual(lasso_model._constrained_lasso(lasso_model.get_parameters(), X, Y), diagnostics.objective_trace[-1], 12)
+
+    def test_NumpyLassoLogisticModel_diagnostics_without_callback(self):
+        rng = default_rng(7)
+        X = rng.normal(size=(2000, 3))
+        Y = 1. / (1. + exp(X.dot([1., -2., 0.5]) + 0.5))
+
+        for method in ['TNC', 'SLSQP']:
+            lasso_model = NumpyLassoLogisticModel(alpha=0.001)
+            objective = lasso_model._constrained_lasso
+            evaluations = []
+            lasso_model._constrained_lasso = lambda *args: evaluations.append(1) or objective(*args)
+            lasso_model.fit(X, Y, method=method)
+
+            self.assertEqual(len(evaluations), lasso_model.get_diagnostics().nfev)
+            self.assertEqual([], lasso_model.get_diagnostics().objective_trace)
+            self.assertGreater(lasso_model.get_diagnostics().nit, 0)
+
+    def test_NumpyLassoLogisticModel_sparse_features(self):
+        rng = default_rng(8)
+        X = sparse_random(3000, 50, density=0.02, format='csr', random_state=8)
+        Y = rng.random(3000)
+        dense_model = NumpyLassoLogisticModel(alpha=0.001)
+        dense_model.fit(X.toarray(), Y, method=SPLIT_LBFGSB)
+
+        for sparse_format in ['csr', 'csc', 'coo']:
+            sparse_model = NumpyLassoLogisticModel(alpha=0.001)
+            sparse_model.fit(X.asformat(sparse_format), Y, method=SPLIT_LBFGSB)
+            self.assertTrue(allclose(dense_model.get_parameters(), sparse_model.get_parameters(), rtol=0, atol=1e-10))
+            self.assertTrue(allclose(dense_model.predict(X.toarray()), sparse_model.predict(X.asformat(sparse_format)), rtol=0, atol=1e-12))
@@ -0,0 +1,38 @@
+import unittest
+from numpy import exp, einsum, repeat
+from numpy.random import default_rng
+from model_utilities.regression.logistic import NumpyLassoLogisticModel, SPLIT_LBFGSB
+from model_utilities.regression.segment_logistic import fit_segments
+
+
+class TestSegmentLogistic(unittest.TestCase):
+    def setUp(self):
+        rng = default_rng(6)
+        self.segments = repeat(["a", "b", "c", "d", "e"], [300, 200, 250, 5000, 4000])
+        rng.shuffle(self.segments)
+        self.X = rng.normal(size=(self.segments.shape[0], 2))
+        self.Y = rng.random(self.segments.shape[0])
+
+    def test_fit_segments_matches_fit(self):
+        segment_models = fit_segments(self.X, self.Y, self.segments, alpha=0.001, max_workers=2)
+
+        self.assertEqual(["a", "b", "c", "d", "e"], list(segment_models.get_keys()))
+        for key, parameters in zip(segment_models.get_keys(), segment_models.get_parameters()):
+            rows = self.segments == key
+            lasso_model = NumpyLassoLogisticModel(alpha=0.001)
+            lasso_model.fit(self.X[rows], self.Y[rows], method=SPLIT_LBFGSB)
+            self.assertAlmostEqual(lasso_model._constrained_lasso(lasso_model.get_parameters(), self.X[rows], self.Y[rows]),
+                                   lasso_model._constrained_lasso(parameters, self.X[rows], self.Y[rows]), 10)
+
+    def test_predict(self):
+        segment_models = fit_segments(self.X, self.Y, self.segments)
+        predictions = segment_models.predict(self.X, self.segments, chunk_rows=1000)
+
+        theta = segment_models.get_parameters()[segment_models.get_keys().searchsorted(self.segments)]
+        expected = 1. / (1. + exp(einsum('ij,ij->i', self.X, theta[:, :-1]) + theta[:, -1]))
+        for expected_prediction, prediction in zip(expected, predictions):
+            self.assertAlmostEqual(expected_prediction, prediction, 12)
+        rows = self.segments == "d"
+        self.assertAlmostEqual(predictions[rows][0], segment_models.get_model("d").predict(self.X[rows])[0], 12)
+        with self.assertRaises(ValueError):
+            segment_models.predict(self.X[:1], ["z"])